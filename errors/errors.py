@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 import traceback
 import sys
 
-@dataclass
+@dataclass(slots=True)
 class ErrorContext:
     """Context information for an error"""
     filename: str = "<input>"
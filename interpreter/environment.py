@@ -16,13 +16,21 @@ def _normalize_name(name: str) -> str:
     return s.lower()
 
 
+# Constant table shared by every scope that has not declared a constant; a
+# scope gets its own table the first time it marks one
+_NO_CONSTS: Dict[str, bool] = {}
+
+
 class Environment:
     """Variable environment with parent scope chain."""
 
+    # Blocks and calls create a scope each time they run, so keep them small
+    __slots__ = ("_parent", "_values", "_consts")
+
     def __init__(self, parent: Optional["Environment"] = None):
         self._parent = parent
         self._values: Dict[str, RuntimeValue] = {}
-        self._consts: Dict[str, bool] = {}  # names that are readonly
+        self._consts: Dict[str, bool] = _NO_CONSTS  # names that are readonly
 
     def define(self, name: str, value: RuntimeValue, *, constant: bool = False) -> None:
         """Define a variable in this scope."""
@@ -41,46 +49,70 @@ class Environment:
                 # update the existing binding in the ancestor scope
                 env._values[key] = value
                 if constant:
-                    env._consts[key] = True
+                    env._mark_constant(key)
                 return
             env = env._parent
 
         # Not found in any ancestor: define in current scope
         self._values[key] = value
         if constant:
-            self._consts[key] = True
+            self._mark_constant(key)
+
+    def _mark_constant(self, key: str) -> None:
+        """Make a name in this scope readonly."""
+        if self._consts is _NO_CONSTS:
+            self._consts = {}
+        self._consts[key] = True
 
     def assign(self, name: str, value: RuntimeValue) -> None:
         """Assign to a variable. Raises if not found or readonly."""
         key = _normalize_name(name)
-        if key in self._values:
-            if self._consts.get(key):
-                raise PplRuntimeError(f"Cannot assign to constant '{name}'")
-            self._values[key] = value
-            return
-        if self._parent is not None:
-            self._parent.assign(name, value)
-            return
+        env: Optional[Environment] = self
+        while env is not None:
+            if key in env._values:
+                if env._consts.get(key):
+                    raise PplRuntimeError(f"Cannot assign to constant '{name}'")
+                env._values[key] = value
+                return
+            env = env._parent
         raise PplNameError(f"Undefined variable '{name}'")
 
     def get(self, name: str) -> RuntimeValue:
         """Resolve a variable. Raises NameError if not found."""
         key = _normalize_name(name)
-        if key in self._values:
-            return self._values[key]
-        if self._parent is not None:
-            return self._parent.get(name)
+        env: Optional[Environment] = self
+        while env is not None:
+            if key in env._values:
+                return env._values[key]
+            env = env._parent
         raise PplNameError(f"Undefined variable '{name}'")
 
     def get_optional(self, name: str) -> Optional[RuntimeValue]:
         """Resolve a variable. Returns None if not found."""
-        key = _normalize_name(name)
-        if key in self._values:
-            return self._values[key]
-        if self._parent is not None:
-            return self._parent.get_optional(name)
+        return self.lookup(_normalize_name(name))
+
+    def lookup(self, key: str) -> Optional[RuntimeValue]:
+        """Resolve an already normalized name. Returns None if not found."""
+        env: Optional[Environment] = self
+        while env is not None:
+            values = env._values
+            if key in values:
+                return values[key]
+            env = env._parent
         return None
 
+    def store(self, key: str, value: RuntimeValue) -> None:
+        """Rebind an already normalized name where it lives, else define it here."""
+        env: Optional[Environment] = self
+        while env is not None:
+            if key in env._values:
+                if env._consts.get(key):
+                    raise PplRuntimeError(f"Cannot assign to constant '{key}'")
+                env._values[key] = value
+                return
+            env = env._parent
+        self._values[key] = value
+
     def assign_at(self, distance: int, name: str, value: RuntimeValue) -> None:
         """Assign at a specific scope depth (for closures)."""
         env = self._ancestor(distance)
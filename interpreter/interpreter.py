@@ -1,8 +1,13 @@
 """
 Main AST interpreter for PowerLang.
+
+Each AST node is compiled once into a Python closure that takes the current
+Environment and returns the node's value, so running a program calls straight
+through closures instead of re-dispatching on node type at every step.
 """
 
-from typing import Any, List, Optional
+import operator
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..lexer.tokens import TokenType
 from ..parser.ast import (
@@ -17,6 +22,7 @@ from ..parser.ast import (
     ContinueStatement,
     DefaultClause,
     DoWhileStatement,
+    EMPTY,
     Expression,
     ExpressionStatement,
     ForeachStatement,
@@ -29,6 +35,7 @@ from ..parser.ast import (
     LambdaExpression,
     Literal,
     MemberAccess,
+    NamespaceDeclaration,
     NewExpression,
     Parameter,
     Program,
@@ -51,7 +58,7 @@ from ..errors import (
     PowerLangError as PplError,
 )
 
-from .environment import Environment
+from .environment import Environment, _normalize_name
 from .runtime import Runtime
 from .values import (
     ArrayValue,
@@ -73,6 +80,10 @@ from .values import (
 )
 
 
+# Compiled node: runs the node in an environment and returns its value
+Code = Callable[[Environment], Optional[RuntimeValue]]
+
+
 class ReturnSignal(Exception):
     def __init__(self, value: RuntimeValue):
         self.value = value
@@ -105,6 +116,10 @@ def _var_name(node: Variable) -> str:
     return n.lower()
 
 
+# Shared values for small integer literals, as CPython does for small ints
+_SMALL_INTS: Tuple[IntValue, ...] = tuple(IntValue(i) for i in range(-5, 257))
+
+
 def _literal_to_value(lit: Literal) -> RuntimeValue:
     v = lit.value
     if v is None:
@@ -112,6 +127,8 @@ def _literal_to_value(lit: Literal) -> RuntimeValue:
     if isinstance(v, bool):
         return BoolValue(v)
     if isinstance(v, int):
+        if -5 <= v <= 256:
+            return _SMALL_INTS[v + 5]
         return IntValue(v)
     if isinstance(v, float):
         return FloatValue(v)
@@ -120,22 +137,183 @@ def _literal_to_value(lit: Literal) -> RuntimeValue:
     return python_to_value(v)
 
 
+
+
+def _return_null(env: Environment) -> RuntimeValue:
+    return NULL
+
+
+# Compile method for each statement and expression class; anything else
+# compiles to a no-op, as the tree walker ignored nodes it did not know
+_STATEMENT_COMPILERS: Dict[type, str] = {
+    Block: '_compile_block',
+    ExpressionStatement: '_compile_expression_statement',
+    VariableDeclaration: '_compile_variable_decl',
+    FunctionDeclaration: '_compile_function_decl',
+    ClassDeclaration: '_compile_class_decl',
+    IfStatement: '_compile_if',
+    ForStatement: '_compile_for',
+    WhileStatement: '_compile_while',
+    DoWhileStatement: '_compile_do_while',
+    ForeachStatement: '_compile_foreach',
+    SwitchStatement: '_compile_switch',
+    ReturnStatement: '_compile_return',
+    BreakStatement: '_compile_break',
+    ContinueStatement: '_compile_continue',
+    TryCatchStatement: '_compile_try_catch',
+    ThrowStatement: '_compile_throw',
+}
+
+_EXPRESSION_COMPILERS: Dict[type, str] = {
+    Literal: '_compile_literal',
+    Variable: '_compile_variable',
+    BinaryOperation: '_compile_binary',
+    UnaryOperation: '_compile_unary',
+    Assignment: '_compile_assignment',
+    CallExpression: '_compile_call',
+    MemberAccess: '_compile_member_access',
+    IndexAccess: '_compile_index_access',
+    TernaryExpression: '_compile_ternary',
+    ArrayLiteral: '_compile_array',
+    HashLiteral: '_compile_hash',
+    LambdaExpression: '_compile_lambda',
+    RangeExpression: '_compile_range',
+    NewExpression: '_compile_new',
+}
+
+# Marks a class whose compile method has not been looked up yet
+_UNRESOLVED = object()
+
+
+def _compiler_name(table: Dict[type, Optional[str]], node_class: type) -> Optional[str]:
+    """Find the compile method for a subclass (or non-node value) through its
+    MRO and remember it in the table"""
+    name = table.get(node_class, _UNRESOLVED)
+    if name is _UNRESOLVED:
+        name = None
+        for base in node_class.__mro__[1:]:
+            name = table.get(base)
+            if name is not None:
+                break
+        table[node_class] = name
+    return name
+
+
+_COMPARISONS: Dict[TokenType, Callable[[Any, Any], bool]] = {
+    TokenType.EQ: operator.eq,
+    TokenType.NE: operator.ne,
+    TokenType.GT: operator.gt,
+    TokenType.LT: operator.lt,
+    TokenType.GE: operator.ge,
+    TokenType.LE: operator.le,
+}
+
+_ARITHMETIC: Dict[TokenType, Callable[[Any, Any], Any]] = {
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+}
+
+_COMPOUND_ARITHMETIC: Dict[TokenType, Callable[[Any, Any], Any]] = {
+    TokenType.PLUS_EQUAL: operator.add,
+    TokenType.MINUS_EQUAL: operator.sub,
+    TokenType.STAR_EQUAL: operator.mul,
+}
+
+# Operators folded at compile time when both operands are numeric, boolean or
+# null constants; powers are left to run time so a huge result is only built
+# if the expression actually runs
+_FOLDABLE = frozenset(_COMPARISONS) | frozenset(_ARITHMETIC) | {
+    TokenType.AND, TokenType.OR, TokenType.PLUS, TokenType.SLASH, TokenType.PERCENT,
+}
+
+
+def _add(left: RuntimeValue, right: RuntimeValue) -> RuntimeValue:
+    """Generic +: string concatenation, array append/concatenation, else numeric"""
+    lp = value_to_python(left)
+    rp = value_to_python(right)
+    if isinstance(left, StringValue) or isinstance(right, StringValue):
+        return StringValue(str(lp) + str(rp))
+    if isinstance(left, ArrayValue):
+        arr = ArrayValue(left.elements[:])
+        if isinstance(right, ArrayValue):
+            arr.elements.extend(right.elements)
+        else:
+            arr.elements.append(right)
+        return arr
+    return python_to_value((lp or 0) + (rp or 0))
+
+
 class Interpreter:
     def __init__(self, runtime: Runtime) -> None:
         self.runtime = runtime
         self.env: Environment = runtime.new_scope()
+        self._folded: Dict[int, Tuple[Any, RuntimeValue]] = {}
 
     def run(self, program: Program) -> Optional[RuntimeValue]:
+        env = self.env
         last: Optional[RuntimeValue] = NULL
         for fn in program.functions:
-            self._declare_function(fn)
+            self._declare_function(fn, env)
         for cls in program.classes:
-            self._declare_class(cls)
+            self._declare_class(cls, env)
         for stmt in program.statements:
-            last = self._execute(stmt)
+            if isinstance(stmt, (FunctionDeclaration, ClassDeclaration, NamespaceDeclaration)):
+                continue  # Hoisted above
+            last = self.compile_statement(stmt)(env)
         return last
 
-    def _declare_function(self, node: FunctionDeclaration) -> None:
+    def compile_statement(self, stmt: Statement) -> Code:
+        """Compile a statement; expressions and unknown nodes do nothing"""
+        name = _compiler_name(_STATEMENT_COMPILERS, type(stmt))
+        if name is None:
+            return _return_null
+        return self._compile(getattr(self, name), stmt)
+
+    def compile_expression(self, expr: Expression) -> Code:
+        """Compile an expression; statements and unknown nodes yield null"""
+        name = _compiler_name(_EXPRESSION_COMPILERS, type(expr))
+        if name is None:
+            return _return_null
+        return self._compile(getattr(self, name), expr)
+
+    @staticmethod
+    def _compile(compiler: Callable[[Any], Code], node: Any) -> Code:
+        """Run a compile method. A node nested too deeply to compile from
+        here compiles again each time it runs, so the error surfaces at the
+        point where the node is evaluated"""
+        try:
+            return compiler(node)
+        except RecursionError:
+            def deferred(env: Environment) -> Optional[RuntimeValue]:
+                return compiler(node)(env)
+            return deferred
+
+    def _compile_body(self, body: Any) -> Code:
+        """Compile a function body: a block, or a lambda's expression"""
+        if hasattr(body, "statements"):
+            return self._compile_sequence(body.statements)
+        return self.compile_expression(body)
+
+    def _function_code(self, fn: FunctionValue) -> Code:
+        """Compiled body of a user function, compiled on its first call and
+        kept on the function value"""
+        fn.code = code = self._compile_body(fn.body)
+        return code
+
+    def _shared_body(self, body: Any) -> Code:
+        """Body code for the function values a declaration or lambda makes
+        each time it runs; compiled once, on the first call of any of them"""
+        compiled: Optional[Code] = None
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            nonlocal compiled
+            if compiled is None:
+                compiled = self._compile_body(body)
+            return compiled(env)
+        return run
+
+    def _declare_function(self, node: FunctionDeclaration, env: Environment,
+                          code: Optional[Code] = None) -> None:
         name = node.name_token.lexeme
         params: List[ParameterInfo] = []
         for p in node.parameters:
@@ -144,14 +322,16 @@ class Interpreter:
             name=name,
             params=params,
             body=node.body,
-            closure=self.env,
+            closure=env,
+            code=code,
         )
-        self.env.define(name, fn, constant=False)
+        env.define(name, fn, constant=False)
 
-    def _declare_class(self, node: ClassDeclaration) -> None:
+    def _declare_class(self, node: ClassDeclaration, env: Environment,
+                       codes: Optional[List[Optional[Code]]] = None) -> None:
         name = node.name_token.lexeme
         klass = ClassValue(name=name, methods={})
-        for m in node.members:
+        for i, m in enumerate(node.members):
             if isinstance(m, FunctionDeclaration):
                 method_name = m.name_token.lexeme
                 params = [ParameterInfo(name=p.name_token.lexeme, has_default=p.default_value is not None) for p in m.parameters]
@@ -159,507 +339,765 @@ class Interpreter:
                     name=method_name,
                     params=params,
                     body=m.body,
-                    closure=self.env,
+                    closure=env,
+                    code=codes[i] if codes is not None else None,
                 )
                 klass.methods[method_name.lower()] = method
         
-        self.env.define(name, klass, constant=False)
-
-    def _execute(self, stmt: Statement) -> Optional[RuntimeValue]:
-        if isinstance(stmt, Block):
-            return self._execute_block(stmt)
-        if isinstance(stmt, ExpressionStatement):
-            return self._evaluate(stmt.expression)
-        if isinstance(stmt, VariableDeclaration):
-            return self._execute_variable_decl(stmt)
-        if isinstance(stmt, FunctionDeclaration):
-            self._declare_function(stmt)
-            return NULL
-        if isinstance(stmt, ClassDeclaration):
-            self._declare_class(stmt)
-            return NULL
-        if isinstance(stmt, IfStatement):
-            return self._execute_if(stmt)
-        if isinstance(stmt, ForStatement):
-            return self._execute_for(stmt)
-        if isinstance(stmt, WhileStatement):
-            return self._execute_while(stmt)
-        if isinstance(stmt, DoWhileStatement):
-            return self._execute_do_while(stmt)
-        if isinstance(stmt, ForeachStatement):
-            return self._execute_foreach(stmt)
-        if isinstance(stmt, SwitchStatement):
-            return self._execute_switch(stmt)
-        if isinstance(stmt, ReturnStatement):
-            val = self._evaluate(stmt.value) if stmt.value else NULL
-            raise ReturnSignal(val)
-        if isinstance(stmt, BreakStatement):
-            raise BreakSignal()
-        if isinstance(stmt, ContinueStatement):
-            raise ContinueSignal()
-        if isinstance(stmt, TryCatchStatement):
-            return self._execute_try_catch(stmt)
-        if isinstance(stmt, ThrowStatement):
-            exc = self._evaluate(stmt.expression)
-            raise PplRuntimeError(str(value_to_python(exc)))
-        return NULL
+        env.define(name, klass, constant=False)
 
-    def _execute_block(self, block: Block) -> Optional[RuntimeValue]:
-        prev = self.env
-        self.env = prev.child()
-        try:
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+
+    def _compile_sequence(self, statements: List[Statement]) -> Code:
+        """Run statements in the given environment, returning the last value"""
+        codes = [self.compile_statement(s) for s in statements]
+        if not codes:
+            return _return_null
+        if len(codes) == 1:
+            return codes[0]
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
             last: Optional[RuntimeValue] = NULL
-            for s in block.statements:
-                last = self._execute(s)
+            for code in codes:
+                last = code(env)
             return last
-        finally:
-            self.env = prev
+        return run
 
-    def _execute_variable_decl(self, node: VariableDeclaration) -> Optional[RuntimeValue]:
+    def _compile_block(self, block: Block) -> Code:
+        # The statement loop is inlined so a block costs one call, not two
+        codes = [self.compile_statement(s) for s in block.statements]
+        if len(codes) == 1:
+            code = codes[0]
+            return lambda env: code(env.child())
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            scope = env.child()
+            last: Optional[RuntimeValue] = NULL
+            for code in codes:
+                last = code(scope)
+            return last
+        return run
+
+    def _compile_expression_statement(self, stmt: ExpressionStatement) -> Code:
+        return self.compile_expression(stmt.expression)
+
+    def _compile_variable_decl(self, node: VariableDeclaration) -> Code:
         name = getattr(node, "name", None) or (node.name_token.lexeme if node.name_token.lexeme.startswith("$") else "$" + node.name_token.lexeme)
         if name.startswith("$"):
             name = name[1:].lower()
         else:
             name = name.lower()
-        value = self._evaluate(node.initializer) if node.initializer else NULL
-        self.env.define(name, value, constant=node.is_constant)
-        return value
-
-    def _execute_if(self, node: IfStatement) -> Optional[RuntimeValue]:
-        if self._evaluate(node.condition).is_truthy():
-            return self._execute(node.then_branch)
-        for elseif in node.elseif_branches:
-            if self._evaluate(elseif.condition).is_truthy():
-                return self._execute(elseif.branch)
-        if node.else_branch:
-            return self._execute(node.else_branch)
-        return NULL
+        initializer = self.compile_expression(node.initializer) if node.initializer else None
+        constant = node.is_constant
 
-    def _execute_for(self, node: ForStatement) -> Optional[RuntimeValue]:
-        if node.initializer:
-            self._execute(node.initializer)
-        while True:
-            if node.condition:
-                if not self._evaluate(node.condition).is_truthy():
-                    break
-            try:
-                self._execute(node.body)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                pass
-            if node.increment:
-                self._evaluate(node.increment)
-        return NULL
+        if not constant and _normalize_name(name) == name:
+            def run(env: Environment) -> Optional[RuntimeValue]:
+                value = initializer(env) if initializer is not None else NULL
+                env.store(name, value)
+                return value
+            return run
 
-    def _execute_while(self, node: WhileStatement) -> Optional[RuntimeValue]:
-        while self._evaluate(node.condition).is_truthy():
-            try:
-                self._execute(node.body)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                pass
-        return NULL
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            value = initializer(env) if initializer is not None else NULL
+            env.define(name, value, constant=constant)
+            return value
+        return run
 
-    def _execute_do_while(self, node: DoWhileStatement) -> Optional[RuntimeValue]:
-        while True:
-            try:
-                self._execute(node.body)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                pass
-            if not self._evaluate(node.condition).is_truthy():
+    def _compile_function_decl(self, node: FunctionDeclaration) -> Code:
+        body = self._shared_body(node.body)
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            self._declare_function(node, env, body)
+            return NULL
+        return run
+
+    def _compile_class_decl(self, node: ClassDeclaration) -> Code:
+        codes = [self._shared_body(m.body) if isinstance(m, FunctionDeclaration) else None for m in node.members]
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            self._declare_class(node, env, codes)
+            return NULL
+        return run
+
+    def _compile_if(self, node: IfStatement) -> Code:
+        # Arms with a constant condition are settled here: a falsy one is
+        # dropped and a truthy one becomes the final else
+        arms: List[Tuple[Code, Code]] = []
+        else_branch = _return_null
+        branches = [(node.condition, node.then_branch)]
+        branches.extend((elseif.condition, elseif.branch) for elseif in node.elseif_branches or EMPTY)
+        for condition_node, branch_node in branches:
+            condition = self.compile_expression(condition_node)
+            constant = self._constant(condition_node)
+            if constant is None:
+                arms.append((condition, self.compile_statement(branch_node)))
+            elif constant.is_truthy():
+                else_branch = self.compile_statement(branch_node)
                 break
-        return NULL
+        else:
+            if node.else_branch:
+                else_branch = self.compile_statement(node.else_branch)
+        if not arms:
+            return else_branch
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            for condition, branch in arms:
+                if condition(env).is_truthy():
+                    return branch(env)
+            return else_branch(env)
+        return run
+
+    def _compile_for(self, node: ForStatement) -> Code:
+        initializer = self.compile_statement(node.initializer) if node.initializer else None
+        condition = self.compile_expression(node.condition) if node.condition else None
+        body = self.compile_statement(node.body)
+        increment = self.compile_expression(node.increment) if node.increment else None
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            if initializer is not None:
+                initializer(env)
+            while True:
+                if condition is not None:
+                    if not condition(env).is_truthy():
+                        break
+                try:
+                    body(env)
+                except BreakSignal:
+                    break
+                except ContinueSignal:
+                    pass
+                if increment is not None:
+                    increment(env)
+            return NULL
+        return run
+
+    def _compile_while(self, node: WhileStatement) -> Code:
+        condition = self.compile_expression(node.condition)
+        constant = self._constant(node.condition)
+        if constant is not None and not constant.is_truthy():
+            return _return_null  # The body can never run
+        body = self.compile_statement(node.body)
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            while condition(env).is_truthy():
+                try:
+                    body(env)
+                except BreakSignal:
+                    break
+                except ContinueSignal:
+                    pass
+            return NULL
+        return run
 
-    def _execute_foreach(self, node: ForeachStatement) -> Optional[RuntimeValue]:
-        col = self._evaluate(node.collection)
+    def _compile_do_while(self, node: DoWhileStatement) -> Code:
+        body = self.compile_statement(node.body)
+        condition = self.compile_expression(node.condition)
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            while True:
+                try:
+                    body(env)
+                except BreakSignal:
+                    break
+                except ContinueSignal:
+                    pass
+                if not condition(env).is_truthy():
+                    break
+            return NULL
+        return run
+
+    def _compile_foreach(self, node: ForeachStatement) -> Code:
+        collection = self.compile_expression(node.collection)
         var_name = getattr(node, "variable_name", None) or (node.variable_token.lexeme[1:].lower() if node.variable_token.lexeme.startswith("$") else node.variable_token.lexeme.lower())
-        prev = self.env
-        self.env = prev.child()
-        try:
+        body = self.compile_statement(node.body)
+        if _normalize_name(var_name) == var_name:
+            def bind(scope: Environment, value: RuntimeValue) -> None:
+                scope.store(var_name, value)
+        else:
+            def bind(scope: Environment, value: RuntimeValue) -> None:
+                scope.define(var_name, value, constant=False)
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            col = collection(env)
+            scope = env.child()
             if isinstance(col, ArrayValue):
                 for elem in col.elements:
-                    self.env.define(var_name, elem, constant=False)
+                    bind(scope, elem)
                     try:
-                        self._execute(node.body)
+                        body(scope)
                     except BreakSignal:
                         break
                     except ContinueSignal:
                         pass
             elif isinstance(col, StringValue):
                 for c in col.value:
-                    self.env.define(var_name, StringValue(c), constant=False)
+                    bind(scope, StringValue(c))
                     try:
-                        self._execute(node.body)
+                        body(scope)
                     except BreakSignal:
                         break
                     except ContinueSignal:
                         pass
             return NULL
-        finally:
-            self.env = prev
-
-    def _execute_switch(self, node: SwitchStatement) -> Optional[RuntimeValue]:
-        val = self._evaluate(node.expression)
-        py = value_to_python(val)
-
-        def eq(a: RuntimeValue, b: RuntimeValue) -> bool:
-            pa = value_to_python(a)
-            pb = value_to_python(b)
-            return pa == pb
-
-        for case in node.cases:
-            for cval_expr in case.values:
-                if eq(self._evaluate(cval_expr), val):
-                    self._execute_block(case.body)
-                    return NULL
-        if node.default_case:
-            self._execute_block(node.default_case.body)
-        return NULL
+        return run
 
-    def _execute_try_catch(self, node: TryCatchStatement) -> Optional[RuntimeValue]:
-        try:
-            return self._execute_block(node.try_block)
-        except PplError as e:
-            for catch in node.catch_clauses:
-                prev = self.env
-                self.env = prev.child()
-                try:
-                    if catch.exception_variable:
-                        vname = catch.exception_variable.lexeme
-                        if vname.startswith("$"):
-                            vname = vname[1:].lower()
-                        self.env.define(vname, StringValue(str(e)), constant=False)
-                    result = self._execute_block(catch.block)
-                    return result
-                finally:
-                    self.env = prev
-            raise
-        finally:
-            if node.finally_block:
-                self._execute_block(node.finally_block)
-        return NULL
+    def _compile_switch(self, node: SwitchStatement) -> Code:
+        expression = self.compile_expression(node.expression)
+        cases = [([self.compile_expression(v) for v in case.values], self._compile_block(case.body))
+                 for case in node.cases or EMPTY]
+        default = self._compile_block(node.default_case.body) if node.default_case else None
 
-    def _evaluate(self, expr: Expression) -> RuntimeValue:
-        if isinstance(expr, Literal):
-            return _literal_to_value(expr)
-        if isinstance(expr, Variable):
-            name = _var_name(expr)
-            return self.env.get(name)
-        if isinstance(expr, BinaryOperation):
-            return self._eval_binary(expr)
-        if isinstance(expr, UnaryOperation):
-            return self._eval_unary(expr)
-        if isinstance(expr, Assignment):
-            return self._eval_assignment(expr)
-        if isinstance(expr, CallExpression):
-            return self._eval_call(expr)
-        if isinstance(expr, MemberAccess):
-            return self._eval_member_access(expr)
-        if isinstance(expr, IndexAccess):
-            return self._eval_index_access(expr)
-        if isinstance(expr, TernaryExpression):
-            return self._evaluate(expr.then_expr) if self._evaluate(expr.condition).is_truthy() else self._evaluate(expr.else_expr)
-        if isinstance(expr, ArrayLiteral):
-            return ArrayValue([self._evaluate(e) for e in expr.elements])
-        if isinstance(expr, HashLiteral):
-            pairs: dict = {}
-            for p in expr.pairs:
-                k = self._evaluate(p.key)
-                v = self._evaluate(p.value)
-                key = value_to_python(k)
-                if not isinstance(key, (str, int, float, bool)):
-                    key = str(key)
-                pairs[key] = v
-            return HashValue(pairs)
-        if isinstance(expr, LambdaExpression):
-            params = [ParameterInfo(name=p.name_token.lexeme, has_default=p.default_value is not None) for p in expr.parameters]
-            return FunctionValue(name=None, params=params, body=expr.body, closure=self.env, is_async=expr.is_async)
-        if isinstance(expr, RangeExpression):
-            lo = self._evaluate(expr.start)
-            hi = self._evaluate(expr.end)
-            a = value_to_python(lo)
-            b = value_to_python(hi)
-            low = int(a) if isinstance(a, (int, float)) else 0
-            high = int(b) if isinstance(b, (int, float)) else 0
-            inc = 1 if expr.inclusive else 0
-            return ArrayValue([IntValue(i) for i in range(low, high + inc)])
-        if isinstance(expr, NewExpression):
-            return self._eval_new(expr)
-        return NULL
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            val = expression(env)
+            value_to_python(val)
+            for values, body in cases:
+                for value in values:
+                    if value_to_python(value(env)) == value_to_python(val):
+                        body(env)
+                        return NULL
+            if default is not None:
+                default(env)
+            return NULL
+        return run
 
-    def _eval_binary(self, node: BinaryOperation) -> RuntimeValue:
+    def _compile_return(self, stmt: ReturnStatement) -> Code:
+        value = self.compile_expression(stmt.value) if stmt.value else None
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            raise ReturnSignal(value(env) if value is not None else NULL)
+        return run
+
+    def _compile_break(self, stmt: BreakStatement) -> Code:
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            raise BreakSignal()
+        return run
+
+    def _compile_continue(self, stmt: ContinueStatement) -> Code:
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            raise ContinueSignal()
+        return run
+
+    def _compile_try_catch(self, node: TryCatchStatement) -> Code:
+        try_block = self._compile_block(node.try_block)
+        # Only the first catch clause is ever used
+        catch_block = None
+        vname = None
+        for catch in node.catch_clauses or EMPTY:
+            if catch.exception_variable:
+                vname = catch.exception_variable.lexeme
+                if vname.startswith("$"):
+                    vname = vname[1:].lower()
+            catch_block = self._compile_block(catch.block)
+            break
+        finally_block = self._compile_block(node.finally_block) if node.finally_block else None
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            try:
+                return try_block(env)
+            except PplError as e:
+                if catch_block is not None:
+                    scope = env.child()
+                    if vname is not None:
+                        scope.define(vname, StringValue(str(e)), constant=False)
+                    return catch_block(scope)
+                raise
+            finally:
+                if finally_block is not None:
+                    finally_block(env)
+        return run
+
+    def _compile_throw(self, stmt: ThrowStatement) -> Code:
+        expression = self.compile_expression(stmt.expression)
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            exc = expression(env)
+            raise PplRuntimeError(str(value_to_python(exc)))
+        return run
+
+    # ------------------------------------------------------------------
+    # Expressions
+    # ------------------------------------------------------------------
+
+    def _compile_literal(self, expr: Literal) -> Code:
+        v = expr.value
+        if v is None:
+            return _return_null
+        if isinstance(v, (bool, int, float, str)):
+            # Scalar values are never mutated, so the literal's value is built
+            # once and shared by every evaluation
+            value = _literal_to_value(expr)
+            return lambda env: value
+        return lambda env: python_to_value(v)
+
+    def _compile_variable(self, expr: Variable) -> Code:
+        name = _var_name(expr)
+        key = _normalize_name(name)
+
+        def run(env: Environment) -> Optional[RuntimeValue]:
+            value = env.lookup(key)
+            # Unbound (or bound to None): let get() decide, with its message
+            return value if value is not None else env.get(name)
+        return run
+
+    def _constant(self, expr: Expression) -> Optional[RuntimeValue]:
+        """Compile-time value of a scalar literal or an already folded
+        operation, or None when the expression has to run"""
+        if type(expr) is Literal:
+            v = expr.value
+            if v is None or isinstance(v, (bool, int, float, str)):
+                return _literal_to_value(expr)
+            return None
+        entry = self._folded.get(id(expr))
+        if entry is not None and entry[0] is expr:
+            return entry[1]
+        return None
+
+    def _compile_binary(self, node: BinaryOperation) -> Code:
+        code = self._compile_operation(node)
+        if node.operator.type not in _FOLDABLE:
+            return code
+        for operand in (node.left, node.right):
+            value = self._constant(operand)
+            if value is None or isinstance(value, StringValue):
+                return code
+        try:
+            value = code(self.env)
+        except (PplRuntimeError, ArithmeticError, TypeError):
+            return code  # Raises when it runs, as before
+        self._folded[id(node)] = (node, value)
+        return lambda env: value
+
+    def _compile_operation(self, node: BinaryOperation) -> Code:
         op = node.operator.type
-        left = self._evaluate(node.left)
-        right = self._evaluate(node.right)
-        lp = value_to_python(left)
-        rp = value_to_python(right)
-
-        if op == TokenType.EQ:
-            return BoolValue(lp == rp)
-        if op == TokenType.NE:
-            return BoolValue(lp != rp)
-        if op == TokenType.GT:
-            return BoolValue(lp > rp)
-        if op == TokenType.LT:
-            return BoolValue(lp < rp)
-        if op == TokenType.GE:
-            return BoolValue(lp >= rp)
-        if op == TokenType.LE:
-            return BoolValue(lp <= rp)
-        if op == TokenType.AND:
-            return BoolValue(left.is_truthy() and right.is_truthy())
-        if op == TokenType.OR:
-            return BoolValue(left.is_truthy() or right.is_truthy())
+        left_code = self.compile_expression(node.left)
+        if type(node.right) is Literal and type(node.right.value) is int:
+            fused = self._compile_int_operand(op, left_code, node.right.value)
+            if fused is not None:
+                return fused
+        right_code = self.compile_expression(node.right)
+
+        # Both operands are always evaluated and converted first. IntValue
+        # always wraps a plain int, so two of them skip the conversions.
+        compare = _COMPARISONS.get(op)
+        if compare is not None:
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                if type(left) is IntValue and type(right) is IntValue:
+                    return BoolValue(compare(left.value, right.value))
+                return BoolValue(compare(value_to_python(left), value_to_python(right)))
+            return run
+        if op == TokenType.AND or op == TokenType.OR:
+            is_and = op == TokenType.AND
 
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                value_to_python(left)
+                value_to_python(right)
+                if is_and:
+                    return BoolValue(left.is_truthy() and right.is_truthy())
+                return BoolValue(left.is_truthy() or right.is_truthy())
+            return run
         if op == TokenType.PLUS:
-            if isinstance(left, StringValue) or isinstance(right, StringValue):
-                return StringValue(str(lp) + str(rp))
-            if isinstance(left, ArrayValue):
-                arr = ArrayValue(left.elements[:])
-                if isinstance(right, ArrayValue):
-                    arr.elements.extend(right.elements)
-                else:
-                    arr.elements.append(right)
-                return arr
-            return python_to_value((lp or 0) + (rp or 0))
-        if op == TokenType.MINUS:
-            return python_to_value((lp or 0) - (rp or 0))
-        if op == TokenType.STAR:
-            return python_to_value((lp or 0) * (rp or 0))
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                if type(left) is IntValue and type(right) is IntValue:
+                    return IntValue(left.value + right.value)
+                return _add(left, right)
+            return run
+        arithmetic = _ARITHMETIC.get(op)
+        if arithmetic is not None:
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                if type(left) is IntValue and type(right) is IntValue:
+                    return IntValue(arithmetic(left.value, right.value))
+                lp = value_to_python(left)
+                rp = value_to_python(right)
+                return python_to_value(arithmetic(lp or 0, rp or 0))
+            return run
         if op == TokenType.SLASH:
-            if rp == 0 or (isinstance(right, (IntValue, FloatValue)) and (right.value == 0)):
-                raise PplRuntimeError("Division by zero")
-            return python_to_value((lp or 0) / (rp or 1))
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                lp = value_to_python(left)
+                rp = value_to_python(right)
+                if rp == 0 or (isinstance(right, (IntValue, FloatValue)) and (right.value == 0)):
+                    raise PplRuntimeError("Division by zero")
+                return python_to_value((lp or 0) / (rp or 1))
+            return run
         if op == TokenType.PERCENT:
-            if rp == 0:
-                raise PplRuntimeError("Division by zero")
-            return IntValue(int(lp or 0) % int(rp or 1))
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                lp = value_to_python(left)
+                rp = value_to_python(right)
+                if rp == 0:
+                    raise PplRuntimeError("Division by zero")
+                return IntValue(int(lp or 0) % int(rp or 1))
+            return run
         if op == TokenType.CARET or op == TokenType.STAR_STAR:
-            return python_to_value((lp or 0) ** (rp or 1))
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                right = right_code(env)
+                lp = value_to_python(left)
+                rp = value_to_python(right)
+                return python_to_value((lp or 0) ** (rp or 1))
+            return run
 
-        return NULL
+        def run(env: Environment) -> RuntimeValue:
+            value_to_python(left_code(env))
+            value_to_python(right_code(env))
+            return NULL
+        return run
+
+    @staticmethod
+    def _compile_int_operand(op: TokenType, left_code: Code, k: int) -> Optional[Code]:
+        """Fuse `left op <int literal>`, the usual loop test and step, into one
+        closure that uses the constant directly"""
+        compare = _COMPARISONS.get(op)
+        if compare is not None:
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                if type(left) is IntValue:
+                    return BoolValue(compare(left.value, k))
+                return BoolValue(compare(value_to_python(left), k))
+            return run
+        if op == TokenType.PLUS:
+            constant = IntValue(k)
 
-    def _eval_unary(self, node: UnaryOperation) -> RuntimeValue:
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                if type(left) is IntValue:
+                    return IntValue(left.value + k)
+                return _add(left, constant)
+            return run
+        arithmetic = _ARITHMETIC.get(op)
+        if arithmetic is not None:
+            def run(env: Environment) -> RuntimeValue:
+                left = left_code(env)
+                if type(left) is IntValue:
+                    return IntValue(arithmetic(left.value, k))
+                return python_to_value(arithmetic(value_to_python(left) or 0, k))
+            return run
+        return None
+
+    def _compile_unary(self, node: UnaryOperation) -> Code:
         op = node.operator.type
-        val = self._evaluate(node.operand)
+        operand = self.compile_expression(node.operand)
         if op == TokenType.MINUS:
-            p = value_to_python(val)
-            return python_to_value(-(p or 0))
-        if op == TokenType.PLUS:
-            return val
+            return lambda env: python_to_value(-(value_to_python(operand(env)) or 0))
         if op == TokenType.NOT:
-            return BoolValue(not val.is_truthy())
-        if op == TokenType.PLUS_PLUS:
-            p = value_to_python(val)
-            n = (p or 0) + 1
-            out = python_to_value(n)
-            self._assign_target(node.operand, out)
-            return out
-        if op == TokenType.MINUS_MINUS:
-            p = value_to_python(val)
-            n = (p or 0) - 1
-            out = python_to_value(n)
-            self._assign_target(node.operand, out)
-            return out
-        return val
-
-    def _assign_target(self, target: Expression, value: RuntimeValue) -> None:
+            return lambda env: BoolValue(not operand(env).is_truthy())
+        if op == TokenType.PLUS_PLUS or op == TokenType.MINUS_MINUS:
+            step = operator.add if op == TokenType.PLUS_PLUS else operator.sub
+            assign = self._compile_target(node.operand)
+
+            def run(env: Environment) -> RuntimeValue:
+                value = operand(env)
+                if type(value) is IntValue:
+                    out = IntValue(step(value.value, 1))
+                else:
+                    out = python_to_value(step(value_to_python(value) or 0, 1))
+                assign(env, out)
+                return out
+            return run
+        return operand
+
+    def _compile_target(self, target: Expression) -> Callable[[Environment, RuntimeValue], None]:
+        """Compile the store half of an assignment to target"""
         if isinstance(target, Variable):
             name = _var_name(target)
-            if self.env.get_optional(name) is None:
-                self.env.define(name, value, constant=False)
-            else:
-                self.env.assign(name, value)
-            return
+            if _normalize_name(name) == name:
+                # Rebinding the nearest binding or defining locally is exactly
+                # what define-or-assign does for a pre-normalized name
+                return lambda env, value: env.store(name, value)
+
+            def store(env: Environment, value: RuntimeValue) -> None:
+                if env.get_optional(name) is None:
+                    env.define(name, value, constant=False)
+                else:
+                    env.assign(name, value)
+            return store
         if isinstance(target, MemberAccess):
-            obj = self._evaluate(target.object)
-            if isinstance(obj, InstanceValue):
-                name = target.member_token.lexeme.lower()
-                obj.fields[name] = value
-            return
+            obj_code = self.compile_expression(target.object)
+            name = target.member_token.lexeme.lower()
+
+            def store(env: Environment, value: RuntimeValue) -> None:
+                obj = obj_code(env)
+                if isinstance(obj, InstanceValue):
+                    obj.fields[name] = value
+            return store
         if isinstance(target, IndexAccess):
-            container = self._evaluate(target.object)
-            idx = self._evaluate(target.index)
-            key = value_to_python(idx)
-            if isinstance(container, ArrayValue):
-                i = int(key) if isinstance(key, (int, float)) else 0
-                if i < 0:
-                    i += len(container.elements)
-                if 0 <= i < len(container.elements):
-                    container.elements[i] = value
-            elif isinstance(container, HashValue):
-                k = key if isinstance(key, (str, int, float, bool)) else str(key)
-                container.pairs[k] = value
-            return
+            container_code = self.compile_expression(target.object)
+            index_code = self.compile_expression(target.index)
 
-    def _eval_assignment(self, node: Assignment) -> RuntimeValue:
+            def store(env: Environment, value: RuntimeValue) -> None:
+                container = container_code(env)
+                idx = index_code(env)
+                key = value_to_python(idx)
+                if isinstance(container, ArrayValue):
+                    i = int(key) if isinstance(key, (int, float)) else 0
+                    if i < 0:
+                        i += len(container.elements)
+                    if 0 <= i < len(container.elements):
+                        container.elements[i] = value
+                elif isinstance(container, HashValue):
+                    k = key if isinstance(key, (str, int, float, bool)) else str(key)
+                    container.pairs[k] = value
+            return store
+        return lambda env, value: None
+
+    def _compile_assignment(self, node: Assignment) -> Code:
         op = node.operator.type
-        val = self._evaluate(node.value)
-        if op != TokenType.EQUAL:
-            target_val = self._evaluate(node.target)
-            lp = value_to_python(target_val)
-            rp = value_to_python(val)
-            if op == TokenType.PLUS_EQUAL:
-                val = python_to_value((lp or 0) + (rp or 0))
-            elif op == TokenType.MINUS_EQUAL:
-                val = python_to_value((lp or 0) - (rp or 0))
-            elif op == TokenType.STAR_EQUAL:
-                val = python_to_value((lp or 0) * (rp or 0))
-            elif op == TokenType.SLASH_EQUAL:
-                val = python_to_value((lp or 0) / (rp or 1)) if rp else NULL
-            elif op == TokenType.PERCENT_EQUAL:
-                val = IntValue(int(lp or 0) % int(rp or 1))
-            else:
-                val = target_val
-        self._assign_target(node.target, val)
-        return val
-
-    def _eval_call(self, node: CallExpression) -> RuntimeValue:
-        args: List[RuntimeValue] = [self._evaluate(a) for a in node.arguments]
-        this_val: Optional[RuntimeValue] = None
-        callee: RuntimeValue
+        value_code = self.compile_expression(node.value)
+        store = self._compile_target(node.target)
+        if op == TokenType.EQUAL:
+            def run(env: Environment) -> RuntimeValue:
+                val = value_code(env)
+                store(env, val)
+                return val
+            return run
 
-        if isinstance(node.callee, MemberAccess):
-            this_val = self._evaluate(node.callee.object)
-            callee = self._eval_member_access(node.callee)
+        target_code = self.compile_expression(node.target)
+        arithmetic = _COMPOUND_ARITHMETIC.get(op)
+        # New value from the target's value and the converted operands
+        if arithmetic is not None:
+            def run(env: Environment) -> RuntimeValue:
+                val = value_code(env)
+                target_val = target_code(env)
+                if type(target_val) is IntValue and type(val) is IntValue:
+                    val = IntValue(arithmetic(target_val.value, val.value))
+                else:
+                    val = python_to_value(arithmetic(value_to_python(target_val) or 0, value_to_python(val) or 0))
+                store(env, val)
+                return val
+            return run
+        if op == TokenType.SLASH_EQUAL:
+            def combine(target_val: RuntimeValue, lp: Any, rp: Any) -> RuntimeValue:
+                return python_to_value((lp or 0) / (rp or 1)) if rp else NULL
+        elif op == TokenType.PERCENT_EQUAL:
+            def combine(target_val: RuntimeValue, lp: Any, rp: Any) -> RuntimeValue:
+                return IntValue(int(lp or 0) % int(rp or 1))
         else:
-            callee = self._evaluate(node.callee)
+            def combine(target_val: RuntimeValue, lp: Any, rp: Any) -> RuntimeValue:
+                return target_val
+
+        def run(env: Environment) -> RuntimeValue:
+            val = value_code(env)
+            target_val = target_code(env)
+            val = combine(target_val, value_to_python(target_val), value_to_python(val))
+            store(env, val)
+            return val
+        return run
+
+    def _compile_call(self, node: CallExpression) -> Code:
+        arg_codes = [self.compile_expression(a) for a in node.arguments or EMPTY]
+        call = self._call
+        if isinstance(node.callee, MemberAccess):
+            this_code = self.compile_expression(node.callee.object)
+            callee_code = self._compile_member_access(node.callee)
 
+            def run(env: Environment) -> RuntimeValue:
+                args = [code(env) for code in arg_codes]
+                this_val = this_code(env)
+                return call(callee_code(env), args, this_val)
+            return run
+
+        callee_code = self.compile_expression(node.callee)
+
+        def run(env: Environment) -> RuntimeValue:
+            args = [code(env) for code in arg_codes]
+            return call(callee_code(env), args, None)
+        return run
+
+    def _call(self, callee: RuntimeValue, args: List[RuntimeValue],
+              this_val: Optional[RuntimeValue]) -> RuntimeValue:
         if isinstance(callee, BuiltinFunctionValue):
             return callee.fn(args)
         if isinstance(callee, FunctionValue):
-            prev = self.env
-            self.env = callee.closure.child()
-            try:
-                if this_val is not None and isinstance(this_val, InstanceValue):
-                    self.env.define("this", this_val, constant=False)
-                arg_idx = 0
-                for p in callee.params:
-                    if p.name in ("this", "self") and this_val is not None:
-                        continue
-                    if arg_idx < len(args):
-                        self.env.define(p.name, args[arg_idx], constant=False)
-                        arg_idx += 1
-                    else:
-                        self.env.define(p.name, NULL, constant=False)
-                result = NULL
-                if hasattr(callee.body, "statements"):
-                    for s in callee.body.statements:
-                        result = self._execute(s)
+            env = callee.closure.child()
+            if this_val is not None and isinstance(this_val, InstanceValue):
+                env.define("this", this_val, constant=False)
+            arg_idx = 0
+            for p in callee.params:
+                if p.name in ("this", "self") and this_val is not None:
+                    continue
+                if arg_idx < len(args):
+                    env.define(p.name, args[arg_idx], constant=False)
+                    arg_idx += 1
                 else:
-                    result = self._evaluate(callee.body)
-                return result
+                    env.define(p.name, NULL, constant=False)
+            code = callee.code or self._function_code(callee)
+            try:
+                return code(env)
             except ReturnSignal as r:
                 return r.value
-            finally:
-                self.env = prev
         if isinstance(callee, ClassValue):
             inst = InstanceValue(klass=callee)
             init = callee.methods.get("constructor") or callee.methods.get("__init__")
-            # Debug: show available methods and lookup
             if init is None:
                 # Try class-named constructor (e.g. function Simple(...) inside class Simple)
                 init = callee.methods.get(callee.name.lower())
             if init:
-                prev = self.env
-                self.env = init.closure.child()
-                self.env.define("this", inst, constant=False)
+                env = init.closure.child()
+                env.define("this", inst, constant=False)
                 try:
                     for i, p in enumerate(init.params):
                         if p.name in ("this", "self"):
                             continue
                         if i < len(args):
-                            self.env.define(p.name, args[i], constant=False)
-                    for s in init.body.statements:
-                        self._execute(s)
+                            env.define(p.name, args[i], constant=False)
+                    (init.code or self._function_code(init))(env)
                 except ReturnSignal:
                     pass
-                finally:
-                    pass
-                    self.env = prev
             return inst
         raise PplRuntimeError("Can only call functions or classes")
 
-    def _eval_member_access(self, node: MemberAccess) -> RuntimeValue:
-        obj = self._evaluate(node.object)
+    def _compile_member_access(self, node: MemberAccess) -> Code:
+        obj_code = self.compile_expression(node.object)
         name = node.member_token.lexeme.lower()
-        if isinstance(obj, InstanceValue):
-            if name in obj.fields:
-                return obj.fields[name]
-            if name in obj.klass.methods:
-                return obj.klass.methods[name]
-        if isinstance(obj, ArrayValue) and name == "length":
-            return IntValue(len(obj.elements))
-        if isinstance(obj, StringValue) and name == "length":
-            return IntValue(len(obj.value))
-        raise PplRuntimeError(f"Member '{name}' not found")
-
-    def _eval_index_access(self, node: IndexAccess) -> RuntimeValue:
-        obj = self._evaluate(node.object)
-        idx = self._evaluate(node.index)
-        key = value_to_python(idx)
-        if isinstance(obj, ArrayValue):
-            i = int(key) if isinstance(key, (int, float)) else 0
-            if i < 0:
-                i += len(obj.elements)
-            if not (0 <= i < len(obj.elements)):
-                raise PplIndexError("Index out of range")
-            return obj.elements[i]
-        if isinstance(obj, HashValue):
-            k = key if isinstance(key, (str, int, float, bool)) else str(key)
-            if k not in obj.pairs:
-                raise PplKeyError(f"Key not found: {k!r}")
-            return obj.pairs[k]
-        if isinstance(obj, StringValue):
-            i = int(key) if isinstance(key, (int, float)) else 0
-            if i < 0:
-                i += len(obj.value)
-            if not (0 <= i < len(obj.value)):
-                raise PplIndexError("Index out of range")
-            return StringValue(obj.value[i])
-        raise PplRuntimeError("Index access only on array, hash, or string")
-
-    def _eval_new(self, node: NewExpression) -> RuntimeValue:
+        has_length = name == "length"
+
+        def run(env: Environment) -> RuntimeValue:
+            obj = obj_code(env)
+            if isinstance(obj, InstanceValue):
+                if name in obj.fields:
+                    return obj.fields[name]
+                if name in obj.klass.methods:
+                    return obj.klass.methods[name]
+            if has_length:
+                if isinstance(obj, ArrayValue):
+                    return IntValue(len(obj.elements))
+                if isinstance(obj, StringValue):
+                    return IntValue(len(obj.value))
+            raise PplRuntimeError(f"Member '{name}' not found")
+        return run
+
+    def _compile_index_access(self, node: IndexAccess) -> Code:
+        obj_code = self.compile_expression(node.object)
+        index_code = self.compile_expression(node.index)
+
+        def run(env: Environment) -> RuntimeValue:
+            obj = obj_code(env)
+            idx = index_code(env)
+            key = value_to_python(idx)
+            if isinstance(obj, ArrayValue):
+                i = int(key) if isinstance(key, (int, float)) else 0
+                if i < 0:
+                    i += len(obj.elements)
+                if not (0 <= i < len(obj.elements)):
+                    raise PplIndexError("Index out of range")
+                return obj.elements[i]
+            if isinstance(obj, HashValue):
+                k = key if isinstance(key, (str, int, float, bool)) else str(key)
+                if k not in obj.pairs:
+                    raise PplKeyError(f"Key not found: {k!r}")
+                return obj.pairs[k]
+            if isinstance(obj, StringValue):
+                i = int(key) if isinstance(key, (int, float)) else 0
+                if i < 0:
+                    i += len(obj.value)
+                if not (0 <= i < len(obj.value)):
+                    raise PplIndexError("Index out of range")
+                return StringValue(obj.value[i])
+            raise PplRuntimeError("Index access only on array, hash, or string")
+        return run
+
+    def _compile_ternary(self, expr: TernaryExpression) -> Code:
+        condition = self.compile_expression(expr.condition)
+        constant = self._constant(expr.condition)
+        if constant is not None:
+            return self.compile_expression(expr.then_expr if constant.is_truthy() else expr.else_expr)
+        then_expr = self.compile_expression(expr.then_expr)
+        else_expr = self.compile_expression(expr.else_expr)
+        return lambda env: then_expr(env) if condition(env).is_truthy() else else_expr(env)
+
+    def _compile_array(self, expr: ArrayLiteral) -> Code:
+        codes = [self.compile_expression(e) for e in expr.elements or EMPTY]
+        return lambda env: ArrayValue([code(env) for code in codes])
+
+    def _compile_hash(self, expr: HashLiteral) -> Code:
+        pair_codes = [(self.compile_expression(p.key), self.compile_expression(p.value)) for p in expr.pairs or EMPTY]
+
+        def run(env: Environment) -> RuntimeValue:
+            pairs: dict = {}
+            for key_code, value_code in pair_codes:
+                k = key_code(env)
+                v = value_code(env)
+                key = value_to_python(k)
+                if not isinstance(key, (str, int, float, bool)):
+                    key = str(key)
+                pairs[key] = v
+            return HashValue(pairs)
+        return run
+
+    def _compile_lambda(self, expr: LambdaExpression) -> Code:
+        params = [ParameterInfo(name=p.name_token.lexeme, has_default=p.default_value is not None) for p in expr.parameters or EMPTY]
+        body = expr.body
+        is_async = expr.is_async
+        code = self._shared_body(body)
+        return lambda env: FunctionValue(name=None, params=params, body=body, closure=env, is_async=is_async, code=code)
+
+    def _compile_range(self, expr: RangeExpression) -> Code:
+        start = self.compile_expression(expr.start)
+        end = self.compile_expression(expr.end)
+        inc = 1 if expr.inclusive else 0
+
+        def run(env: Environment) -> RuntimeValue:
+            lo = start(env)
+            hi = end(env)
+            a = value_to_python(lo)
+            b = value_to_python(hi)
+            low = int(a) if isinstance(a, (int, float)) else 0
+            high = int(b) if isinstance(b, (int, float)) else 0
+            return ArrayValue([IntValue(i) for i in range(low, high + inc)])
+        return run
+
+    def _compile_new(self, node: NewExpression) -> Code:
         type_expr = node.type_expression
         name = getattr(type_expr, "type_name", None) or (type_expr.type_token.lexeme if hasattr(type_expr, "type_token") else "")
-        args = [self._evaluate(a) for a in node.arguments]
-        klass = self.env.get_optional(name)
-        if klass is None:
-            klass = self.runtime.globals.get_optional(name)
-        if isinstance(klass, ClassValue):
-            inst = InstanceValue(klass=klass)
-            init = klass.methods.get("constructor") or klass.methods.get("__init__")
-            # Try class-named constructor if not found
-            if init is None:
-                init = klass.methods.get(klass.name.lower())
-            if init:
-                prev = self.env
-                self.env = init.closure.child()
-                self.env.define("this", inst, constant=False)
-                try:
-                    arg_idx = 0
-                    for p in init.params:
-                        if p.name in ("this", "self"):
-                            continue
-                        if arg_idx < len(args):
-                            self.env.define(p.name, args[arg_idx], constant=False)
-                            arg_idx += 1
-                        else:
-                            self.env.define(p.name, NULL, constant=False)
-                    for s in init.body.statements:
-                        self._execute(s)
-                except ReturnSignal:
-                    pass
-                finally:
-                    pass
-                    self.env = prev
-            return inst
-        if name.lower() == "array":
-            return ArrayValue(list(args))
-        if name.lower() == "object":
-            return InstanceValue(klass=ClassValue(name="Object", methods={}))
-        raise PplRuntimeError(f"Unknown type: {name}")
+        arg_codes = [self.compile_expression(a) for a in node.arguments or EMPTY]
+
+        def run(env: Environment) -> RuntimeValue:
+            args = [code(env) for code in arg_codes]
+            klass = env.get_optional(name)
+            if klass is None:
+                klass = self.runtime.globals.get_optional(name)
+            if isinstance(klass, ClassValue):
+                return self._construct(klass, args)
+            if name.lower() == "array":
+                return ArrayValue(list(args))
+            if name.lower() == "object":
+                return InstanceValue(klass=ClassValue(name="Object", methods={}))
+            raise PplRuntimeError(f"Unknown type: {name}")
+        return run
+
+    def _construct(self, klass: ClassValue, args: List[RuntimeValue]) -> RuntimeValue:
+        """Create an instance for new, binding missing arguments to null"""
+        inst = InstanceValue(klass=klass)
+        init = klass.methods.get("constructor") or klass.methods.get("__init__")
+        # Try class-named constructor if not found
+        if init is None:
+            init = klass.methods.get(klass.name.lower())
+        if init:
+            env = init.closure.child()
+            env.define("this", inst, constant=False)
+            try:
+                arg_idx = 0
+                for p in init.params:
+                    if p.name in ("this", "self"):
+                        continue
+                    if arg_idx < len(args):
+                        env.define(p.name, args[arg_idx], constant=False)
+                        arg_idx += 1
+                    else:
+                        env.define(p.name, NULL, constant=False)
+                (init.code or self._function_code(init))(env)
+            except ReturnSignal:
+                pass
+        return inst
@@ -126,6 +126,7 @@ class FunctionValue(RuntimeValue):
     body: Any  # Block AST node
     closure: "Environment"
     is_async: bool = False
+    code: Optional[Callable[["Environment"], Any]] = field(default=None, repr=False, compare=False)  # Compiled body
 
     def __repr__(self) -> str:
         n = self.name or "<lambda>"
@@ -179,9 +180,21 @@ class InstanceValue(RuntimeValue):
 # Convenience constants
 NULL = NullValue()
 
+# Exact-type tables for the common conversions; subclasses and containers
+# take the isinstance chains below
+_SCALAR_VALUE_TYPES = frozenset((BoolValue, IntValue, FloatValue, StringValue))
+_SCALAR_WRAPPERS: Dict[type, Callable[[Any], RuntimeValue]] = {
+    bool: BoolValue,
+    int: IntValue,
+    float: FloatValue,
+    str: StringValue,
+}
+
 
 def value_to_python(v: RuntimeValue) -> Any:
     """Convert a RuntimeValue to a Python value (for builtins, etc.)."""
+    if type(v) in _SCALAR_VALUE_TYPES:
+        return v.value
     if isinstance(v, NullValue):
         return None
     if isinstance(v, BoolValue):
@@ -201,6 +214,9 @@ def value_to_python(v: RuntimeValue) -> Any:
 
 def python_to_value(x: Any) -> RuntimeValue:
     """Convert a Python value to RuntimeValue."""
+    wrap = _SCALAR_WRAPPERS.get(type(x))
+    if wrap is not None:
+        return wrap(x)
     if x is None:
         return NULL
     if isinstance(x, bool):
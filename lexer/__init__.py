@@ -3,7 +3,7 @@ PowerLang Lexer Module
 """
 
 from .lexer import Lexer
-from .tokens import Token, TokenType
+from .tokens import Token, TokenType, TokenStream
 from .scanner import Scanner
 from .keywords import KEYWORDS, TYPE_KEYWORDS
 from .operators import OPERATORS, OPERATOR_MAP
@@ -12,6 +12,7 @@ __all__ = [
     'Lexer',
     'Token',
     'TokenType',
+    'TokenStream',
     'Scanner',
     'KEYWORDS',
     'TYPE_KEYWORDS',
@@ -3,15 +3,73 @@ Main lexer implementation for PowerLang
 """
 
 import re
+from sys import intern
 from typing import List, Optional, Iterator
-from .tokens import Token, TokenType
+from .tokens import Token, TokenType, make_token
 from .scanner import Scanner
-from .keywords import is_keyword, get_keyword_token_type, is_type_keyword
+from .keywords import RESERVED_WORDS, get_keyword_token_type, is_type_keyword
 from .operators import (
     SINGLE_CHAR_OPERATORS, MULTI_CHAR_OPERATORS, 
     get_operator_token_type, is_operator_char, is_operator_start
 )
 
+# Digit predicates for numeric literal scanning
+_is_decimal_digit = str.isdigit
+
+def _is_hex_digit(char: str) -> bool:
+    return char.isdigit() or char in 'abcdefABCDEF'
+
+def _is_binary_digit(char: str) -> bool:
+    return char == '0' or char == '1'
+
+# Token type of a reserved word, or None for any other word, in one table probe
+_lookup_keyword = RESERVED_WORDS.get
+
+# Literal values of keywords that carry one; other keywords carry None
+_KEYWORD_LITERALS = {'true': True, 'false': False}
+
+# Scanner nesting update for each bracket character, keyed by character so
+# single-character tokens need no token type comparisons
+_NESTING = {
+    '{': Scanner.enter_brace,
+    '}': Scanner.exit_brace,
+    '(': Scanner.enter_paren,
+    ')': Scanner.exit_paren,
+    '[': Scanner.enter_bracket,
+    ']': Scanner.exit_bracket,
+}
+
+_LBRACKET_CODE = TokenType.LBRACKET._value_
+_RBRACKET_CODE = TokenType.RBRACKET._value_
+
+# Tokens that can end an operand; '?[' is only a null-conditional index when
+# it touches one of these, otherwise '?' is a ternary and '[' opens a cast
+_OPERAND_END_CODES = frozenset(t._value_ for t in (
+    TokenType.IDENTIFIER, TokenType.VARIABLE, TokenType.STRING, TokenType.INTEGER,
+    TokenType.FLOAT, TokenType.BOOL, TokenType.THIS, TokenType.NULL, TokenType.TRUE,
+    TokenType.FALSE, TokenType.RPAREN, TokenType.RBRACKET, TokenType.RBRACE,
+))
+
+# Runs of string characters that need no escape or interpolation handling
+_STRING_RUN = {
+    '"': re.compile(r'[^"\\$]*').match,
+    "'": re.compile(r"[^'\\$]*").match,
+}
+
+# Runs of whitespace (str.isspace) and of identifier characters (str.isalnum
+# or '_'), matched in C rather than one advance() per character
+_SPACE_RUN = re.compile(r'\s*').match
+_WORD_RUN = re.compile(r'\w*').match
+
+# Multi-character operators of two to four characters (the longest the
+# operator scan ever tries) as one alternation, longest first, so a single
+# match replaces a dictionary probe per candidate length
+_MULTI_CHAR_OPERATOR = re.compile('|'.join(
+    re.escape(op)
+    for op in sorted(MULTI_CHAR_OPERATORS, key=len, reverse=True)
+    if len(op) <= 4
+)).match
+
 class Lexer:
     """PowerLang lexical analyzer"""
     
@@ -25,6 +83,8 @@ class Lexer:
     def __init__(self, source: str, filename: str = "<input>"):
         self.scanner = Scanner(source, filename)
         self.tokens: List[Token] = []
+        self._pending: List[Token] = []  # Tokens scanned but not yet yielded
+        self._previous: Optional[Token] = None  # Last token yielded
         self.had_error = False
         self.errors: List[dict] = []
         
@@ -34,26 +94,35 @@ class Lexer:
     def tokenize(self) -> List[Token]:
         """Tokenize the entire source code"""
         self.tokens.clear()
+        self.tokens.extend(self.tokenize_stream())
+        return self.tokens
+    
+    def tokenize_stream(self) -> Iterator[Token]:
+        """Yield tokens as they are scanned, ending with EOF"""
         self.had_error = False
         self.errors.clear()
+        pending = self._pending
+        pending.clear()
+        self._previous = None
         
         while not self.scanner.is_at_end:
             token = self._scan_token()
             if token is not None:
-                self.tokens.append(token)
-
+                pending.append(token)
+            if pending:
+                self._previous = pending[-1]
+                yield from pending
+                pending.clear()
         
         # Add EOF token
-        self.tokens.append(Token(
+        yield Token(
             type=TokenType.EOF,
             lexeme="",
             literal=None,
             line=self.scanner.position.line,
             column=self.scanner.position.column,
             position=self.scanner.position.absolute
-        ))
-        
-        return self.tokens
+        )
     
     def _scan_token(self) -> Optional[Token]:
         """Scan a single token"""
@@ -66,60 +135,50 @@ class Lexer:
 
         # Handle different token types based on first character
         char = self.scanner.current_char
+        handler = _START_TABLE.get(char)
+        if handler is not None:
+            return handler(self)
         
-        if char == '$':
-            return self._scan_variable()
-        elif char == '"' or char == "'":
-            return self._scan_string()
-        elif char == '`':
-            return self._scan_escape_string()
-        elif char.isdigit():
+        # Non-ASCII characters take the general classification path
+        if char.isdigit():
             return self._scan_number()
         elif self._is_identifier_start(char):
             return self._scan_identifier_or_keyword()
-        elif is_operator_start(char):
-            return self._scan_operator()
-        elif char == '[':
-            # Enter type context for [type] annotations
-            token = self._scan_single_char_token()
-            if token.type == TokenType.LBRACKET:
-                self._in_type_context = True
-            return token
-        elif char == ']':
-            # Exit type context
-            token = self._scan_single_char_token()
-            if token.type == TokenType.RBRACKET:
-                self._in_type_context = False
-            return token
         else:
             return self._scan_single_char_token()
     
+    def _scan_lbracket(self) -> Token:
+        """Scan '[' and enter type context for [type] annotations"""
+        token = self._scan_single_char_token()
+        if token.type_id == _LBRACKET_CODE:
+            self._in_type_context = True
+        return token
+    
+    def _scan_rbracket(self) -> Token:
+        """Scan ']' and exit type context"""
+        token = self._scan_single_char_token()
+        if token.type_id == _RBRACKET_CODE:
+            self._in_type_context = False
+        return token
+    
     def _skip_whitespace_and_comments(self) -> None:
         """Skip whitespace and comments"""
         while not self.scanner.is_at_end:
-            if self.scanner.current_char == '\n':
-                self.scanner.advance()
-            elif self.scanner.is_whitespace():
-                self.scanner.advance()
+            if self.scanner.is_whitespace():
+                self.scanner.skip_run(_SPACE_RUN)
 
             elif self.scanner.current_char == '#' and self.scanner.peek() == '#':
                 # Single line comment: ## comment
                 self.scanner.advance()  # Skip #
                 self.scanner.advance()  # Skip #
                 self.scanner.skip_line_comment()
-            elif self.scanner.current_char == '<' and self.scanner.peek() == '#':
-                # consume block comment entirely
+            elif self.scanner.current_char == '<' and self.scanner.peek(1) == '#':
+                # consume block comment entirely, so the parser never sees it
                 self.scanner.advance()
                 self.scanner.advance()
                 self.scanner.enter_block_comment()
 
-                while not self.scanner.is_at_end:
-                    if self.scanner.current_char == '#' and self.scanner.peek() == '>':
-                        self.scanner.advance()
-                        self.scanner.advance()
-                        self.scanner.exit_block_comment()
-                        break
-                    self.scanner.advance()
+                self._skip_block_comment_body()
 
             elif self.scanner.is_in_comment() or self.scanner.is_in_block_comment():
                 # We're already in a comment, skip appropriately
@@ -127,17 +186,21 @@ class Lexer:
                     self.scanner.skip_line_comment()
                 else:
                     # In block comment, need to look for #>
-                    while not self.scanner.is_at_end:
-                        if (self.scanner.current_char == '#' and 
-                            self.scanner.peek() == '>'):
-                            self.scanner.advance()  # Skip #
-                            self.scanner.advance()  # Skip >
-                            self.scanner.exit_block_comment()
-                            break
-                        self.scanner.advance()
+                    self._skip_block_comment_body()
             else:
                 break
     
+    def _skip_block_comment_body(self) -> None:
+        """Jump past the closing #> of a block comment"""
+        scanner = self.scanner
+        end = scanner.source.find('#>', scanner.position.absolute)
+        if end == -1:
+            scanner.skip_to(scanner.source_length)
+            self._error("Unterminated block comment")
+            return
+        scanner.skip_to(end + 2)
+        scanner.exit_block_comment()
+    
     def _scan_variable(self) -> Token:
         """Scan a variable starting with $"""
         # We are at $
@@ -149,11 +212,10 @@ class Lexer:
             return self._create_token(TokenType.VARIABLE, lexeme, None)
 
         # Scan identifier part
-        while self.scanner.is_identifier_part():
-            self.scanner.advance()
+        self.scanner.skip_run(_WORD_RUN)
 
-        lexeme = self.scanner.get_lexeme()      # "$x"
-        name = lexeme[1:].lower()               # "x"
+        lexeme = intern(self.scanner.get_lexeme())  # "$x"
+        name = intern(lexeme[1:].lower())           # "x", the interpreter's lookup key
 
         return self._create_token(TokenType.VARIABLE, lexeme, name)
 
@@ -186,6 +248,13 @@ class Lexer:
                 value_chars.append(self.scanner.current_char)
                 value_chars.append(self.scanner.peek())
             else:
+                # Take the whole run of plain characters in one slice
+                start = self.scanner.position.absolute
+                end = _STRING_RUN[delimiter](self.scanner.source, start).end()
+                if end > start + 1:
+                    value_chars.append(self.scanner.source[start:end])
+                    self.scanner.skip_to(end)
+                    continue
                 value_chars.append(self.scanner.current_char)
             
             self.scanner.advance()
@@ -236,8 +305,7 @@ class Lexer:
         self.scanner.start_lexeme()
         
         # Skip to end of line
-        while not self.scanner.is_at_end and self.scanner.current_char != '\n':
-            self.scanner.advance()
+        self.scanner.skip_line_comment()
         
         lexeme = self.scanner.get_lexeme()
         return self._create_token(TokenType.COMMENT, lexeme, lexeme.strip())
@@ -251,8 +319,7 @@ class Lexer:
         self.scanner.start_lexeme()
         
         # Skip to end of line
-        while not self.scanner.is_at_end and self.scanner.current_char != '\n':
-            self.scanner.advance()
+        self.scanner.skip_line_comment()
         
         lexeme = self.scanner.get_lexeme()
         return self._create_token(TokenType.COMMENT, lexeme, lexeme.strip())
@@ -270,20 +337,19 @@ class Lexer:
         self.scanner.enter_block_comment()
         
         # Skip to end of block comment
-        while not self.scanner.is_at_end:
-            if self.scanner.current_char == '#' and self.scanner.peek() == '>':
-                self.scanner.advance()  # Skip #
-                self.scanner.advance()  # Skip >
-                self.scanner.exit_block_comment()
-                # Create block comment end token
-                self.scanner.start_lexeme()
-                lexeme = self.scanner.get_lexeme()
-                self.tokens.append(
-                    self._create_token(TokenType.BLOCK_COMMENT_END, lexeme, None)
-                )
-                break
-            self.scanner.advance()
-        
+        end = self.scanner.source.find('#>', self.scanner.position.absolute)
+        if end != -1:
+            self.scanner.skip_to(end + 2)
+            self.scanner.exit_block_comment()
+            # Create block comment end token
+            self.scanner.start_lexeme()
+            lexeme = self.scanner.get_lexeme()
+            self._pending.append(
+                self._create_token(TokenType.BLOCK_COMMENT_END, lexeme, None)
+            )
+        else:
+            self.scanner.skip_to(self.scanner.source_length)
+
         return token
     
     def _scan_number(self) -> Token:
@@ -302,40 +368,38 @@ class Lexer:
                 return self._scan_binary_number()
         
         # Decimal number (integer or float)
-        while self.scanner.is_digit():
-            self.scanner.advance()
+        self._skip_digits(_is_decimal_digit)
         
-        # Check for decimal point
+        # Check for decimal point; peek(1) is the character after the '.'
+        following = self.scanner.peek(1)
         if (self.scanner.current_char == '.' and 
-            self.scanner.peek() is not None and 
-            self.scanner.peek().isdigit()):
+            following is not None and 
+            following.isdigit()):
             self.scanner.advance()  # Skip .
             
-            while self.scanner.is_digit():
-                self.scanner.advance()
+            self._skip_digits(_is_decimal_digit)
             
             # Check for exponent
-            if self.scanner.current_char.lower() == 'e':
+            if self.scanner.current_char in ('e', 'E'):
                 self.scanner.advance()  # Skip e/E
                 
                 # Optional + or -
-                if self.scanner.current_char in '+-':
+                if self.scanner.current_char in ('+', '-'):
                     self.scanner.advance()
                 
                 # Must have at least one digit
                 if not self.scanner.is_digit():
                     self._error("Invalid floating point exponent")
                 
-                while self.scanner.is_digit():
-                    self.scanner.advance()
+                self._skip_digits(_is_decimal_digit)
             
             lexeme = self.scanner.get_lexeme()
             try:
                 value = float(lexeme)
-                return self._create_token(TokenType.DOUBLE, lexeme, value)
+                return self._create_token(TokenType.FLOAT, lexeme, value)
             except ValueError:
                 self._error(f"Invalid floating point number: {lexeme}")
-                return self._create_token(TokenType.DOUBLE, lexeme, 0.0)
+                return self._create_token(TokenType.FLOAT, lexeme, 0.0)
         else:
             # Integer
             lexeme = self.scanner.get_lexeme()
@@ -346,10 +410,20 @@ class Lexer:
                 self._error(f"Invalid integer: {lexeme}")
                 return self._create_token(TokenType.INTEGER, lexeme, 0)
     
+    def _skip_digits(self, is_digit) -> None:
+        """Consume a run of digits in one pass over the raw source"""
+        scanner = self.scanner
+        source = scanner.source
+        length = scanner.source_length
+        start = index = scanner.position.absolute
+        while index < length and is_digit(source[index]):
+            index += 1
+        if index != start:
+            scanner.skip_to(index)
+    
     def _scan_hex_number(self) -> Token:
         """Scan a hexadecimal number"""
-        while self.scanner.is_hex_digit():
-            self.scanner.advance()
+        self._skip_digits(_is_hex_digit)
         
         lexeme = self.scanner.get_lexeme()
         # Remove 0x prefix from lexeme for parsing
@@ -368,8 +442,7 @@ class Lexer:
     
     def _scan_binary_number(self) -> Token:
         """Scan a binary number"""
-        while self.scanner.is_binary_digit():
-            self.scanner.advance()
+        self._skip_digits(_is_binary_digit)
         
         lexeme = self.scanner.get_lexeme()
         # Remove 0b prefix from lexeme for parsing
@@ -388,24 +461,15 @@ class Lexer:
     
     def _scan_identifier_or_keyword(self) -> Token:
         """Scan an identifier or keyword"""
-        while self.scanner.is_identifier_part():
-            self.scanner.advance()
+        self.scanner.skip_run(_WORD_RUN)
         
         lexeme = self.scanner.get_lexeme()
         
         # Check if it's a keyword
-        if is_keyword(lexeme):
-            token_type = get_keyword_token_type(lexeme)
-            
+        token_type = _lookup_keyword(lexeme)
+        if token_type is not None:
             # Special handling for true/false
-            if token_type == TokenType.TRUE:
-                return self._create_token(token_type, lexeme, True)
-            elif token_type == TokenType.FALSE:
-                return self._create_token(token_type, lexeme, False)
-            elif token_type == TokenType.NULL:
-                return self._create_token(token_type, lexeme, None)
-            else:
-                return self._create_token(token_type, lexeme, None)
+            return self._create_token(token_type, lexeme, _KEYWORD_LITERALS.get(lexeme))
         
         # Check if we're in type context (inside [ ])
         if self._in_type_context and is_type_keyword(lexeme):
@@ -417,25 +481,27 @@ class Lexer:
     
     def _scan_operator(self) -> Token:
         """Scan an operator"""
+        if self.scanner.current_char == '?' and self.scanner.peek(1) == '[' and not self._follows_operand():
+            # Ternary '?' before a '[type]' cast; '[' is scanned on its own
+            self.scanner.advance()
+            return self._create_token(TokenType.QUESTION, self.scanner.get_lexeme(), None)
+        
         # Try to match multi-character operators first
-        for length in range(4, 0, -1):  # Try 4, 3, 2, 1 char operators
-            if length == 1:
-                # Single character operator
-                char = self.scanner.current_char
-                if char in SINGLE_CHAR_OPERATORS:
-                    self.scanner.advance()
-                    token_type = SINGLE_CHAR_OPERATORS[char]
-                    lexeme = self.scanner.get_lexeme()
-                    return self._create_token(token_type, lexeme, None)
-            else:
-                # Multi-character operator
-                op_str = self.scanner.peek_string(length)
-                if op_str in MULTI_CHAR_OPERATORS:
-                    for _ in range(length):
-                        self.scanner.advance()
-                    token_type = MULTI_CHAR_OPERATORS[op_str]
-                    lexeme = self.scanner.get_lexeme()
-                    return self._create_token(token_type, lexeme, None)
+        op_str = self.scanner.scan_pattern(_MULTI_CHAR_OPERATOR)
+        if op_str is not None:
+            token_type = MULTI_CHAR_OPERATORS[op_str]
+            if token_type is TokenType.QUESTION_LBRACKET:
+                self.scanner.enter_bracket()
+            lexeme = self.scanner.get_lexeme()
+            return self._create_token(token_type, lexeme, None)
+        
+        # Single character operator
+        char = self.scanner.current_char
+        if char in SINGLE_CHAR_OPERATORS:
+            self.scanner.advance()
+            token_type = SINGLE_CHAR_OPERATORS[char]
+            lexeme = self.scanner.get_lexeme()
+            return self._create_token(token_type, lexeme, None)
         
         # No operator matched, scan as single character
         char = self.scanner.current_char
@@ -444,6 +510,12 @@ class Lexer:
         self._error(f"Unexpected character: {char}")
         return self._create_token(TokenType.IDENTIFIER, lexeme, None)
     
+    def _follows_operand(self) -> bool:
+        """Whether the current lexeme directly touches a preceding operand token"""
+        previous = self._previous
+        return (previous is not None and previous.type_id in _OPERAND_END_CODES
+                and previous.position + len(previous.lexeme) == self.scanner.start_position.absolute)
+    
     def _scan_single_char_token(self) -> Token:
         """Scan a single character token"""
         char = self.scanner.current_char
@@ -455,18 +527,9 @@ class Lexer:
         lexeme = self.scanner.get_lexeme()
         
         # Update nesting depths
-        if token_type == TokenType.LBRACE:
-            self.scanner.enter_brace()
-        elif token_type == TokenType.RBRACE:
-            self.scanner.exit_brace()
-        elif token_type == TokenType.LPAREN:
-            self.scanner.enter_paren()
-        elif token_type == TokenType.RPAREN:
-            self.scanner.exit_paren()
-        elif token_type == TokenType.LBRACKET:
-            self.scanner.enter_bracket()
-        elif token_type == TokenType.RBRACKET:
-            self.scanner.exit_bracket()
+        nest = _NESTING.get(char)
+        if nest is not None:
+            nest(self.scanner)
         
         return self._create_token(token_type, lexeme, None)
     
@@ -494,13 +557,10 @@ class Lexer:
     
     def _create_token(self, token_type: TokenType, lexeme: str, literal) -> Token:
         """Create a token with current scanner positions"""
-        return Token(
-            type=token_type,
-            lexeme=lexeme,
-            literal=literal,
-            line=self.scanner.start_position.line,
-            column=self.scanner.start_position.column,
-            position=self.scanner.start_position.absolute
+        start = self.scanner.start_position
+        return make_token(
+            token_type, lexeme, literal,
+            start.line, start.column, start.absolute
         )
     
     def _error(self, message: str) -> None:
@@ -532,3 +592,33 @@ class Lexer:
     def token_iter(self) -> Iterator[Token]:
         """Iterate over tokens"""
         return iter(self.tokens)
+
+
+def _build_start_table() -> dict:
+    """Map every ASCII character to the scan method that handles it"""
+    table = {}
+    for code in range(128):
+        char = chr(code)
+        if char == '$':
+            handler = Lexer._scan_variable
+        elif char == '"' or char == "'":
+            handler = Lexer._scan_string
+        elif char == '`':
+            handler = Lexer._scan_escape_string
+        elif char.isdigit():
+            handler = Lexer._scan_number
+        elif char.isalpha() or char == '_':
+            handler = Lexer._scan_identifier_or_keyword
+        elif is_operator_start(char):
+            handler = Lexer._scan_operator
+        elif char == '[':
+            handler = Lexer._scan_lbracket
+        elif char == ']':
+            handler = Lexer._scan_rbracket
+        else:
+            handler = Lexer._scan_single_char_token
+        table[char] = handler
+    return table
+
+# First-character transitions of the token automaton, computed once
+_START_TABLE = _build_start_table()
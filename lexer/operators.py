@@ -83,6 +83,7 @@ MULTI_CHAR_OPERATORS = {
     # Null operators
     '??': TokenType.QUESTION_QUESTION,
     '?.': TokenType.QUESTION_DOT,
+    '?[': TokenType.QUESTION_LBRACKET,
     
     # Special
     '::': TokenType.DOUBLE_COLON,
@@ -104,6 +105,7 @@ OPERATOR_MAP = {v: k for k, v in OPERATORS.items()}
 # Operator precedence table
 OPERATOR_PRECEDENCE = {
     TokenType.QUESTION_DOT: 1,
+    TokenType.QUESTION_LBRACKET: 1,
     TokenType.DOT: 1,
     TokenType.DOUBLE_COLON: 1,
     
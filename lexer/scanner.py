@@ -79,8 +79,8 @@ class Scanner:
             start_pos=SourcePosition()
         )
         
-        # Save point for lookahead
-        self._saved_state: Optional[ScannerState] = None
+        # Save point for lookahead: a flat tuple of scalars, no clones
+        self._checkpoint: Optional[tuple] = None
     
     @property
     def position(self) -> SourcePosition:
@@ -176,8 +176,34 @@ class Scanner:
     
     def skip_line_comment(self) -> None:
         """Skip a line comment"""
-        while not self.is_at_end and self.current_char != '\n':
-            self.advance()
+        end = self.source.find('\n', self._state.position.absolute)
+        self.skip_to(end if end != -1 else self.source_length)
+    
+    def skip_to(self, index: int) -> None:
+        """Jump forward to index, updating line and column in bulk"""
+        pos = self._state.position
+        start = pos.absolute
+        if index <= start:
+            return
+        newlines = self.source.count('\n', start, index)
+        if newlines:
+            pos.line += newlines
+            pos.column = index - self.source.rfind('\n', start, index)
+        else:
+            pos.column += index - start
+        pos.absolute = index
+    
+    def skip_run(self, match) -> None:
+        """Jump past the run that a compiled pattern's match() accepts here"""
+        self.skip_to(match(self.source, self._state.position.absolute).end())
+    
+    def scan_pattern(self, match) -> Optional[str]:
+        """Consume and return the text a compiled pattern's match() accepts here"""
+        found = match(self.source, self._state.position.absolute)
+        if found is None:
+            return None
+        self.skip_to(found.end())
+        return found.group()
     
     def is_newline(self) -> bool:
         """Check if current character is a newline"""
@@ -250,17 +276,34 @@ class Scanner:
     
     def save_state(self) -> None:
         """Save current scanner state for lookahead"""
-        self._saved_state = self._state.clone()
+        state = self._state
+        pos = state.position
+        start = state.start_pos
+        self._checkpoint = (
+            pos.line, pos.column, pos.absolute,
+            start.line, start.column, start.absolute,
+            state.in_string, state.string_delimiter, state.escaped,
+            state.in_comment, state.in_block_comment, state.block_comment_depth,
+            state.brace_depth, state.paren_depth, state.bracket_depth
+        )
     
     def restore_state(self) -> None:
         """Restore scanner state from saved state"""
-        if self._saved_state is not None:
-            self._state = self._saved_state
-        self._saved_state = None
+        checkpoint = self._checkpoint
+        if checkpoint is not None:
+            state = self._state
+            pos = state.position
+            start = state.start_pos
+            (pos.line, pos.column, pos.absolute,
+             start.line, start.column, start.absolute,
+             state.in_string, state.string_delimiter, state.escaped,
+             state.in_comment, state.in_block_comment, state.block_comment_depth,
+             state.brace_depth, state.paren_depth, state.bracket_depth) = checkpoint
+        self._checkpoint = None
     
     def discard_saved_state(self) -> None:
         """Discard saved state without restoring"""
-        self._saved_state = None
+        self._checkpoint = None
     
     def enter_string(self, delimiter: str) -> None:
         """Enter string mode"""
@@ -2,9 +2,10 @@
 Token definitions for PowerLang lexer
 """
 
+from array import array
+from sys import intern
 from enum import Enum, auto
-from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Optional, Any, Iterable
 
 class TokenType(Enum):
     """All token types in PowerLang"""
@@ -83,6 +84,7 @@ class TokenType(Enum):
     STAR = auto()
     SLASH = auto()
     PERCENT = auto()
+    STAR_STAR = auto()
     CARET = auto()
     AMPERSAND = auto()
     PIPE = auto()
@@ -138,6 +140,7 @@ class TokenType(Enum):
     QUESTION = auto()
     QUESTION_QUESTION = auto()
     QUESTION_DOT = auto()
+    QUESTION_LBRACKET = auto()
     
     # Brackets and punctuation
     LBRACKET = auto()
@@ -167,18 +170,34 @@ class TokenType(Enum):
     # End of file
     EOF = auto()
 
-    # Additional operators
-    STAR_STAR = auto()
+# Marks a clone() argument that was not supplied (None is a valid literal)
+_UNSET = object()
 
-@dataclass
 class Token:
     """Token class representing a lexeme with its metadata"""
-    type: TokenType
-    lexeme: str
-    literal: Optional[Any]
-    line: int
-    column: int
-    position: int
+    
+    __slots__ = ('type', 'type_id', 'lexeme', 'literal', 'line', 'column', 'position')
+    
+    def __init__(self, type: TokenType, lexeme: str, literal: Optional[Any],
+                 line: int, column: int, position: int):
+        self.type = type
+        # Integer tag of the type, set once so hot paths compare plain ints.
+        # _value_ is a plain attribute; the enum's value property is far slower
+        self.type_id = type._value_
+        self.lexeme = lexeme
+        self.literal = literal
+        self.line = line
+        self.column = column
+        self.position = position
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Token:
+            return NotImplemented
+        return (self.type is other.type and self.lexeme == other.lexeme
+                and self.literal == other.literal and self.line == other.line
+                and self.column == other.column and self.position == other.position)
+    
+    __hash__ = None
     
     def __str__(self) -> str:
         return f"Token({self.type}, '{self.lexeme}', {self.literal}, line={self.line}, col={self.column})"
@@ -191,15 +210,74 @@ class Token:
         """Length of the lexeme"""
         return len(self.lexeme)
     
-    def clone(self, new_type: Optional[TokenType] = None, 
-              new_lexeme: Optional[str] = None,
-              new_literal: Optional[Any] = None) -> 'Token':
+    def clone(self, new_type: Any = _UNSET, new_lexeme: Any = _UNSET,
+              new_literal: Any = _UNSET) -> 'Token':
         """Create a copy of the token with optional modifications"""
-        return Token(
-            type=new_type or self.type,
-            lexeme=new_lexeme or self.lexeme,
-            literal=new_literal or self.literal,
-            line=self.line,
-            column=self.column,
-            position=self.position
-        )
+        token = Token.__new__(Token)
+        token.type = self.type if new_type is _UNSET else new_type
+        token.type_id = token.type._value_
+        token.lexeme = self.lexeme if new_lexeme is _UNSET else new_lexeme
+        token.literal = self.literal if new_literal is _UNSET else new_literal
+        token.line = self.line
+        token.column = self.column
+        token.position = self.position
+        return token
+
+
+# TokenType members indexed by their integer value, for decoding type codes
+TOKEN_TYPE_BY_CODE = (None,) + tuple(sorted(TokenType, key=lambda t: t.value))
+
+
+class TokenStream:
+    """Token sequence stored alongside compact per-field arrays"""
+    
+    __slots__ = ('tokens', 'types', '_lines', '_columns')
+    
+    def __init__(self, tokens: Iterable[Token]):
+        # A token generator is materialized once; a list is kept as is
+        self.tokens = tokens = tokens if isinstance(tokens, list) else list(tokens)
+        # One byte per token type code; decode with TOKEN_TYPE_BY_CODE.
+        # Filled from generators so no temporary int lists are built.
+        self.types = array('B', (token.type_id for token in tokens))
+        # The parser only reads types, so position arrays are built on demand
+        self._lines: Optional[array] = None
+        self._columns: Optional[array] = None
+    
+    @property
+    def lines(self) -> array:
+        """Line of each token"""
+        if self._lines is None:
+            self._lines = array('I', (token.line for token in self.tokens))
+        return self._lines
+    
+    @property
+    def columns(self) -> array:
+        """Column of each token"""
+        if self._columns is None:
+            self._columns = array('I', (token.column for token in self.tokens))
+        return self._columns
+    
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        return self.tokens[index]
+    
+    def __iter__(self):
+        return iter(self.tokens)
+    
+    def type_at(self, index: int) -> TokenType:
+        """Token type at index"""
+        return TOKEN_TYPE_BY_CODE[self.types[index]]
+
+
+# Lexemes of tokens without a literal (operators, punctuation, keywords,
+# identifiers) are interned, so repeated occurrences reuse one str object and
+# name lookups downstream compare by identity. Unlike a module-level pool,
+# interned strings are freed once no token refers to them.
+def make_token(type: TokenType, lexeme: str, literal: Optional[Any],
+               line: int, column: int, position: int) -> Token:
+    """Create a token, interning the lexeme of literal-free tokens"""
+    if literal is None:
+        lexeme = intern(lexeme)
+    return Token(type, lexeme, literal, line, column, position)
@@ -7,7 +7,7 @@ from .ast import (
     ASTNode, Statement, Expression,
     
     # Statements
-    Program, Block, ExpressionStatement, VariableDeclaration,
+    Program, Block, LazyBlock, ExpressionStatement, VariableDeclaration,
     FunctionDeclaration, ClassDeclaration, NamespaceDeclaration,
     IfStatement, ForStatement, WhileStatement, DoWhileStatement,
     ForeachStatement, SwitchStatement, CaseClause, DefaultClause,
@@ -23,18 +23,21 @@ from .ast import (
     LambdaExpression, TernaryExpression, RangeExpression,
     
     # Other
-    Parameter, TypeAnnotation, Comment
+    Parameter, TypeAnnotation, Comment,
+    
+    # Node recycling
+    recycle
 )
 
 from .parser import Parser
 from .grammar import Grammar, GrammarRule
 from .precedence import Precedence, Associativity, get_precedence, get_associativity
-from .validation import SyntaxValidator
+from .validation import SyntaxValidator, DiagnosticCode
 
 __all__ = [
     # AST Nodes
     'ASTNode', 'Statement', 'Expression',
-    'Program', 'Block', 'ExpressionStatement', 'VariableDeclaration',
+    'Program', 'Block', 'LazyBlock', 'ExpressionStatement', 'VariableDeclaration',
     'FunctionDeclaration', 'ClassDeclaration', 'NamespaceDeclaration',
     'IfStatement', 'ForStatement', 'WhileStatement', 'DoWhileStatement',
     'ForeachStatement', 'SwitchStatement', 'CaseClause', 'DefaultClause',
@@ -47,6 +50,7 @@ __all__ = [
     'ArrayLiteral', 'HashLiteral', 'HashPair',
     'LambdaExpression', 'TernaryExpression', 'RangeExpression',
     'Parameter', 'TypeAnnotation', 'Comment',
+    'recycle',
     
     # Parser
     'Parser',
@@ -58,5 +62,5 @@ __all__ = [
     'Precedence', 'Associativity', 'get_precedence', 'get_associativity',
     
     # Validation
-    'SyntaxValidator',
+    'SyntaxValidator', 'DiagnosticCode',
 ]
@@ -1,13 +1,20 @@
 """Abstract Syntax Tree (AST) node definitions for PowerLang"""
 
-from enum import Enum, auto
-from dataclasses import dataclass, field
-from typing import Optional, List, Any, Union, Dict
+import sys
+from operator import attrgetter
+from enum import Enum, IntEnum, auto
+from dataclasses import dataclass, field, fields
+from typing import Optional, List, Any, Union, Dict, Callable, ClassVar, Final, NamedTuple, Sequence, Tuple
 from ..lexer.tokens import Token, TokenType
 
 
-class NodeType(Enum):
+class NodeType(IntEnum):
     """Types of AST nodes"""
+    
+    # Values index the dispatch lists below; print like a plain Enum
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
+    
     # Program structure
     PROGRAM = auto()
     BLOCK = auto()
@@ -62,79 +69,201 @@ class NodeType(Enum):
     COMMENT = auto()
 
 
-@dataclass
+# Shared empty sequence for reading optional list fields that are None
+EMPTY: Final[Tuple[()]] = ()
+
+
+def _strip_sigil(name: str) -> str:
+    """Drop a leading $ from a variable name"""
+    return name[1:] if name.startswith('$') else name
+
+
+# Visitor method name for every node type, built once at import
+_VISIT_NAMES: Dict[NodeType, str] = {
+    node_type: sys.intern(f'visit_{node_type.name.lower()}') for node_type in NodeType
+}
+
+# Length of lists indexed by NodeType
+_NODE_TYPE_SLOTS = max(NodeType) + 1
+
+# Per visitor class: handler list indexed by NodeType, resolved once
+_VISITOR_TABLES: Dict[type, List[Any]] = {}
+
+# Per node class: names of its repr fields, and whether it has a node_type
+_FIELD_LAYOUTS: Dict[type, Tuple[Tuple[str, ...], bool]] = {}
+
+
+def _build_visitor_table(visitor_class: type) -> List[Any]:
+    """Resolve the handler for every node type on a visitor class"""
+    fallback = getattr(visitor_class, 'visit', None)
+    table: List[Any] = [None] * _NODE_TYPE_SLOTS
+    for node_type in NodeType:
+        method_name = _VISIT_NAMES[node_type]
+        handler = getattr(visitor_class, method_name, None) or fallback
+        if handler is None:
+            def handler(visitor, node, method_name=method_name):
+                raise NotImplementedError(
+                    f"Visitor doesn't implement {method_name} or visit()"
+                )
+        table[node_type] = handler
+    _VISITOR_TABLES[visitor_class] = table
+    return table
+
+
+@dataclass(slots=True)
 class ASTNode:
     line: int
     column: int
-    node_type: NodeType = field(init=False)
+    node_type: ClassVar[NodeType]
     
     def accept(self, visitor) -> Any:
-        method_name = f'visit_{self.node_type.name.lower()}'
-        if hasattr(visitor, method_name):
-            return getattr(visitor, method_name)(self)
-        elif hasattr(visitor, 'visit'):
-            return visitor.visit(self)
-        else:
-            raise NotImplementedError(
-                f"Visitor doesn't implement {method_name} or visit()"
-            )
+        table = _VISITOR_TABLES.get(visitor.__class__)
+        if table is None:
+            table = _build_visitor_table(visitor.__class__)
+        return table[self.node_type](visitor, self)
+    
+    def children(self) -> Sequence['ASTNode']:
+        """Sub-nodes in visiting order, skipping absent optional ones.
+        The result may be the node's own list, so do not modify it"""
+        return _CHILDREN[self.node_type](self)
     
     def pretty(self, indent: int = 0) -> str:
         visitor = ASTVisitor()
         return visitor.pretty(self, indent)
 
 
-@dataclass
+@dataclass(slots=True)
 class Statement(ASTNode):
     """Base class for all statements"""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Expression(ASTNode):
     """Base class for all expressions"""
     pass
 
 
+def _plain_node_repr(self) -> str:
+    values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__match_args__)
+    return f"{self.__class__.__qualname__}({values})"
+
+
+def _plain_node_eq(self, other) -> bool:
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    return self._field_getter(self) == self._field_getter(other)
+
+
+def _plain_node(cls: type) -> type:
+    """Give a hand-written slotted node class the dataclass repr, eq and field layout"""
+    names = tuple(
+        name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ())
+    )
+    cls.__match_args__ = names
+    cls._field_getter = attrgetter(*names)
+    cls.__repr__ = _plain_node_repr
+    cls.__eq__ = _plain_node_eq
+    cls.__hash__ = None
+    _FIELD_LAYOUTS[cls] = (names, True)
+    return cls
+
+
 # ============================================================================
 # Program Structure
 # ============================================================================
 
-@dataclass
+@dataclass(init=False, slots=True)
 class Program(Statement):
     """Root node representing an entire program"""
     statements: List[Statement]
-    namespaces: List['NamespaceDeclaration'] = field(default_factory=list)
-    classes: List['ClassDeclaration'] = field(default_factory=list)
-    functions: List['FunctionDeclaration'] = field(default_factory=list)
     
-    def __post_init__(self):
-        self.node_type = NodeType.PROGRAM
+    node_type: ClassVar[NodeType] = NodeType.PROGRAM
+    
+    def __init__(self, line: int, column: int, statements: List[Statement],
+                 namespaces: Optional[List['NamespaceDeclaration']] = None,
+                 classes: Optional[List['ClassDeclaration']] = None,
+                 functions: Optional[List['FunctionDeclaration']] = None):
+        self.line = line
+        self.column = column
+        # Top-level declarations live in statements; extras are folded in
+        for declarations in (namespaces, classes, functions):
+            if declarations:
+                statements = statements + declarations
+        self.statements = statements
+    
+    @property
+    def namespaces(self) -> Sequence['NamespaceDeclaration']:
+        """Top-level namespace declarations"""
+        return [s for s in self.statements if s.node_type is NodeType.NAMESPACE_DECLARATION]
+    
+    @property
+    def classes(self) -> Sequence['ClassDeclaration']:
+        """Top-level class declarations"""
+        return [s for s in self.statements if s.node_type is NodeType.CLASS_DECLARATION]
+    
+    @property
+    def functions(self) -> Sequence['FunctionDeclaration']:
+        """Top-level function declarations"""
+        return [s for s in self.statements if s.node_type is NodeType.FUNCTION_DECLARATION]
 
 
-@dataclass
+@dataclass(slots=True)
 class Block(Statement):
     """Block of statements"""
     statements: List[Statement]
     
-    def __post_init__(self):
-        self.node_type = NodeType.BLOCK
+    node_type: ClassVar[NodeType] = NodeType.BLOCK
+
+
+# Slot descriptor holding a Block's statement list
+_block_statements = Block.__dict__['statements']
+
+
+class LazyBlock(Block):
+    """Block whose statements are parsed from a recorded token span on first access"""
+    __slots__ = ('_parse_span', '_span')
+    
+    def __init__(self, line: int, column: int,
+                 parse_span: Callable[[int, int], List[Statement]], start: int, end: int):
+        self.line = line
+        self.column = column
+        self._parse_span = parse_span
+        self._span = (start, end)
+    
+    @property
+    def statements(self) -> List[Statement]:
+        parse_span = self._parse_span
+        if parse_span is not None:
+            self._parse_span = None
+            _block_statements.__set__(self, parse_span(*self._span))
+        return _block_statements.__get__(self, Block)
+    
+    @statements.setter
+    def statements(self, statements: List[Statement]) -> None:
+        self._parse_span = None
+        _block_statements.__set__(self, statements)
 
 
 # ============================================================================
 # Statements
 # ============================================================================
 
-@dataclass
+@_plain_node
 class ExpressionStatement(Statement):
     """Statement consisting of a single expression"""
+    __slots__ = ('expression',)
     expression: Expression
     
-    def __post_init__(self):
-        self.node_type = NodeType.EXPRESSION_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.EXPRESSION_STATEMENT
+    
+    def __init__(self, line: int, column: int, expression: Expression):
+        self.line = line
+        self.column = column
+        self.expression = expression
 
 
-@dataclass
+@dataclass(slots=True)
 class VariableDeclaration(Statement):
     """Variable declaration statement"""
     name_token: Token  # $name or name
@@ -144,20 +273,20 @@ class VariableDeclaration(Statement):
     is_global: bool = False
     is_private: bool = False
     is_readonly: bool = False
+    _name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        self.node_type = NodeType.VARIABLE_DECLARATION
+    node_type: ClassVar[NodeType] = NodeType.VARIABLE_DECLARATION
     
     @property
     def name(self) -> str:
         """Get variable name without $ prefix"""
-        name = self.name_token.lexeme
-        if name.startswith('$'):
-            return name[1:]
+        name = self._name
+        if name is None:
+            name = self._name = _strip_sigil(self.name_token.lexeme)
         return name
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameter(ASTNode):
     """Function or method parameter"""
     name_token: Token
@@ -166,8 +295,7 @@ class Parameter(ASTNode):
     is_ref: bool = False
     is_params: bool = False  # For params array
     
-    def __post_init__(self):
-        self.node_type = NodeType.PARAMETER
+    node_type: ClassVar[NodeType] = NodeType.PARAMETER
     
     @property
     def name(self) -> str:
@@ -175,7 +303,7 @@ class Parameter(ASTNode):
         return self.name_token.lexeme
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDeclaration(Statement):
     """Function declaration"""
     name_token: Token
@@ -186,8 +314,7 @@ class FunctionDeclaration(Statement):
     is_export: bool = False
     is_private: bool = False
     
-    def __post_init__(self):
-        self.node_type = NodeType.FUNCTION_DECLARATION
+    node_type: ClassVar[NodeType] = NodeType.FUNCTION_DECLARATION
     
     @property
     def name(self) -> str:
@@ -195,20 +322,19 @@ class FunctionDeclaration(Statement):
         return self.name_token.lexeme
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassDeclaration(Statement):
     """Class declaration"""
     name_token: Token
     members: List[Statement]  # Fields, methods, properties
     base_class: Optional[Expression] = None
-    interfaces: List[Expression] = field(default_factory=list)
+    interfaces: Optional[List[Expression]] = None
     is_abstract: bool = False
     is_sealed: bool = False
     is_static: bool = False
     is_export: bool = False
     
-    def __post_init__(self):
-        self.node_type = NodeType.CLASS_DECLARATION
+    node_type: ClassVar[NodeType] = NodeType.CLASS_DECLARATION
     
     @property
     def name(self) -> str:
@@ -216,14 +342,13 @@ class ClassDeclaration(Statement):
         return self.name_token.lexeme
 
 
-@dataclass
+@dataclass(slots=True)
 class NamespaceDeclaration(Statement):
     """Namespace declaration"""
     name_parts: List[Token]  # e.g., ['MyCompany', 'MyApp']
     body: Program
     
-    def __post_init__(self):
-        self.node_type = NodeType.NAMESPACE_DECLARATION
+    node_type: ClassVar[NodeType] = NodeType.NAMESPACE_DECLARATION
     
     @property
     def full_name(self) -> str:
@@ -231,226 +356,235 @@ class NamespaceDeclaration(Statement):
         return '.'.join(token.lexeme for token in self.name_parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class IfStatement(Statement):
     """If statement with optional elseif and else branches"""
     condition: Expression
     then_branch: Statement
-    elseif_branches: List['ElseIfBranch'] = field(default_factory=list)
+    elseif_branches: Optional[List['ElseIfBranch']] = None
     else_branch: Optional[Statement] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.IF_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.IF_STATEMENT
 
 
-@dataclass
-class ElseIfBranch:
-    """Elseif branch in an if statement"""
+class ElseIfBranch(NamedTuple):
+    """Elseif branch in an if statement (a plain record, not a visited node)"""
     condition: Expression
     branch: Statement
     line: int
     column: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ForStatement(Statement):
     body: Statement
     initializer: Optional[Statement] = None
     condition: Optional[Expression] = None
     increment: Optional[Expression] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.FOR_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.FOR_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class WhileStatement(Statement):
     """While loop statement"""
     condition: Expression
     body: Statement
     is_do_while: bool = False
     
-    def __post_init__(self):
-        self.node_type = NodeType.WHILE_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.WHILE_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class DoWhileStatement(Statement):
     """Do-while loop statement"""
     body: Statement
     condition: Expression
     
-    def __post_init__(self):
-        self.node_type = NodeType.DO_WHILE_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.DO_WHILE_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class ForeachStatement(Statement):
     """Foreach loop statement"""
     variable_token: Token
     collection: Expression
     body: Statement
     variable_type: Optional['TypeAnnotation'] = None
+    _variable_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        self.node_type = NodeType.FOREACH_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.FOREACH_STATEMENT
     
     @property
     def variable_name(self) -> str:
         """Get variable name"""
-        name = self.variable_token.lexeme
-        if name.startswith('$'):
-            return name[1:]
+        name = self._variable_name
+        if name is None:
+            name = self._variable_name = _strip_sigil(self.variable_token.lexeme)
         return name
 
 
-@dataclass
+@dataclass(slots=True)
 class SwitchStatement(Statement):
     """Switch statement"""
     expression: Expression
-    cases: List['CaseClause'] = field(default_factory=list)
+    cases: Optional[List['CaseClause']] = None
     default_case: Optional['DefaultClause'] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.SWITCH_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.SWITCH_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class CaseClause(ASTNode):
     """Case clause in a switch statement"""
     values: List[Expression]  # Can have multiple values for one case
     body: Block
     
-    def __post_init__(self):
-        self.node_type = NodeType.CASE_CLAUSE
+    node_type: ClassVar[NodeType] = NodeType.CASE_CLAUSE
 
 
-@dataclass
+@dataclass(slots=True)
 class DefaultClause(ASTNode):
     """Default clause in a switch statement"""
     body: Block
     
-    def __post_init__(self):
-        self.node_type = NodeType.DEFAULT_CLAUSE
+    node_type: ClassVar[NodeType] = NodeType.DEFAULT_CLAUSE
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStatement(Statement):
     """Return statement"""
     value: Optional[Expression] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.RETURN_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.RETURN_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class BreakStatement(Statement):
     """Break statement"""
     label: Optional[str] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.BREAK_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.BREAK_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class ContinueStatement(Statement):
     """Continue statement"""
     label: Optional[str] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.CONTINUE_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.CONTINUE_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class TryCatchStatement(Statement):
     """Try-catch-finally statement"""
     try_block: Block
-    catch_clauses: List['CatchClause'] = field(default_factory=list)
+    catch_clauses: Optional[List['CatchClause']] = None
     finally_block: Optional[Block] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.TRY_CATCH_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.TRY_CATCH_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class CatchClause(ASTNode):
     block: Block
     exception_type: Optional[Expression] = None
     exception_variable: Optional[Token] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.CATCH_CLAUSE
+    node_type: ClassVar[NodeType] = NodeType.CATCH_CLAUSE
 
 
-@dataclass
+@dataclass(slots=True)
 class FinallyClause(ASTNode):
     """Finally clause in try-catch statement"""
     block: Block
     
-    def __post_init__(self):
-        self.node_type = NodeType.FINALLY_CLAUSE
+    node_type: ClassVar[NodeType] = NodeType.FINALLY_CLAUSE
 
 
-@dataclass
+@dataclass(slots=True)
 class ThrowStatement(Statement):
     """Throw statement"""
     expression: Expression
     
-    def __post_init__(self):
-        self.node_type = NodeType.THROW_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.THROW_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportStatement(Statement):
     """Import statement"""
     module_path: List[Token]  # Could be simple name or dotted path
     alias: Optional[Token] = None
     import_all: bool = False
-    imports: List[Token] = field(default_factory=list)  # Specific imports
+    imports: Optional[List[Token]] = None  # Specific imports
     
-    def __post_init__(self):
-        self.node_type = NodeType.IMPORT_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.IMPORT_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportStatement(Statement):
     """Export statement"""
     declaration: Statement  # What to export
     
-    def __post_init__(self):
-        self.node_type = NodeType.EXPORT_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.EXPORT_STATEMENT
 
 
-@dataclass
+@dataclass(slots=True)
 class UsingStatement(Statement):
     """Using/namespace import statement"""
     namespace_parts: List[Token]
     
-    def __post_init__(self):
-        self.node_type = NodeType.USING_STATEMENT
+    node_type: ClassVar[NodeType] = NodeType.USING_STATEMENT
 
 
 # ============================================================================
 # Expressions
 # ============================================================================
 
-@dataclass
+# Freelists of recycled leaf nodes, refilled by recycle()
+_LEAF_POOL_LIMIT = 4096
+_literal_pool: List["Literal"] = []
+_variable_pool: List["Variable"] = []
+
+
+@_plain_node
 class Literal(Expression):
     """Literal value expression"""
+    __slots__ = ('token', 'value')
     token: Token
     value: Any
     
-    def __post_init__(self):
-        self.node_type = NodeType.LITERAL
+    node_type: ClassVar[NodeType] = NodeType.LITERAL
+    
+    def __new__(cls, *args, **kwargs):
+        if cls is Literal and _literal_pool:
+            return _literal_pool.pop()
+        return object.__new__(cls)
+    
+    def __init__(self, line: int, column: int, token: Token, value: Any):
+        self.line = line
+        self.column = column
+        self.token = token
+        self.value = value
 
 
-@dataclass
+@_plain_node
 class Variable(Expression):
     """Variable reference expression"""
+    __slots__ = ('name_token',)
     name_token: Token  # $name or name
     
-    def __post_init__(self):
-        self.node_type = NodeType.VARIABLE
+    node_type: ClassVar[NodeType] = NodeType.VARIABLE
+    
+    def __new__(cls, *args, **kwargs):
+        if cls is Variable and _variable_pool:
+            return _variable_pool.pop()
+        return object.__new__(cls)
+    
+    def __init__(self, line: int, column: int, name_token: Token):
+        self.line = line
+        self.column = column
+        self.name_token = name_token
     
     @property
     def name(self) -> str:
@@ -458,59 +592,100 @@ class Variable(Expression):
         return self.name_token.lexeme
 
 
-@dataclass
+@_plain_node
 class BinaryOperation(Expression):
     """Binary operation expression"""
+    __slots__ = ('left', 'operator', 'right')
     left: Expression
     operator: Token
     right: Expression
     
-    def __post_init__(self):
-        self.node_type = NodeType.BINARY_OPERATION
+    node_type: ClassVar[NodeType] = NodeType.BINARY_OPERATION
+    
+    def __init__(self, line: int, column: int, left: Expression,
+                 operator: Token, right: Expression):
+        self.line = line
+        self.column = column
+        self.left = left
+        self.operator = operator
+        self.right = right
 
 
-@dataclass
+@_plain_node
 class UnaryOperation(Expression):
     """Unary operation expression"""
+    __slots__ = ('operator', 'operand', 'is_postfix')
     operator: Token
     operand: Expression
-    is_postfix: bool = False
+    is_postfix: bool
+    
+    node_type: ClassVar[NodeType] = NodeType.UNARY_OPERATION
     
-    def __post_init__(self):
-        self.node_type = NodeType.UNARY_OPERATION
+    def __init__(self, line: int, column: int, operator: Token,
+                 operand: Expression, is_postfix: bool = False):
+        self.line = line
+        self.column = column
+        self.operator = operator
+        self.operand = operand
+        self.is_postfix = is_postfix
 
 
-@dataclass
+@_plain_node
 class Assignment(Expression):
     """Assignment expression"""
+    __slots__ = ('target', 'operator', 'value')
     target: Expression  # Variable, member access, index access
     operator: Token  # =, +=, -=, etc.
     value: Expression
     
-    def __post_init__(self):
-        self.node_type = NodeType.ASSIGNMENT
+    node_type: ClassVar[NodeType] = NodeType.ASSIGNMENT
+    
+    def __init__(self, line: int, column: int, target: Expression,
+                 operator: Token, value: Expression):
+        self.line = line
+        self.column = column
+        self.target = target
+        self.operator = operator
+        self.value = value
 
 
-@dataclass
+@_plain_node
 class CallExpression(Expression):
     """Function/method call expression"""
+    __slots__ = ('callee', 'arguments', 'is_null_conditional')
     callee: Expression
-    arguments: List[Expression] = field(default_factory=list)
-    is_null_conditional: bool = False  # ?. call
+    arguments: Optional[List[Expression]]
+    is_null_conditional: bool  # ?. call
     
-    def __post_init__(self):
-        self.node_type = NodeType.CALL_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.CALL_EXPRESSION
+    
+    def __init__(self, line: int, column: int, callee: Expression,
+                 arguments: Optional[List[Expression]] = None,
+                 is_null_conditional: bool = False):
+        self.line = line
+        self.column = column
+        self.callee = callee
+        self.arguments = arguments
+        self.is_null_conditional = is_null_conditional
 
 
-@dataclass
+@_plain_node
 class MemberAccess(Expression):
     """Member access expression (object.member)"""
+    __slots__ = ('object', 'member_token', 'is_null_conditional')
     object: Expression
     member_token: Token
-    is_null_conditional: bool = False  # ?. access
+    is_null_conditional: bool  # ?. access
+    
+    node_type: ClassVar[NodeType] = NodeType.MEMBER_ACCESS
     
-    def __post_init__(self):
-        self.node_type = NodeType.MEMBER_ACCESS
+    def __init__(self, line: int, column: int, object: Expression,
+                 member_token: Token, is_null_conditional: bool = False):
+        self.line = line
+        self.column = column
+        self.object = object
+        self.member_token = member_token
+        self.is_null_conditional = is_null_conditional
     
     @property
     def member_name(self) -> str:
@@ -518,28 +693,35 @@ class MemberAccess(Expression):
         return self.member_token.lexeme
 
 
-@dataclass
+@_plain_node
 class IndexAccess(Expression):
     """Index/array access expression"""
+    __slots__ = ('object', 'index', 'is_null_conditional')
     object: Expression
     index: Expression
-    is_null_conditional: bool = False  # ?[ index
+    is_null_conditional: bool  # ?[ index
     
-    def __post_init__(self):
-        self.node_type = NodeType.INDEX_ACCESS
+    node_type: ClassVar[NodeType] = NodeType.INDEX_ACCESS
+    
+    def __init__(self, line: int, column: int, object: Expression,
+                 index: Expression, is_null_conditional: bool = False):
+        self.line = line
+        self.column = column
+        self.object = object
+        self.index = index
+        self.is_null_conditional = is_null_conditional
 
 
-@dataclass
+@dataclass(slots=True)
 class NewExpression(Expression):
     """New object creation expression"""
     type_expression: Expression  # Could be TypeExpression or Variable
-    arguments: List[Expression] = field(default_factory=list)
+    arguments: Optional[List[Expression]] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.NEW_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.NEW_EXPRESSION
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeExpression(Expression):
     """Type expression for casting or type checking"""
     type_token: Token  # int, string, etc. or user-defined type
@@ -547,8 +729,7 @@ class TypeExpression(Expression):
     is_array: bool = False
     array_rank: int = 1  # For multidimensional arrays
     
-    def __post_init__(self):
-        self.node_type = NodeType.TYPE_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.TYPE_EXPRESSION
     
     @property
     def type_name(self) -> str:
@@ -556,273 +737,389 @@ class TypeExpression(Expression):
         return self.type_token.lexeme
 
 
-@dataclass
+@dataclass(slots=True)
 class CastExpression(Expression):
     """Type cast expression"""
     expression: Expression
     type_expression: TypeExpression
     is_safe_cast: bool = False  # as operator
     
-    def __post_init__(self):
-        self.node_type = NodeType.CAST_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.CAST_EXPRESSION
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeAnnotation(ASTNode):
     """Type annotation for variables, parameters, returns"""
     type_expression: TypeExpression
     
-    def __post_init__(self):
-        self.node_type = NodeType.TYPE_ANNOTATION
+    node_type: ClassVar[NodeType] = NodeType.TYPE_ANNOTATION
 
 
-@dataclass
+@dataclass(slots=True)
 class ArrayLiteral(Expression):
     """Array literal expression @(...)"""
-    elements: List[Expression] = field(default_factory=list)
+    elements: Optional[List[Expression]] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.ARRAY_LITERAL
+    node_type: ClassVar[NodeType] = NodeType.ARRAY_LITERAL
 
 
-@dataclass
+@dataclass(slots=True)
 class HashPair(ASTNode):
     key: Expression
     value: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class HashLiteral(Expression):
     """Hash literal expression @{...}"""
-    pairs: List[HashPair] = field(default_factory=list)
+    pairs: Optional[List[HashPair]] = None
     
-    def __post_init__(self):
-        self.node_type = NodeType.HASH_LITERAL
+    node_type: ClassVar[NodeType] = NodeType.HASH_LITERAL
 
 
-@dataclass
+@dataclass(slots=True)
 class LambdaExpression(Expression):
     body: Union[Expression, Block]
-    parameters: List[Parameter] = field(default_factory=list)
+    parameters: Optional[List[Parameter]] = None
     is_async: bool = False
     
-    def __post_init__(self):
-        self.node_type = NodeType.LAMBDA_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.LAMBDA_EXPRESSION
 
 
-@dataclass
+@dataclass(slots=True)
 class TernaryExpression(Expression):
     """Ternary conditional expression (condition ? then : else)"""
     condition: Expression
     then_expr: Expression
     else_expr: Expression
     
-    def __post_init__(self):
-        self.node_type = NodeType.TERNARY_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.TERNARY_EXPRESSION
 
 
-@dataclass
+@dataclass(slots=True)
 class RangeExpression(Expression):
     """Range expression (start..end)"""
     start: Expression
     end: Expression
     inclusive: bool = True  # .. is inclusive, ..< would be exclusive
     
-    def __post_init__(self):
-        self.node_type = NodeType.RANGE_EXPRESSION
+    node_type: ClassVar[NodeType] = NodeType.RANGE_EXPRESSION
 
 
 # ============================================================================
 # Comments
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Comment(ASTNode):
     """Comment node"""
     token: Token
     text: str
     is_block: bool = False
     
-    def __post_init__(self):
-        self.node_type = NodeType.COMMENT
+    node_type: ClassVar[NodeType] = NodeType.COMMENT
+
+
+_MISSING = object()
+
+
+def _field_layout(node_class: type) -> Tuple[Tuple[str, ...], bool]:
+    """Resolve a node class's printed field layout once"""
+    layout = _FIELD_LAYOUTS.get(node_class)
+    if layout is None:
+        names = tuple(f.name for f in fields(node_class) if f.repr)
+        layout = _FIELD_LAYOUTS[node_class] = (names, hasattr(node_class, 'node_type'))
+    return layout
+
+
+def _field_values(node: ASTNode):
+    """Yield (name, value) for each set field, node_type last"""
+    names, has_node_type = _field_layout(node.__class__)
+    for name in names:
+        value = getattr(node, name, _MISSING)
+        if value is not _MISSING:
+            yield name, value
+    if has_node_type:
+        yield 'node_type', node.node_type
 
 
 # Visitor base class for pattern matching
 class ASTVisitor:
     """Base visitor class for traversing AST"""
     
+    # Unbound visit_* method (or None) indexed by NodeType, rebuilt per subclass
+    _dispatch: List[Any] = [None] * _NODE_TYPE_SLOTS
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        dispatch: List[Any] = [None] * _NODE_TYPE_SLOTS
+        for node_type, method_name in _VISIT_NAMES.items():
+            method = getattr(cls, method_name, None)
+            if method is not None:
+                dispatch[node_type] = method
+        cls._dispatch = dispatch
+    
     def visit(self, node: ASTNode) -> Any:
         """Visit a node, dispatching to appropriate method"""
-        method_name = f'visit_{node.node_type.name.lower()}'
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(node)
-        else:
-            return self.generic_visit(node)
+        method = self._dispatch[node.node_type]
+        if method is not None:
+            return method(self, node)
+        return self.generic_visit(node)
     
     def generic_visit(self, node: ASTNode) -> Any:
         """Generic visitor for nodes without specific handler"""
-        # Visit children based on node type
-        if isinstance(node, Program):
-            for stmt in node.statements:
-                self.visit(stmt)
-            for ns in node.namespaces:
-                self.visit(ns)
-            for cls in node.classes:
-                self.visit(cls)
-            for func in node.functions:
-                self.visit(func)
-        elif isinstance(node, Block):
-            for stmt in node.statements:
-                self.visit(stmt)
-        elif isinstance(node, ExpressionStatement):
-            self.visit(node.expression)
-        elif isinstance(node, VariableDeclaration):
-            if node.type_annotation:
-                self.visit(node.type_annotation)
-            if node.initializer:
-                self.visit(node.initializer)
-        elif isinstance(node, FunctionDeclaration):
-            for param in node.parameters:
-                self.visit(param)
-            if node.return_type:
-                self.visit(node.return_type)
-            self.visit(node.body)
-        elif isinstance(node, ClassDeclaration):
-            if node.base_class:
-                self.visit(node.base_class)
-            for iface in node.interfaces:
-                self.visit(iface)
-            for member in node.members:
-                self.visit(member)
-        elif isinstance(node, NamespaceDeclaration):
-            self.visit(node.body)
-        elif isinstance(node, IfStatement):
-            self.visit(node.condition)
-            self.visit(node.then_branch)
-            for elseif in node.elseif_branches:
-                self.visit(elseif.condition)
-                self.visit(elseif.branch)
-            if node.else_branch:
-                self.visit(node.else_branch)
-        elif isinstance(node, ForStatement):
-            if node.initializer:
-                self.visit(node.initializer)
-            if node.condition:
-                self.visit(node.condition)
-            if node.increment:
-                self.visit(node.increment)
-            self.visit(node.body)
-        elif isinstance(node, WhileStatement):
-            self.visit(node.condition)
-            self.visit(node.body)
-        elif isinstance(node, DoWhileStatement):
-            self.visit(node.body)
-            self.visit(node.condition)
-        elif isinstance(node, ForeachStatement):
-            if node.variable_type:
-                self.visit(node.variable_type)
-            self.visit(node.collection)
-            self.visit(node.body)
-        elif isinstance(node, SwitchStatement):
-            self.visit(node.expression)
-            for case in node.cases:
-                self.visit(case)
-            if node.default_case:
-                self.visit(node.default_case)
-        elif isinstance(node, CaseClause):
-            for value in node.values:
-                self.visit(value)
-            self.visit(node.body)
-        elif isinstance(node, DefaultClause):
-            self.visit(node.body)
-        elif isinstance(node, ReturnStatement):
-            if node.value:
-                self.visit(node.value)
-        elif isinstance(node, TryCatchStatement):
-            self.visit(node.try_block)
-            for catch in node.catch_clauses:
-                self.visit(catch)
-            if node.finally_block:
-                self.visit(node.finally_block)
-        elif isinstance(node, CatchClause):
-            if node.exception_type:
-                self.visit(node.exception_type)
-            self.visit(node.block)
-        elif isinstance(node, FinallyClause):
-            self.visit(node.block)
-        elif isinstance(node, ThrowStatement):
-            self.visit(node.expression)
-        # Expressions
-        elif isinstance(node, BinaryOperation):
-            self.visit(node.left)
-            self.visit(node.right)
-        elif isinstance(node, UnaryOperation):
-            self.visit(node.operand)
-        elif isinstance(node, Assignment):
-            self.visit(node.target)
-            self.visit(node.value)
-        elif isinstance(node, CallExpression):
-            self.visit(node.callee)
-            for arg in node.arguments:
-                self.visit(arg)
-        elif isinstance(node, MemberAccess):
-            self.visit(node.object)
-        elif isinstance(node, IndexAccess):
-            self.visit(node.object)
-            self.visit(node.index)
-        elif isinstance(node, NewExpression):
-            self.visit(node.type_expression)
-            for arg in node.arguments:
-                self.visit(arg)
-        elif isinstance(node, CastExpression):
-            self.visit(node.expression)
-            self.visit(node.type_expression)
-        elif isinstance(node, TypeAnnotation):
-            self.visit(node.type_expression)
-        elif isinstance(node, TypeExpression):
-            pass  # Leaf node
-        elif isinstance(node, ArrayLiteral):
-            for elem in node.elements:
-                self.visit(elem)
-        elif isinstance(node, HashLiteral):
-            for pair in node.pairs:
-                self.visit(pair.key)
-                self.visit(pair.value)
-        elif isinstance(node, LambdaExpression):
-            for param in node.parameters:
-                self.visit(param)
-            if isinstance(node.body, Block):
-                self.visit(node.body)
-            else:
-                self.visit(node.body)
-        elif isinstance(node, TernaryExpression):
-            self.visit(node.condition)
-            self.visit(node.then_expr)
-            self.visit(node.else_expr)
-        elif isinstance(node, RangeExpression):
-            self.visit(node.start)
-            self.visit(node.end)
-        elif isinstance(node, Literal):
-            pass  # Leaf node
-        elif isinstance(node, Variable):
-            pass  # Leaf node
-        elif isinstance(node, Comment):
-            pass  # Leaf node
+        cls = self.__class__
+        if cls.visit is not ASTVisitor.visit or cls.generic_visit is not ASTVisitor.generic_visit:
+            # Overridden traversal hooks must see every node, so recurse through them
+            visit = self.visit
+            for child in _CHILDREN[node.node_type](node):
+                visit(child)
+            return None
+        
+        # Walk the subtree with an explicit stack, calling handlers where defined;
+        # children are pushed reversed so they pop in visiting order
+        dispatch = self._dispatch
+        children = _CHILDREN
+        has_children = _HAS_CHILDREN
+        stack = list(reversed(children[node.node_type](node)))
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            node = pop()
+            node_type = node.node_type
+            method = dispatch[node_type]
+            if method is not None:
+                method(self, node)
+            elif has_children[node_type]:
+                extend(reversed(children[node_type](node)))
         return None
     
     def pretty(self, node: ASTNode, indent=0):
+        lines: List[str] = []
+        self._pretty_lines(node, indent, lines)
+        return "\n".join(lines)
+    
+    def _pretty_lines(self, node: ASTNode, indent: int, lines: List[str]) -> None:
+        """Append the pretty-printed lines of a subtree to lines"""
         pad = " " * indent
-        result = f"{pad}{node.__class__.__name__}"
-        for k, v in node.__dict__.items():
+        append = lines.append
+        append(f"{pad}{node.__class__.__name__}")
+        for k, v in _field_values(node):
             if isinstance(v, ASTNode):
-                result += f"\n{pad} {k}:\n{self.pretty(v, indent + 2)}"
+                append(f"{pad} {k}:")
+                self._pretty_lines(v, indent + 2, lines)
             elif isinstance(v, list):
-                result += f"\n{pad} {k}:"
+                append(f"{pad} {k}:")
                 for item in v:
                     if isinstance(item, ASTNode):
-                        result += f"\n{self.pretty(item, indent + 2)}"
+                        self._pretty_lines(item, indent + 2, lines)
                     else:
-                        result += f"\n{pad} {item}"
+                        append(f"{pad} {item}")
             else:
-                result += f"\n{pad} {k}: {v}"
-        return result
+                append(f"{pad} {k}: {v}")
+
+
+# ============================================================================
+# Child lists used by ASTNode.children and ASTVisitor.generic_visit
+# (children in visiting order)
+# ============================================================================
+
+def _no_children(node: ASTNode) -> Tuple[()]:
+    return EMPTY  # Leaf node
+
+def _children_statements(node: Union[Program, Block]) -> List[ASTNode]:
+    return node.statements
+
+def _children_expression(node: ASTNode) -> Tuple[ASTNode]:
+    return (node.expression,)
+
+def _children_body(node: ASTNode) -> Tuple[ASTNode]:
+    return (node.body,)
+
+def _children_block(node: ASTNode) -> Tuple[ASTNode]:
+    return (node.block,)
+
+def _children_variable_declaration(node: VariableDeclaration) -> List[ASTNode]:
+    children = []
+    if node.type_annotation:
+        children.append(node.type_annotation)
+    if node.initializer:
+        children.append(node.initializer)
+    return children
+
+def _children_function_declaration(node: FunctionDeclaration) -> List[ASTNode]:
+    children = list(node.parameters)
+    if node.return_type:
+        children.append(node.return_type)
+    children.append(node.body)
+    return children
+
+def _children_class_declaration(node: ClassDeclaration) -> List[ASTNode]:
+    children = [node.base_class] if node.base_class else []
+    children.extend(node.interfaces or EMPTY)
+    children.extend(node.members)
+    return children
+
+def _children_if_statement(node: IfStatement) -> List[ASTNode]:
+    children = [node.condition, node.then_branch]
+    for elseif in node.elseif_branches or EMPTY:
+        children.append(elseif.condition)
+        children.append(elseif.branch)
+    if node.else_branch:
+        children.append(node.else_branch)
+    return children
+
+def _children_for_statement(node: ForStatement) -> List[ASTNode]:
+    children = []
+    if node.initializer:
+        children.append(node.initializer)
+    if node.condition:
+        children.append(node.condition)
+    if node.increment:
+        children.append(node.increment)
+    children.append(node.body)
+    return children
+
+def _children_foreach_statement(node: ForeachStatement) -> List[ASTNode]:
+    children = [node.variable_type] if node.variable_type else []
+    children.append(node.collection)
+    children.append(node.body)
+    return children
+
+def _children_switch_statement(node: SwitchStatement) -> List[ASTNode]:
+    children = [node.expression]
+    children.extend(node.cases or EMPTY)
+    if node.default_case:
+        children.append(node.default_case)
+    return children
+
+def _children_case_clause(node: CaseClause) -> List[ASTNode]:
+    children = list(node.values)
+    children.append(node.body)
+    return children
+
+def _children_return_statement(node: ReturnStatement) -> Tuple[ASTNode, ...]:
+    return (node.value,) if node.value else EMPTY
+
+def _children_try_catch_statement(node: TryCatchStatement) -> List[ASTNode]:
+    children = [node.try_block]
+    children.extend(node.catch_clauses or EMPTY)
+    if node.finally_block:
+        children.append(node.finally_block)
+    return children
+
+def _children_catch_clause(node: CatchClause) -> List[ASTNode]:
+    children = [node.exception_type] if node.exception_type else []
+    children.append(node.block)
+    return children
+
+def _children_unary_operation(node: UnaryOperation) -> Tuple[ASTNode]:
+    return (node.operand,)
+
+def _children_call_expression(node: CallExpression) -> List[ASTNode]:
+    children = [node.callee]
+    children.extend(node.arguments or EMPTY)
+    return children
+
+def _children_member_access(node: MemberAccess) -> Tuple[ASTNode]:
+    return (node.object,)
+
+def _children_new_expression(node: NewExpression) -> List[ASTNode]:
+    children = [node.type_expression]
+    children.extend(node.arguments or EMPTY)
+    return children
+
+def _children_type_annotation(node: TypeAnnotation) -> Tuple[ASTNode]:
+    return (node.type_expression,)
+
+def _children_array_literal(node: ArrayLiteral) -> Sequence[ASTNode]:
+    return node.elements or EMPTY
+
+def _children_hash_literal(node: HashLiteral) -> List[ASTNode]:
+    children = []
+    for pair in node.pairs or EMPTY:
+        children.append(pair.key)
+        children.append(pair.value)
+    return children
+
+def _children_lambda_expression(node: LambdaExpression) -> List[ASTNode]:
+    children = list(node.parameters or EMPTY)
+    children.append(node.body)
+    return children
+
+
+# NodeType -> function listing that node's children; other types are leaves.
+# Fixed-arity nodes read all their children in one attrgetter call.
+_CHILDREN_BY_TYPE: Dict[NodeType, Any] = {
+    NodeType.PROGRAM: _children_statements,
+    NodeType.BLOCK: _children_statements,
+    NodeType.EXPRESSION_STATEMENT: _children_expression,
+    NodeType.VARIABLE_DECLARATION: _children_variable_declaration,
+    NodeType.FUNCTION_DECLARATION: _children_function_declaration,
+    NodeType.CLASS_DECLARATION: _children_class_declaration,
+    NodeType.NAMESPACE_DECLARATION: _children_body,
+    NodeType.IF_STATEMENT: _children_if_statement,
+    NodeType.FOR_STATEMENT: _children_for_statement,
+    NodeType.WHILE_STATEMENT: attrgetter('condition', 'body'),
+    NodeType.DO_WHILE_STATEMENT: attrgetter('body', 'condition'),
+    NodeType.FOREACH_STATEMENT: _children_foreach_statement,
+    NodeType.SWITCH_STATEMENT: _children_switch_statement,
+    NodeType.CASE_CLAUSE: _children_case_clause,
+    NodeType.DEFAULT_CLAUSE: _children_body,
+    NodeType.RETURN_STATEMENT: _children_return_statement,
+    NodeType.TRY_CATCH_STATEMENT: _children_try_catch_statement,
+    NodeType.CATCH_CLAUSE: _children_catch_clause,
+    NodeType.FINALLY_CLAUSE: _children_block,
+    NodeType.THROW_STATEMENT: _children_expression,
+    NodeType.BINARY_OPERATION: attrgetter('left', 'right'),
+    NodeType.UNARY_OPERATION: _children_unary_operation,
+    NodeType.ASSIGNMENT: attrgetter('target', 'value'),
+    NodeType.CALL_EXPRESSION: _children_call_expression,
+    NodeType.MEMBER_ACCESS: _children_member_access,
+    NodeType.INDEX_ACCESS: attrgetter('object', 'index'),
+    NodeType.NEW_EXPRESSION: _children_new_expression,
+    NodeType.CAST_EXPRESSION: attrgetter('expression', 'type_expression'),
+    NodeType.TYPE_ANNOTATION: _children_type_annotation,
+    NodeType.ARRAY_LITERAL: _children_array_literal,
+    NodeType.HASH_LITERAL: _children_hash_literal,
+    NodeType.LAMBDA_EXPRESSION: _children_lambda_expression,
+    NodeType.TERNARY_EXPRESSION: attrgetter('condition', 'then_expr', 'else_expr'),
+    NodeType.RANGE_EXPRESSION: attrgetter('start', 'end'),
+}
+
+# Same table as a list indexed by NodeType
+_CHILDREN: List[Any] = [
+    _CHILDREN_BY_TYPE.get(index, _no_children) for index in range(_NODE_TYPE_SLOTS)
+]
+
+# Whether a NodeType can have children; unhandled leaves are dropped without a call
+_HAS_CHILDREN: List[bool] = [walker is not _no_children for walker in _CHILDREN]
+
+
+# ============================================================================
+# Leaf node recycling
+# ============================================================================
+
+# Token slot of a pooled leaf; a leaf already carrying it is not pooled twice
+_RECYCLED: Any = object()
+
+
+class _LeafRecycler(ASTVisitor):
+    """Return Literal and Variable nodes of a dropped tree to their freelists"""
+    
+    def visit_literal(self, node: Literal) -> None:
+        if (node.__class__ is Literal and node.token is not _RECYCLED
+                and len(_literal_pool) < _LEAF_POOL_LIMIT):
+            node.token = _RECYCLED
+            node.value = None
+            _literal_pool.append(node)
+    
+    def visit_variable(self, node: Variable) -> None:
+        if (node.__class__ is Variable and node.name_token is not _RECYCLED
+                and len(_variable_pool) < _LEAF_POOL_LIMIT):
+            node.name_token = _RECYCLED
+            _variable_pool.append(node)
+
+
+def recycle(node: ASTNode) -> None:
+    """Hand the leaf nodes of a tree back for reuse; the tree must not be used afterwards"""
+    _LeafRecycler().visit(node)
@@ -1,6 +1,7 @@
-from enum import Enum, auto
+from array import array
+from enum import Enum, IntEnum, auto
 from dataclasses import dataclass
-from typing import List, Any
+from typing import List, Any, Dict, FrozenSet, Optional, Sequence, Set, Tuple
 from ..lexer.tokens import TokenType
 
 
@@ -20,12 +21,99 @@ class GrammarRuleType(Enum):
 # Grammar Rule Definition
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class GrammarRule:
     name: str
     rule_type: GrammarRuleType
     productions: List[Any]
 
+# =========================
+# Compiled Grammar Form
+# =========================
+
+class GrammarOp(IntEnum):
+    SEQUENCE = 0
+    CHOICE = 1
+    ZERO_OR_MORE = 2
+    OPTIONAL = 3
+    TOKEN = 4
+    RULE = 5
+
+
+# DSL list heads and the operation they denote
+_DSL_OPS = {
+    "zero_or_more": GrammarOp.ZERO_OR_MORE,
+    "optional": GrammarOp.OPTIONAL,
+    "or": GrammarOp.CHOICE,
+    "sequence": GrammarOp.SEQUENCE,
+}
+
+
+class CompiledGrammar:
+    """
+    Grammar elements as parallel int16 arrays, one slot per element.
+
+    opcodes[i] is the element's GrammarOp. For TOKEN, arg1 is the TokenType
+    value; for RULE, the rule id; for composites, the index of the first
+    child (-1 if none) and arg2 the child count. next_index links siblings
+    (-1 after the last child).
+    """
+
+    def __init__(self):
+        self.opcodes = array('h')
+        self.arg1 = array('h')
+        self.arg2 = array('h')
+        self.next_index = array('h')
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def add(self, op: GrammarOp, arg1: int = -1, arg2: int = 0) -> int:
+        """Append one element and return its index"""
+        self.opcodes.append(op)
+        self.arg1.append(arg1)
+        self.arg2.append(arg2)
+        self.next_index.append(-1)
+        return len(self.opcodes) - 1
+
+    def children(self, index: int) -> List[int]:
+        """Indices of the children of a composite element"""
+        result = []
+        child = self.arg1[index]
+        while child >= 0:
+            result.append(child)
+            child = self.next_index[child]
+        return result
+
+
+def compile_element(element: Any, rule_ids: Dict[str, int], program: CompiledGrammar) -> int:
+    """Compile one DSL element into program and return its element index"""
+    if isinstance(element, TokenType):
+        return program.add(GrammarOp.TOKEN, element.value)
+    if isinstance(element, str):
+        return program.add(GrammarOp.RULE, rule_ids[element])
+
+    op = _DSL_OPS.get(element[0]) if element and isinstance(element[0], str) else None
+    children = element if op is None else element[1:]
+    if op is None:
+        # Bare list: implicit sequence
+        op = GrammarOp.SEQUENCE
+    elif op is not GrammarOp.CHOICE and op is not GrammarOp.SEQUENCE and len(children) != 1:
+        # Quantifiers take a single child; wrap several in a sequence
+        children = [children]
+
+    index = program.add(op, -1, len(children))
+    previous = -1
+    for child in children:
+        child_index = compile_element(child, rule_ids, program)
+        if previous < 0:
+            program.arg1[index] = child_index
+        else:
+            program.next_index[previous] = child_index
+        previous = child_index
+    return index
+
+
 # =========================
 # Grammar Container
 # =========================
@@ -40,6 +128,87 @@ class Grammar:
         self.rules = rules
         self.rule_map = {rule.name: rule for rule in rules}
 
+        # Rule name -> rule id; rule_start[id] is the rule's root element.
+        # The nested-list productions on each rule are kept for diagnostics.
+        self.rule_ids: Dict[str, int] = {rule.name: i for i, rule in enumerate(rules)}
+        self.compiled = CompiledGrammar()
+        self.rule_start = array('h', [
+            compile_element(rule.productions, self.rule_ids, self.compiled) for rule in rules
+        ])
+
+        self._compute_first_sets()
+
+        # Rule name -> FIRST set, and for rules that are a single "or":
+        # rule name -> {token type: index of the first alternative it selects}
+        self.first: Dict[str, FrozenSet[TokenType]] = {
+            rule.name: frozenset(TokenType(c) for c in self._first_codes[i])
+            for i, rule in enumerate(rules)
+        }
+        self.predict: Dict[str, Dict[TokenType, int]] = {}
+
+        # Per element: FIRST token values, or None when the element is nullable
+        self._element_firsts: List[Optional[FrozenSet[int]]] = []
+        for index in range(len(self.compiled)):
+            first, nullable = self._element_first(index)
+            self._element_firsts.append(None if nullable else frozenset(first))
+
+        compiled = self.compiled
+        for rule_id, root in enumerate(self.rule_start):
+            # Rule production is a sequence whose only child is a choice
+            choice = compiled.arg1[root]
+            if compiled.arg2[root] != 1 or compiled.opcodes[choice] != GrammarOp.CHOICE:
+                continue
+            predict: Dict[TokenType, int] = {}
+            for position, alternative in enumerate(compiled.children(choice)):
+                for c in self._element_firsts[alternative] or ():
+                    predict.setdefault(TokenType(c), position)
+            self.predict[rules[rule_id].name] = predict
+
+    def _element_first(self, index: int) -> Tuple[Set[int], bool]:
+        """FIRST token values and nullability of one compiled element"""
+        compiled = self.compiled
+        op = compiled.opcodes[index]
+        if op == GrammarOp.TOKEN:
+            return {compiled.arg1[index]}, False
+        if op == GrammarOp.RULE:
+            rule_id = compiled.arg1[index]
+            return set(self._first_codes[rule_id]), self._nullable[rule_id]
+
+        children = compiled.children(index)
+        if op == GrammarOp.ZERO_OR_MORE or op == GrammarOp.OPTIONAL:
+            return self._element_first(children[0])[0], True
+
+        first: Set[int] = set()
+        if op == GrammarOp.CHOICE:
+            nullable = False
+            for child in children:
+                child_first, child_nullable = self._element_first(child)
+                first |= child_first
+                nullable = nullable or child_nullable
+            return first, nullable
+
+        # GrammarOp.SEQUENCE
+        for child in children:
+            child_first, child_nullable = self._element_first(child)
+            first |= child_first
+            if not child_nullable:
+                return first, False
+        return first, True
+
+    def _compute_first_sets(self) -> None:
+        """Iterate FIRST/nullable over all rules until a fixed point"""
+        self._first_codes: List[Set[int]] = [set() for _ in self.rules]
+        self._nullable: List[bool] = [False] * len(self.rules)
+        changed = True
+        while changed:
+            changed = False
+            for rule_id, root in enumerate(self.rule_start):
+                first, nullable = self._element_first(root)
+                if first - self._first_codes[rule_id] or nullable != self._nullable[rule_id]:
+                    self._first_codes[rule_id] |= first
+                    self._nullable[rule_id] = self._nullable[rule_id] or nullable
+                    changed = True
+
     def get(self, name: str) -> GrammarRule:
         if name not in self.rule_map:
             raise KeyError(f"Grammar rule '{name}' not found!")
@@ -48,6 +217,72 @@ class Grammar:
     def has(self, name: str) -> bool:
         return name in self.rule_map
 
+    def recognize(self, token_types: Sequence[TokenType], start: str = "program") -> bool:
+        """Check whether a token type sequence is derivable from a rule"""
+        compiled = self.compiled
+        opcodes, arg1, next_index = compiled.opcodes, compiled.arg1, compiled.next_index
+        rule_start = self.rule_start
+        element_firsts = self._element_firsts
+        codes = [t.value for t in token_types]
+        count = len(codes)
+        stride = count + 1
+        memo: Dict[int, int] = {}
+
+        # Opcodes bound to locals so the hot loop avoids global/attribute loads
+        SEQUENCE, CHOICE = GrammarOp.SEQUENCE.value, GrammarOp.CHOICE.value
+        ZERO_OR_MORE = GrammarOp.ZERO_OR_MORE.value
+        TOKEN, RULE = GrammarOp.TOKEN.value, GrammarOp.RULE.value
+
+        def match(index: int, pos: int) -> int:
+            """Match one compiled element from pos; return the end position or -1"""
+            op = opcodes[index]
+
+            if op == TOKEN:
+                return pos + 1 if pos < count and codes[pos] == arg1[index] else -1
+
+            if op == RULE:
+                rule_id = arg1[index]
+                key = rule_id * stride + pos
+                end = memo.get(key)
+                if end is None:
+                    end = memo[key] = match(rule_start[rule_id], pos)
+                return end
+
+            child = arg1[index]
+
+            if op == SEQUENCE:
+                while child >= 0:
+                    pos = match(child, pos)
+                    if pos < 0:
+                        return -1
+                    child = next_index[child]
+                return pos
+
+            if op == CHOICE:
+                # Skip alternatives whose FIRST set rules out the lookahead
+                lookahead = codes[pos] if pos < count else 0
+                while child >= 0:
+                    first = element_firsts[child]
+                    if first is None or lookahead in first:
+                        end = match(child, pos)
+                        if end >= 0:
+                            return end
+                    child = next_index[child]
+                return -1
+
+            if op == ZERO_OR_MORE:
+                while True:
+                    end = match(child, pos)
+                    if end < 0 or end == pos:
+                        return pos
+                    pos = end
+
+            # GrammarOp.OPTIONAL
+            end = match(child, pos)
+            return end if end >= 0 else pos
+
+        return match(rule_start[self.rule_ids[start]], 0) == count
+
     def __iter__(self):
         return iter(self.rules)
 
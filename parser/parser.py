@@ -2,32 +2,252 @@
 Main parser implementation for PowerLang using Pratt parsing
 """
 
-from typing import List, Optional, Any
-from ..lexer import Lexer, Token, TokenType
+import re
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Optional, Any, Tuple, Dict
+from ..lexer import Lexer, Token, TokenType, TokenStream
+from ..lexer.tokens import TOKEN_TYPE_BY_CODE
 from ..errors import ParseError, ErrorHandler, ErrorReporter
 from .ast import *
 from .precedence import (
-    Precedence, get_precedence, get_associativity,
-    can_be_binary_operator, can_be_unary_operator,
-    can_be_assignment_operator, compare_precedence
+    PREC_ASSIGNMENT, PRECEDENCE_BY_CODE, can_be_binary_operator, can_be_assignment_operator
 )
 
+# Token type codes compared directly against TokenStream.types in hot loops
+_EOF_CODE = TokenType.EOF.value
+_VARIABLE_CODE = TokenType.VARIABLE.value
+_RBRACE_CODE = TokenType.RBRACE.value
+_CASE_CODE = TokenType.CASE.value
+_NAMESPACE_CODE = TokenType.NAMESPACE.value
+_DEFAULT_CODE = TokenType.DEFAULT.value
+_SEMICOLON_CODE = TokenType.SEMICOLON.value
+_COMMA_CODE = TokenType.COMMA.value
+_IDENTIFIER_CODE = TokenType.IDENTIFIER.value
+_LPAREN_CODE = TokenType.LPAREN.value
+_RPAREN_CODE = TokenType.RPAREN.value
+_LBRACKET_CODE = TokenType.LBRACKET.value
+_RBRACKET_CODE = TokenType.RBRACKET.value
+_QUESTION_LBRACKET_CODE = TokenType.QUESTION_LBRACKET.value
+_AT_CODE = TokenType.AT.value
+_LBRACE_CODE = TokenType.LBRACE.value
+_NEW_CODE = TokenType.NEW.value
+_ASYNC_CODE = TokenType.ASYNC.value
+
+# Minimum precedence value of a full expression
+_ASSIGNMENT_PRECEDENCE = PREC_ASSIGNMENT
+
+# Paren, brace and bracket nesting depths share one int, one field each
+_DEPTH_BITS = 21
+_DEPTH_FIELD = (1 << _DEPTH_BITS) - 1
+_PAREN_UNIT = 1
+_BRACE_UNIT = 1 << _DEPTH_BITS
+_BRACKET_UNIT = 1 << (2 * _DEPTH_BITS)
+
+# Codes that end a brace-delimited body, and a colon-form case body
+_BLOCK_TERMINATORS = frozenset((_RBRACE_CODE, _EOF_CODE))
+_CASE_TERMINATORS = frozenset((_CASE_CODE, _DEFAULT_CODE, _RBRACE_CODE, _EOF_CODE))
+_LITERAL_CODES = frozenset(t.value for t in (
+    TokenType.INTEGER, TokenType.FLOAT, TokenType.STRING,
+    TokenType.BOOL, TokenType.NULL,
+))
+_UNARY_CODES = frozenset(t.value for t in (
+    TokenType.PLUS, TokenType.MINUS, TokenType.NOT,
+))
+
+# Codes of binary and assignment operators
+_BINARY_CODES = frozenset(t.value for t in TokenType if can_be_binary_operator(t))
+_ASSIGNMENT_CODES = frozenset(t.value for t in TokenType if can_be_assignment_operator(t))
+
+# Codes that, following a variable, make the statement an expression
+_VARIABLE_EXPRESSION_CODES = frozenset(t.value for t in (
+    TokenType.DOT, TokenType.QUESTION_DOT, TokenType.DOUBLE_COLON,
+    TokenType.LPAREN, TokenType.LBRACKET, TokenType.QUESTION_LBRACKET,
+))
+
+# Codes of tokens that can start an expression
+_EXPRESSION_START_CODES = _LITERAL_CODES | _UNARY_CODES | frozenset(t.value for t in (
+    TokenType.IDENTIFIER, TokenType.VARIABLE, TokenType.LPAREN,
+    TokenType.LBRACKET, TokenType.AT, TokenType.LBRACE,
+    TokenType.NEW, TokenType.ASYNC,
+))
+
+# Codes of tokens that start a statement; error recovery resumes at one
+_SYNC_CODES = frozenset(t.value for t in (
+    TokenType.IF, TokenType.FOR, TokenType.WHILE,
+    TokenType.DO, TokenType.FOREACH, TokenType.SWITCH,
+    TokenType.RETURN, TokenType.BREAK, TokenType.CONTINUE,
+    TokenType.TRY, TokenType.THROW, TokenType.LBRACE,
+    TokenType.FUNCTION, TokenType.CLASS, TokenType.NAMESPACE,
+))
+
+
+def _code_mask(codes: Iterable[int]) -> int:
+    """Bitmask with bit N set for every type code N; test with (mask >> code) & 1"""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+# Codes that continue an expression in the Pratt loop: binary and assignment
+# operators plus the call, index, member, postfix and ternary forms
+_INFIX_MASK = _code_mask(_BINARY_CODES | _ASSIGNMENT_CODES | frozenset(t.value for t in (
+    TokenType.LPAREN, TokenType.LBRACKET, TokenType.QUESTION_LBRACKET,
+    TokenType.DOT, TokenType.QUESTION_DOT, TokenType.DOUBLE_COLON,
+    TokenType.PLUS_PLUS, TokenType.MINUS_MINUS, TokenType.QUESTION,
+)))
+_EXPRESSION_START_MASK = _code_mask(_EXPRESSION_START_CODES)
+# Codes that can name a type in a type expression
+_TYPE_NAME_MASK = _code_mask(t.value for t in (
+    TokenType.IDENTIFIER, TokenType.INT_TYPE, TokenType.FLOAT_TYPE,
+    TokenType.STRING_TYPE, TokenType.BOOL_TYPE,
+))
+_ASSIGNMENT_MASK = _code_mask(_ASSIGNMENT_CODES)
+_BINARY_MASK = _code_mask(_BINARY_CODES)
+
+
+def _code_class(codes: Iterable[int]) -> bytes:
+    """Regex character class matching any of the given type codes"""
+    return b'[' + b''.join(re.escape(bytes((code,))) for code in sorted(codes)) + b']'
+
+
+# Scans over the one-byte-per-token type array that need no AST run inside
+# the re engine. Every stream ends with EOF, so a search always matches.
+# A statement boundary: a token following ';', a statement start, or EOF
+_SYNC_SCAN = re.compile(
+    b'(?<=' + _code_class((_SEMICOLON_CODE,)) + b')(?s:.)|' + _code_class(_SYNC_CODES | {_EOF_CODE})
+)
+# The next brace or EOF, for brace matching
+_BRACE_SCAN = re.compile(_code_class((_LBRACE_CODE, _RBRACE_CODE, _EOF_CODE)))
+
+
+def _find_sync(types: array, start: int) -> int:
+    """Index of the first statement boundary at or after start (a token
+    following ';', a statement-starting token, or EOF)"""
+    return _SYNC_SCAN.search(types, start).start()
+
+
+def _dispatch_table(handlers: Dict[int, Callable[..., Any]]) -> List[Optional[Callable[..., Any]]]:
+    """Spread a type-code -> handler mapping into a list indexed by type code"""
+    table: List[Optional[Callable[..., Any]]] = [None] * len(TOKEN_TYPE_BY_CODE)
+    for code, handler in handlers.items():
+        table[code] = handler
+    return table
+
+
+@lru_cache(maxsize=None)
+def _parse_tables(cls: type) -> Tuple[List[Optional[Callable[..., Any]]], ...]:
+    """Dispatch tables of cls's parse methods, built once per parser class.
+    Handlers are plain functions, called with the parser as first argument"""
+    # Parse methods indexed by statement-starting token type code
+    statement_parsers = _dispatch_table({
+        TokenType.IF.value: cls._parse_if_statement,
+        TokenType.FOR.value: cls._parse_for_statement,
+        TokenType.WHILE.value: cls._parse_while_statement,
+        TokenType.DO.value: cls._parse_do_while_statement,
+        TokenType.FOREACH.value: cls._parse_foreach_statement,
+        TokenType.SWITCH.value: cls._parse_switch_statement,
+        TokenType.RETURN.value: cls._parse_return_statement,
+        TokenType.BREAK.value: cls._parse_break_statement,
+        TokenType.CONTINUE.value: cls._parse_continue_statement,
+        TokenType.TRY.value: cls._parse_try_catch_statement,
+        TokenType.THROW.value: cls._parse_throw_statement,
+        TokenType.LBRACE.value: cls._parse_block,
+    })
+    
+    # Parse methods indexed by top-level declaration token type code
+    declaration_parsers = _dispatch_table({
+        TokenType.USING.value: cls._parse_using_statement,
+        TokenType.CLASS.value: cls._parse_class_declaration,
+        TokenType.FUNCTION.value: cls._parse_function_declaration,
+    })
+    
+    # Parse methods indexed by class-member-starting token type code
+    member_parsers = _dispatch_table({
+        TokenType.FUNCTION.value: cls._parse_function_declaration,
+        TokenType.VARIABLE.value: cls._parse_variable_declaration,
+    })
+    
+    # Prefix expression parse methods, each called with the consumed token
+    prefix_parsers = {
+        _IDENTIFIER_CODE: cls._parse_identifier,
+        _VARIABLE_CODE: cls._parse_variable,
+        _LPAREN_CODE: cls._parse_grouping,
+        _LBRACKET_CODE: cls._parse_type_expression_or_cast,
+        _AT_CODE: cls._parse_array_or_hash_literal,
+        _LBRACE_CODE: cls._parse_hash_literal_brace,
+        _NEW_CODE: cls._parse_new_expression,
+        _ASYNC_CODE: cls._parse_async_expression,
+    }
+    prefix_parsers.update(dict.fromkeys(_LITERAL_CODES, cls._parse_literal))
+    prefix_parsers.update(dict.fromkeys(_UNARY_CODES, cls._parse_unary_operation))
+    prefix_table = _dispatch_table(prefix_parsers)
+    
+    # Infix expression parse methods, each called with the left operand and
+    # the consumed operator token; assignment wins over binary, binary over
+    # the postfix forms, so those are layered on last
+    infix_parsers = {
+        TokenType.LPAREN.value: cls._parse_call,
+        TokenType.DOT.value: cls._parse_member_access,
+        TokenType.QUESTION_DOT.value: cls._parse_member_access,
+        TokenType.DOUBLE_COLON.value: cls._parse_static_access,
+        TokenType.LBRACKET.value: cls._parse_index_access,
+        TokenType.QUESTION_LBRACKET.value: cls._parse_index_access,
+        TokenType.PLUS_PLUS.value: cls._parse_postfix_operation,
+        TokenType.MINUS_MINUS.value: cls._parse_postfix_operation,
+        TokenType.QUESTION.value: cls._parse_ternary_expression,
+    }
+    infix_parsers.update(dict.fromkeys(_BINARY_CODES, cls._parse_binary_operation))
+    infix_parsers.update(dict.fromkeys(_ASSIGNMENT_CODES, cls._parse_assignment))
+    infix_table = _dispatch_table(infix_parsers)
+    
+    return statement_parsers, declaration_parsers, member_parsers, prefix_table, infix_table
+
+
 class Parser:
     """PowerLang parser using Pratt parsing algorithm"""
     
-    def __init__(self, lexer: Lexer, error_handler: Optional[ErrorHandler] = None):
+    def __init__(self, lexer: Lexer, error_handler: Optional[ErrorHandler] = None,
+                 lazy: bool = False) -> None:
         self.lexer = lexer
-        self.tokens = lexer.tokenize()
-        self.current = 0
-        self.error_handler = error_handler or ErrorHandler()
+        self.stream = TokenStream(lexer.tokenize_stream())
+        self.tokens: List[Token] = self.stream.tokens
+        self.token_types: array = self.stream.types
+        # The lexer always ends the stream with EOF; it doubles as the
+        # sentinel for lookahead past the end
+        self._eof: Token = self.tokens[-1]
+        self.current: int = 0
+        self.error_handler: ErrorHandler = error_handler or ErrorHandler()
         
         # Track nesting levels
-        self.brace_depth = 0
-        self.paren_depth = 0
-        self.bracket_depth = 0
+        self._depth: int = 0
         
         # Type context for [type] annotations
-        self.in_type_context = False
+        self.in_type_context: bool = False
+        
+        # Defer function bodies to LazyBlock spans instead of parsing them now
+        self.lazy: bool = lazy
+        
+        # Parse methods indexed by token type code, built once per parser class
+        (self._statement_parsers, self._declaration_parsers, self._member_parsers,
+         self._prefix_parsers, self._infix_parsers) = _parse_tables(type(self))
+    
+    @property
+    def paren_depth(self) -> int:
+        """Current '(' nesting depth"""
+        return self._depth & _DEPTH_FIELD
+    
+    @property
+    def brace_depth(self) -> int:
+        """Current '{' nesting depth"""
+        return (self._depth >> _DEPTH_BITS) & _DEPTH_FIELD
+    
+    @property
+    def bracket_depth(self) -> int:
+        """Current '[' nesting depth"""
+        return self._depth >> (2 * _DEPTH_BITS)
     
     def parse(self) -> Program:
         """Parse tokens into an AST"""
@@ -47,7 +267,7 @@ class Parser:
         except ParseError as e:
             self.error_handler.error(e)
             # Return empty program on error
-            return Program(statements=[], namespaces=[], classes=[], functions=[], line=1, column=1)
+            return Program(1, 1, [])
     
     # ============================================================================
     # Program-level parsing
@@ -56,44 +276,66 @@ class Parser:
     def _parse_program(self) -> Program:
         """Parse a complete program"""
         start_token = self._peek()
+        statements = self._parse_top_level_until(_EOF_CODE)
+        
+        return Program(
+            start_token.line if start_token else 1,
+            start_token.column if start_token else 1, statements
+        )
+    
+    def _parse_top_level_until(self, stop_code: int) -> List[Statement]:
+        """Parse top-level statements until a token with stop_code (or EOF)
+        
+        Namespace bodies are parsed by this same loop: an open namespace
+        pushes a frame on an explicit stack instead of recursing.
+        """
         statements: List[Statement] = []
-        namespaces: List[NamespaceDeclaration] = []
-        classes: List[ClassDeclaration] = []
-        functions: List[FunctionDeclaration] = []
+        append = statements.append
+        # (namespace token, name parts, body start token, enclosing statements)
+        open_namespaces: List[tuple] = []
+        types = self.token_types
+        declaration_parsers = self._declaration_parsers
+        parse_statement = self._parse_statement
         
-        while not self._is_at_end():
+        while True:
+            code = types[self.current]
+            if not open_namespaces and (code == stop_code or code == _EOF_CODE):
+                return statements
+            
             try:
-                # Skip comments
-                if self._match(TokenType.COMMENT) or self._match(TokenType.BLOCK_COMMENT_START):
-                    self._advance()
+                # Close the innermost namespace
+                if open_namespaces and code in _BLOCK_TERMINATORS:
+                    namespace_token, name_parts, body_token, enclosing = open_namespaces.pop()
+                    body = Program(body_token.line, body_token.column, statements)
+                    statements = enclosing
+                    append = statements.append
+                    self._consume(TokenType.RBRACE, "Expected '}' after namespace body")
+                    self._depth -= _BRACE_UNIT
+                    append(NamespaceDeclaration(
+                        namespace_token.line, namespace_token.column, name_parts, body
+                    ))
+                    continue
+                
+                # Open a namespace; its statements collect until the matching '}'
+                if code == _NAMESPACE_CODE:
+                    namespace_token, name_parts = self._parse_namespace_header()
+                    open_namespaces.append((namespace_token, name_parts, self._peek(), statements))
+                    statements = []
+                    append = statements.append
                     continue
                 
                 # Check for different top-level constructs
-                if self._check(TokenType.USING):
-                    statements.append(self._parse_using_statement())
-                elif self._check(TokenType.NAMESPACE):
-                    namespaces.append(self._parse_namespace_declaration())
-                elif self._check(TokenType.CLASS):
-                    classes.append(self._parse_class_declaration())
-                elif self._check(TokenType.FUNCTION):
-                    functions.append(self._parse_function_declaration())
+                handler = declaration_parsers[code]
+                if handler is not None:
+                    append(handler(self))
                 else:
-                    stmt = self._parse_statement()
+                    stmt = parse_statement()
                     if stmt:
-                        statements.append(stmt)
+                        append(stmt)
                         
             except ParseError as e:
                 self.error_handler.error(e)
                 self._synchronize()
-        
-        return Program(
-            statements=statements,
-            namespaces=namespaces,
-            classes=classes,
-            functions=functions,
-            line=(start_token.line if start_token else 1),
-            column=(start_token.column if start_token else 1)
-        )
     
     def _parse_using_statement(self) -> UsingStatement:
         """Parse a using statement"""
@@ -104,34 +346,19 @@ class Parser:
         
         self._consume(TokenType.SEMICOLON, "Expected ';' after using statement")
         
-        return UsingStatement(
-            namespace_parts=namespace_parts,
-            line=using_token.line,
-            column=using_token.column
-        )
+        return UsingStatement(using_token.line, using_token.column, namespace_parts)
     
-    def _parse_namespace_declaration(self) -> NamespaceDeclaration:
-        """Parse a namespace declaration"""
+    def _parse_namespace_header(self) -> Tuple[Token, List[Token]]:
+        """Parse 'namespace Name.Parts {' and return the keyword token and name"""
         namespace_token = self._consume(TokenType.NAMESPACE, "Expected 'namespace'")
         
         # Parse namespace name (can be dotted)
         name_parts = self._parse_identifier_path()
         
         self._consume(TokenType.LBRACE, "Expected '{' after namespace name")
-        self.brace_depth += 1
-        
-        # Parse namespace body
-        body = self._parse_program()
-        
-        self._consume(TokenType.RBRACE, "Expected '}' after namespace body")
-        self.brace_depth -= 1
+        self._depth += _BRACE_UNIT
         
-        return NamespaceDeclaration(
-            name_parts=name_parts,
-            body=body,
-            line=namespace_token.line,
-            column=namespace_token.column
-        )
+        return namespace_token, name_parts
     
     # ============================================================================
     # Statement parsing
@@ -139,67 +366,64 @@ class Parser:
     
     def _parse_statement(self) -> Optional[Statement]:
         """Parse a statement"""
-        if self._is_at_end():
+        # current never passes the EOF token, so one array read replaces
+        # the _is_at_end() call
+        types = self.token_types
+        current = self.current
+        code = types[current]
+        if code == _EOF_CODE:
             return None
         
-        # Check for statement-starting tokens
-        if self._check(TokenType.IF):
-            return self._parse_if_statement()
-        elif self._check(TokenType.FOR):
-            return self._parse_for_statement()
-        elif self._check(TokenType.WHILE):
-            return self._parse_while_statement()
-        elif self._check(TokenType.DO):
-            return self._parse_do_while_statement()
-        elif self._check(TokenType.FOREACH):
-            return self._parse_foreach_statement()
-        elif self._check(TokenType.SWITCH):
-            return self._parse_switch_statement()
-        elif self._check(TokenType.RETURN):
-            return self._parse_return_statement()
-        elif self._check(TokenType.BREAK):
-            return self._parse_break_statement()
-        elif self._check(TokenType.CONTINUE):
-            return self._parse_continue_statement()
-        elif self._check(TokenType.TRY):
-            return self._parse_try_catch_statement()
-        elif self._check(TokenType.THROW):
-            return self._parse_throw_statement()
-        elif self._check(TokenType.LBRACE):
-            return self._parse_block()
-        elif self._check(TokenType.VARIABLE):
+        if code == _VARIABLE_CODE:
             # Distinguish variable declaration (e.g. `$x;` or `$x = ...`) from
             # an expression starting with a variable (e.g. `$this.value = ...`).
-            next_token = self._peek_next()
-            if next_token and next_token.type in (
-                TokenType.DOT, TokenType.QUESTION_DOT, TokenType.DOUBLE_COLON,
-                TokenType.LPAREN, TokenType.LBRACKET
-            ):
+            # The stream always ends with EOF, so the lookahead is in range
+            if types[current + 1] in _VARIABLE_EXPRESSION_CODES:
                 return self._parse_expression_statement()
             return self._parse_variable_declaration()
-        else:
-            # Expression statement
-            return self._parse_expression_statement()
+        
+        # Check for statement-starting tokens
+        handler = self._statement_parsers[code]
+        if handler is not None:
+            return handler(self)
+        
+        # Expression statement
+        return self._parse_expression_statement()
     
     def _parse_block(self) -> Block:
         """Parse a block statement"""
         lbrace_token = self._consume(TokenType.LBRACE, "Expected '{'")
-        self.brace_depth += 1
+        self._depth += _BRACE_UNIT
         
-        statements: List[Statement] = []
-        while not self._check(TokenType.RBRACE) and not self._is_at_end():
-            stmt = self._parse_statement()
-            if stmt:
-                statements.append(stmt)
+        statements = self._parse_statements_until(_BLOCK_TERMINATORS)
         
         self._consume(TokenType.RBRACE, "Expected '}' after block")
-        self.brace_depth -= 1
+        self._depth -= _BRACE_UNIT
         
-        return Block(
-            statements=statements,
-            line=lbrace_token.line,
-            column=lbrace_token.column
-        )
+        return Block(lbrace_token.line, lbrace_token.column, statements)
+    
+    @contextmanager
+    def _parens(self, after: str, closing: str) -> Iterator[None]:
+        """Consume '(' ... ')' around the with-body, tracking paren depth"""
+        self._consume(TokenType.LPAREN, f"Expected '(' {after}")
+        self._depth += _PAREN_UNIT
+        try:
+            yield
+        finally:
+            self._depth -= _PAREN_UNIT
+        self._consume(TokenType.RPAREN, f"Expected ')' {closing}")
+    
+    def _parse_statements_until(self, terminators: FrozenSet[int]) -> List[Statement]:
+        """Parse statements until the current token type code is in terminators"""
+        statements: List[Statement] = []
+        append = statements.append
+        parse_statement = self._parse_statement
+        types = self.token_types
+        while types[self.current] not in terminators:
+            stmt = parse_statement()
+            if stmt:
+                append(stmt)
+        return statements
     
     def _parse_variable_declaration(self) -> VariableDeclaration:
         """Parse a variable declaration"""
@@ -230,15 +454,8 @@ class Parser:
         self._consume(TokenType.SEMICOLON, "Expected ';' after variable declaration")
         
         return VariableDeclaration(
-            name_token=name_token,
-            type_annotation=type_annotation,
-            initializer=initializer,
-            is_constant=is_constant,
-            is_global=is_global,
-            is_private=is_private,
-            is_readonly=is_readonly,
-            line=start_token.line,
-            column=start_token.column
+            start_token.line, start_token.column, name_token, initializer,
+            type_annotation, is_constant, is_global, is_private, is_readonly
         )
     
     def _parse_expression_statement(self) -> ExpressionStatement:
@@ -246,41 +463,30 @@ class Parser:
         expr = self._parse_expression()
         self._consume(TokenType.SEMICOLON, "Expected ';' after expression")
         
-        return ExpressionStatement(
-            expression=expr,
-            line=expr.line,
-            column=expr.column
-        )
+        return ExpressionStatement(expr.line, expr.column, expr)
     
     def _parse_if_statement(self) -> IfStatement:
         """Parse an if statement"""
         if_token = self._consume(TokenType.IF, "Expected 'if'")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after 'if'")
-        self.paren_depth += 1
-        condition = self._parse_expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after if condition")
-        self.paren_depth -= 1
+        with self._parens("after 'if'", "after if condition"):
+            condition = self._parse_expression()
         
         then_branch = self._parse_statement()
         
-        # Parse elseif branches
-        elseif_branches: List[ElseIfBranch] = []
+        # Parse elseif branches; the list is only allocated when one exists
+        elseif_branches: Optional[List[ElseIfBranch]] = None
         while self._match(TokenType.ELSEIF):
             elseif_token = self._previous()
+            if elseif_branches is None:
+                elseif_branches = []
             
-            self._consume(TokenType.LPAREN, "Expected '(' after 'elseif'")
-            self.paren_depth += 1
-            elseif_condition = self._parse_expression()
-            self._consume(TokenType.RPAREN, "Expected ')' after elseif condition")
-            self.paren_depth -= 1
+            with self._parens("after 'elseif'", "after elseif condition"):
+                elseif_condition = self._parse_expression()
             
             elseif_branch = self._parse_statement()
             elseif_branches.append(ElseIfBranch(
-                condition=elseif_condition,
-                branch=elseif_branch,
-                line=elseif_token.line,
-                column=elseif_token.column
+                elseif_condition, elseif_branch, elseif_token.line, elseif_token.column
             ))
         
         # Parse else branch
@@ -289,76 +495,53 @@ class Parser:
             else_branch = self._parse_statement()
         
         return IfStatement(
-            condition=condition,
-            then_branch=then_branch,
-            elseif_branches=elseif_branches,
-            else_branch=else_branch,
-            line=if_token.line,
-            column=if_token.column
+            if_token.line, if_token.column, condition, then_branch, elseif_branches,
+            else_branch
         )
     
     def _parse_for_statement(self) -> ForStatement:
         """Parse a for statement"""
         for_token = self._consume(TokenType.FOR, "Expected 'for'")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after 'for'")
-        self.paren_depth += 1
-        
-        # Parse initializer (optional)
-        initializer = None
-        if not self._check(TokenType.SEMICOLON):
-            if self._check(TokenType.VARIABLE):
-                initializer = self._parse_variable_declaration()
-            else:
-                initializer = self._parse_expression_statement()
-        
-        self._consume(TokenType.SEMICOLON, "Expected ';' after for initializer")
-        
-        # Parse condition (optional)
-        condition = None
-        if not self._check(TokenType.SEMICOLON):
-            condition = self._parse_expression()
-        
-        self._consume(TokenType.SEMICOLON, "Expected ';' after for condition")
-        
-        # Parse increment (optional)
-        increment = None
-        if not self._check(TokenType.RPAREN):
-            increment = self._parse_expression()
-        
-        self._consume(TokenType.RPAREN, "Expected ')' after for clauses")
-        self.paren_depth -= 1
+        with self._parens("after 'for'", "after for clauses"):
+            # Parse initializer (optional)
+            initializer = None
+            if not self._check(TokenType.SEMICOLON):
+                if self._check(TokenType.VARIABLE):
+                    initializer = self._parse_variable_declaration()
+                else:
+                    initializer = self._parse_expression_statement()
+            
+            self._consume(TokenType.SEMICOLON, "Expected ';' after for initializer")
+            
+            # Parse condition (optional)
+            condition = None
+            if not self._check(TokenType.SEMICOLON):
+                condition = self._parse_expression()
+            
+            self._consume(TokenType.SEMICOLON, "Expected ';' after for condition")
+            
+            # Parse increment (optional)
+            increment = None
+            if not self._check(TokenType.RPAREN):
+                increment = self._parse_expression()
         
         body = self._parse_statement()
         
         return ForStatement(
-            initializer=initializer,
-            condition=condition,
-            increment=increment,
-            body=body,
-            line=for_token.line,
-            column=for_token.column
+            for_token.line, for_token.column, body, initializer, condition, increment
         )
     
     def _parse_while_statement(self) -> WhileStatement:
         """Parse a while statement"""
         while_token = self._consume(TokenType.WHILE, "Expected 'while'")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after 'while'")
-        self.paren_depth += 1
-        condition = self._parse_expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after while condition")
-        self.paren_depth -= 1
+        with self._parens("after 'while'", "after while condition"):
+            condition = self._parse_expression()
         
         body = self._parse_statement()
         
-        return WhileStatement(
-            condition=condition,
-            body=body,
-            is_do_while=False,
-            line=while_token.line,
-            column=while_token.column
-        )
+        return WhileStatement(while_token.line, while_token.column, condition, body, False)
     
     def _parse_do_while_statement(self) -> DoWhileStatement:
         """Parse a do-while statement"""
@@ -368,72 +551,53 @@ class Parser:
         
         self._consume(TokenType.WHILE, "Expected 'while' after do statement")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after 'while'")
-        self.paren_depth += 1
-        condition = self._parse_expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after while condition")
-        self.paren_depth -= 1
+        with self._parens("after 'while'", "after while condition"):
+            condition = self._parse_expression()
         
         self._consume(TokenType.SEMICOLON, "Expected ';' after do-while statement")
         
-        return DoWhileStatement(
-            body=body,
-            condition=condition,
-            line=do_token.line,
-            column=do_token.column
-        )
+        return DoWhileStatement(do_token.line, do_token.column, body, condition)
     
     def _parse_foreach_statement(self) -> ForeachStatement:
         """Parse a foreach statement"""
         foreach_token = self._consume(TokenType.FOREACH, "Expected 'foreach'")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after 'foreach'")
-        self.paren_depth += 1
-        
-        # Parse variable type annotation if present
-        variable_type = None
-        if self._check(TokenType.LBRACKET):
-            variable_type = self._parse_type_annotation()
-        
-        # Parse variable name
-        variable_token = self._consume(TokenType.VARIABLE, "Expected variable name in foreach")
-        
-        self._consume(TokenType.IN, "Expected 'in' after foreach variable")
-        
-        collection = self._parse_expression()
-        
-        self._consume(TokenType.RPAREN, "Expected ')' after foreach collection")
-        self.paren_depth -= 1
+        with self._parens("after 'foreach'", "after foreach collection"):
+            # Parse variable type annotation if present
+            variable_type = None
+            if self._check(TokenType.LBRACKET):
+                variable_type = self._parse_type_annotation()
+            
+            # Parse variable name
+            variable_token = self._consume(TokenType.VARIABLE, "Expected variable name in foreach")
+            
+            self._consume(TokenType.IN, "Expected 'in' after foreach variable")
+            
+            collection = self._parse_expression()
         
         body = self._parse_statement()
         
         return ForeachStatement(
-            variable_token=variable_token,
-            variable_type=variable_type,
-            collection=collection,
-            body=body,
-            line=foreach_token.line,
-            column=foreach_token.column
+            foreach_token.line, foreach_token.column, variable_token, collection, body,
+            variable_type
         )
     
     def _parse_switch_statement(self) -> SwitchStatement:
         """Parse a switch statement"""
         switch_token = self._consume(TokenType.SWITCH, "Expected 'switch'")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after 'switch'")
-        self.paren_depth += 1
-        expression = self._parse_expression()
-        self._consume(TokenType.RPAREN, "Expected ')' after switch expression")
-        self.paren_depth -= 1
+        with self._parens("after 'switch'", "after switch expression"):
+            expression = self._parse_expression()
         
         self._consume(TokenType.LBRACE, "Expected '{' after switch expression")
-        self.brace_depth += 1
+        self._depth += _BRACE_UNIT
         
         # Parse cases
         cases: List[CaseClause] = []
         default_case = None
+        types = self.token_types
         
-        while not self._check(TokenType.RBRACE) and not self._is_at_end():
+        while types[self.current] not in _BLOCK_TERMINATORS:
             if self._match(TokenType.CASE):
                 case_token = self._previous()
                 
@@ -449,25 +613,17 @@ class Parser:
                 # colon followed by statements until the next case/default.
                 case_statements: List[Statement] = []
                 if self._match(TokenType.COLON):
-                    while (not self._check(TokenType.CASE) and 
-                           not self._check(TokenType.DEFAULT) and 
-                           not self._check(TokenType.RBRACE)):
-                        stmt = self._parse_statement()
-                        if stmt:
-                            case_statements.append(stmt)
+                    case_statements = self._parse_statements_until(_CASE_TERMINATORS)
                 elif self._match(TokenType.LBRACE):
-                    self.brace_depth += 1
-                    while not self._check(TokenType.RBRACE) and not self._is_at_end():
-                        stmt = self._parse_statement()
-                        if stmt:
-                            case_statements.append(stmt)
+                    self._depth += _BRACE_UNIT
+                    case_statements = self._parse_statements_until(_BLOCK_TERMINATORS)
                     self._consume(TokenType.RBRACE, "Expected '}' after case body")
-                    self.brace_depth -= 1
+                    self._depth -= _BRACE_UNIT
                 else:
                     self._consume(TokenType.COLON, "Expected ':' after case values")
 
-                case_body = Block(statements=case_statements, line=case_token.line, column=case_token.column)
-                cases.append(CaseClause(values=values, body=case_body, line=case_token.line, column=case_token.column))
+                case_body = Block(case_token.line, case_token.column, case_statements)
+                cases.append(CaseClause(case_token.line, case_token.column, values, case_body))
                 
             elif self._match(TokenType.DEFAULT):
                 if default_case is not None:
@@ -475,37 +631,27 @@ class Parser:
                 default_token = self._previous()
                 default_statements: List[Statement] = []
                 if self._match(TokenType.COLON):
-                    while not self._check(TokenType.RBRACE) and not self._is_at_end():
-                        stmt = self._parse_statement()
-                        if stmt:
-                            default_statements.append(stmt)
+                    default_statements = self._parse_statements_until(_BLOCK_TERMINATORS)
                 elif self._match(TokenType.LBRACE):
-                    self.brace_depth += 1
-                    while not self._check(TokenType.RBRACE) and not self._is_at_end():
-                        stmt = self._parse_statement()
-                        if stmt:
-                            default_statements.append(stmt)
+                    self._depth += _BRACE_UNIT
+                    default_statements = self._parse_statements_until(_BLOCK_TERMINATORS)
                     self._consume(TokenType.RBRACE, "Expected '}' after default body")
-                    self.brace_depth -= 1
+                    self._depth -= _BRACE_UNIT
                 else:
                     self._consume(TokenType.COLON, "Expected ':' after 'default'")
 
-                default_body = Block(statements=default_statements, line=default_token.line, column=default_token.column)
-                default_case = DefaultClause(body=default_body, line=default_token.line, column=default_token.column)
+                default_body = Block(default_token.line, default_token.column, default_statements)
+                default_case = DefaultClause(default_token.line, default_token.column, default_body)
                 
             else:
                 self._error(f"Expected 'case' or 'default', found {self._peek().lexeme}")
                 self._advance()
         
         self._consume(TokenType.RBRACE, "Expected '}' after switch statement")
-        self.brace_depth -= 1
+        self._depth -= _BRACE_UNIT
         
         return SwitchStatement(
-            expression=expression,
-            cases=cases,
-            default_case=default_case,
-            line=switch_token.line,
-            column=switch_token.column
+            switch_token.line, switch_token.column, expression, cases, default_case
         )
     
     def _parse_return_statement(self) -> ReturnStatement:
@@ -518,11 +664,7 @@ class Parser:
         
         self._consume(TokenType.SEMICOLON, "Expected ';' after return value")
         
-        return ReturnStatement(
-            value=value,
-            line=return_token.line,
-            column=return_token.column
-        )
+        return ReturnStatement(return_token.line, return_token.column, value)
     
     def _parse_break_statement(self) -> BreakStatement:
         """Parse a break statement"""
@@ -535,11 +677,7 @@ class Parser:
         
         self._consume(TokenType.SEMICOLON, "Expected ';' after break statement")
         
-        return BreakStatement(
-            label=label,
-            line=break_token.line,
-            column=break_token.column
-        )
+        return BreakStatement(break_token.line, break_token.column, label)
     
     def _parse_continue_statement(self) -> ContinueStatement:
         """Parse a continue statement"""
@@ -552,11 +690,7 @@ class Parser:
         
         self._consume(TokenType.SEMICOLON, "Expected ';' after continue statement")
         
-        return ContinueStatement(
-            label=label,
-            line=continue_token.line,
-            column=continue_token.column
-        )
+        return ContinueStatement(continue_token.line, continue_token.column, label)
     
     def _parse_try_catch_statement(self) -> TryCatchStatement:
         """Parse a try-catch-finally statement"""
@@ -564,16 +698,18 @@ class Parser:
         
         try_block = self._parse_block()
         
-        # Parse catch clauses
-        catch_clauses: List[CatchClause] = []
+        # Parse catch clauses; the list is only allocated when one exists
+        catch_clauses: Optional[List[CatchClause]] = None
         while self._match(TokenType.CATCH):
             catch_token = self._previous()
+            if catch_clauses is None:
+                catch_clauses = []
             
             exception_type = None
             exception_variable = None
             
             if self._match(TokenType.LPAREN):
-                self.paren_depth += 1
+                self._depth += _PAREN_UNIT
                 
                 if self._check(TokenType.IDENTIFIER) or self._check(TokenType.LBRACKET):
                     # Parse exception type
@@ -583,15 +719,12 @@ class Parser:
                     exception_variable = self._consume(TokenType.IDENTIFIER, "Expected exception variable name")
                 
                 self._consume(TokenType.RPAREN, "Expected ')' after catch clause")
-                self.paren_depth -= 1
+                self._depth -= _PAREN_UNIT
             
             catch_block = self._parse_block()
             catch_clauses.append(CatchClause(
-                exception_type=exception_type,
-                exception_variable=exception_variable,
-                block=catch_block,
-                line=catch_token.line,
-                column=catch_token.column
+                catch_token.line, catch_token.column, catch_block, exception_type,
+                exception_variable
             ))
         
         # Parse finally clause
@@ -603,11 +736,7 @@ class Parser:
             self._error("try statement must have at least one catch or finally clause")
         
         return TryCatchStatement(
-            try_block=try_block,
-            catch_clauses=catch_clauses,
-            finally_block=finally_block,
-            line=try_token.line,
-            column=try_token.column
+            try_token.line, try_token.column, try_block, catch_clauses, finally_block
         )
     
     def _parse_throw_statement(self) -> ThrowStatement:
@@ -618,11 +747,7 @@ class Parser:
         
         self._consume(TokenType.SEMICOLON, "Expected ';' after throw expression")
         
-        return ThrowStatement(
-            expression=expression,
-            line=throw_token.line,
-            column=throw_token.column
-        )
+        return ThrowStatement(throw_token.line, throw_token.column, expression)
     
     # ============================================================================
     # Function and class parsing
@@ -639,16 +764,11 @@ class Parser:
         
         name_token = self._consume(TokenType.IDENTIFIER, "Expected function name")
         
-        self._consume(TokenType.LPAREN, "Expected '(' after function name")
-        self.paren_depth += 1
-        
-        # Parse parameters
-        parameters: List[Parameter] = []
-        if not self._check(TokenType.RPAREN):
-            parameters = self._parse_parameter_list()
-        
-        self._consume(TokenType.RPAREN, "Expected ')' after parameter list")
-        self.paren_depth -= 1
+        with self._parens("after function name", "after parameter list"):
+            # Parse parameters
+            parameters: List[Parameter] = []
+            if not self._check(TokenType.RPAREN):
+                parameters = self._parse_parameter_list()
         
         # Parse return type if present
         return_type = None
@@ -656,18 +776,56 @@ class Parser:
             return_type = self._parse_type_annotation()
         
         # Parse function body
-        body = self._parse_block()
+        if self.lazy and self.token_types[self.current] == _LBRACE_CODE:
+            body = self._skip_function_body()
+        else:
+            body = self._parse_block()
         
         return FunctionDeclaration(
-            name_token=name_token,
-            parameters=parameters,
-            return_type=return_type,
-            body=body,
-            is_async=is_async,
-            line=start_token.line,
-            column=start_token.column
+            start_token.line, start_token.column, name_token, parameters, body,
+            return_type, is_async
         )
     
+    def _skip_function_body(self) -> LazyBlock:
+        """Skip a '{ ... }' body by brace matching and defer parsing it"""
+        lbrace_token = self._advance()
+        start, end = self._skip_balanced_braces()
+        return LazyBlock(
+            lbrace_token.line, lbrace_token.column, self._parse_span, start, end
+        )
+    
+    def _skip_balanced_braces(self) -> Tuple[int, int]:
+        """Move past the '}' matching an already consumed '{' and return the
+        token span (start, end) of the body between them"""
+        types = self.token_types
+        search = _BRACE_SCAN.search
+        start = index = self.current
+        depth = 1
+        while True:
+            index = search(types, index).start()
+            code = types[index]
+            if code == _EOF_CODE:
+                break
+            if code == _LBRACE_CODE:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    break
+            index += 1
+        self.current = index
+        self._consume(TokenType.RBRACE, "Expected '}' after block")
+        return start, index
+    
+    def _parse_span(self, start: int, end: int) -> List[Statement]:
+        """Parse the statements of a deferred body spanning tokens [start, end)"""
+        saved = self.current
+        self.current = start
+        try:
+            return self._parse_statements_until(_BLOCK_TERMINATORS)
+        finally:
+            self.current = saved
+    
     def _parse_class_declaration(self) -> ClassDeclaration:
         """Parse a class declaration"""
         start_token = self._peek()
@@ -686,48 +844,44 @@ class Parser:
             base_class = self._parse_type_expression()
         
         # Parse interfaces if present
-        interfaces: List[Expression] = []
+        interfaces: Optional[List[Expression]] = None
         if self._match(TokenType.IMPLEMENTS):
-            interfaces.append(self._parse_type_expression())
+            interfaces = [self._parse_type_expression()]
             while self._match(TokenType.COMMA):
                 interfaces.append(self._parse_type_expression())
         
         self._consume(TokenType.LBRACE, "Expected '{' after class header")
-        self.brace_depth += 1
+        self._depth += _BRACE_UNIT
         
         # Parse class members
         members: List[Statement] = []
-        while not self._check(TokenType.RBRACE) and not self._is_at_end():
-            member = self._parse_class_member()
+        append = members.append
+        parse_class_member = self._parse_class_member
+        types = self.token_types
+        while types[self.current] not in _BLOCK_TERMINATORS:
+            member = parse_class_member()
             if member:
-                members.append(member)
+                append(member)
         
         self._consume(TokenType.RBRACE, "Expected '}' after class body")
-        self.brace_depth -= 1
+        self._depth -= _BRACE_UNIT
         
         return ClassDeclaration(
-            name_token=name_token,
-            base_class=base_class,
-            interfaces=interfaces,
-            members=members,
-            is_abstract=is_abstract,
-            is_sealed=is_sealed,
-            line=start_token.line,
-            column=start_token.column
+            start_token.line, start_token.column, name_token, members, base_class,
+            interfaces, is_abstract, is_sealed
         )
     
     def _parse_class_member(self) -> Optional[Statement]:
         """Parse a class member (field, method, property, etc.)"""
         # Simplified - will be expanded in later phases
-        if self._check(TokenType.FUNCTION):
-            return self._parse_function_declaration()
-        elif self._check(TokenType.VARIABLE):
-            return self._parse_variable_declaration()
-        else:
-            # For now, skip unknown members
-            self._error(f"Unexpected token in class body: {self._peek().lexeme}")
-            self._advance()
-            return None
+        handler = None if self._is_at_end() else self._member_parsers[self.token_types[self.current]]
+        if handler is not None:
+            return handler(self)
+        
+        # For now, skip unknown members
+        self._error(f"Unexpected token in class body: {self._peek().lexeme}")
+        self._advance()
+        return None
     
     def _parse_parameter_list(self) -> List[Parameter]:
         """Parse a parameter list"""
@@ -767,12 +921,7 @@ class Parser:
             default_value = self._parse_expression()
         
         return Parameter(
-            name_token=name,
-            type_annotation=type_annotation,
-            default_value=default_value,
-            # is_ref=is_ref or is_out, # Currently not implemented
-            line=start_token.line,
-            column=start_token.column
+            start_token.line, start_token.column, name, type_annotation, default_value
         )
     
     # ============================================================================
@@ -781,169 +930,166 @@ class Parser:
     
     def _parse_expression(self) -> Expression:
         """Parse an expression using Pratt parsing"""
-        return self._parse_precedence(Precedence.ASSIGNMENT)
+        return self._parse_precedence(_ASSIGNMENT_PRECEDENCE)
     
-    def _parse_precedence(self, precedence: Precedence) -> Expression:
+    def _parse_precedence(self, precedence: int) -> Expression:
         """Parse expression with given minimum precedence"""
+        advance = self._advance
+        parse_prefix = self._parse_prefix
+        
         # Parse prefix expression
-        token = self._advance()
-        left = self._parse_prefix(token)
+        left = parse_prefix(advance())
 
         # (debug prints removed)
 
-        # Parse infix expressions while precedence allows
-        while (
-            precedence.value <= self._get_current_precedence().value and
-            not self._is_at_end() and
-            (
-                can_be_binary_operator(self._peek().type) or
-                can_be_assignment_operator(self._peek().type) or
-                self._peek().type in (
-                    TokenType.LPAREN, TokenType.LBRACKET,
-                    TokenType.DOT, TokenType.QUESTION_DOT, TokenType.DOUBLE_COLON,
-                    TokenType.PLUS_PLUS, TokenType.MINUS_MINUS, TokenType.QUESTION
-                )
-            )
-        ):
-            token = self._advance()
-            left = self._parse_infix(left, token)
-        
-        return left
+        # Parse infix expressions while precedence allows; the lookahead is
+        # tested against the packed type codes, the Token is only fetched
+        # once it is consumed.
+        # Binary operators climb through an explicit stack of
+        # (outer precedence, left operand, operator) entries rather than
+        # recursing for each right operand
+        types = self.token_types
+        tokens = self.tokens
+        pending: List[Tuple[int, Expression, Token]] = []
+        while True:
+            # Operand and infix parsers move self.current, so it is reread
+            # once per iteration and kept in a local for the rest of it
+            current = self.current
+            code = types[current]
+            if precedence <= PRECEDENCE_BY_CODE[code] and (_INFIX_MASK >> code) & 1:
+                # Infix codes never include EOF, so the operator is consumed inline
+                self.current = current + 1
+                token = tokens[current]
+                if (_BINARY_MASK >> code) & 1:
+                    pending.append((precedence, left, token))
+                    precedence = PRECEDENCE_BY_CODE[code]
+                    left = parse_prefix(advance())
+                else:
+                    left = self._parse_infix(left, token)
+            elif pending:
+                precedence, operand, token = pending.pop()
+                left = BinaryOperation(token.line, token.column, operand, token, left)
+            else:
+                return left
     
     def _parse_prefix(self, token: Token) -> Expression:
         """Parse a prefix expression"""
-        if token.type == TokenType.IDENTIFIER:
-            return self._parse_identifier(token)
-        elif token.type == TokenType.VARIABLE:
-            return Variable(name_token=token, line=token.line, column=token.column)
-        elif token.type in (TokenType.INTEGER, TokenType.FLOAT, 
-                           TokenType.STRING, TokenType.BOOL, TokenType.NULL):
-            return self._parse_literal(token)
-        elif token.type == TokenType.LPAREN:
-            return self._parse_grouping()
-        elif token.type == TokenType.LBRACKET:
-            return self._parse_type_expression_or_cast()
-        elif token.type == TokenType.AT:
-            return self._parse_array_or_hash_literal()
-        elif token.type == TokenType.LBRACE:
-            return self._parse_hash_literal_brace()
-        elif token.type in (TokenType.PLUS, TokenType.MINUS, TokenType.NOT):
-            return self._parse_unary_operation(token)
-        elif token.type == TokenType.NEW:
-            return self._parse_new_expression(token)
-        elif token.type == TokenType.ASYNC:
-            return self._parse_async_expression(token)
-        else:
-            self._error(f"Unexpected token: {token.lexeme}")
-            # Create a dummy expression to continue parsing
-            return Literal(token=token, value=None, line=token.line, column=token.column)
+        handler = self._prefix_parsers[token.type_id]
+        if handler is not None:
+            return handler(self, token)
+        self._error(f"Unexpected token: {token.lexeme}")
+        # Create a dummy expression to continue parsing
+        return Literal(token.line, token.column, token, None)
             
     def _parse_infix(self, left: Expression, token: Token) -> Expression:
         """Parse an infix expression including assignments and binary ops."""
+        handler = self._infix_parsers[token.type_id]
+        if handler is not None:
+            return handler(self, left, token)
+        self._error(f"Unexpected infix token: {token.lexeme}")
+        return left
+    
+    def _parse_assignment(self, left: Expression, token: Token) -> Expression:
+        """Parse the right-associative value of an assignment"""
+        if not isinstance(left, (Variable, MemberAccess, IndexAccess)):
+            self._error("Invalid assignment target")
+            return left
         
-        # 1. Handle Assignments (Right-Associative)
-        if can_be_assignment_operator(token.type):
-            if not isinstance(left, (Variable, MemberAccess, IndexAccess)):
+        # Values are parsed just above assignment precedence, so a chain like
+        # `$a = $b = 1` is collected here and folded right to left instead of
+        # recursing one level per operator
+        types = self.token_types
+        chain = [(left, token)]
+        while True:
+            right = self._parse_precedence(_ASSIGNMENT_PRECEDENCE + 1)
+            if not (_ASSIGNMENT_MASK >> types[self.current]) & 1:
+                break
+            token = self._advance()
+            if not isinstance(right, (Variable, MemberAccess, IndexAccess)):
                 self._error("Invalid assignment target")
-                return left
-            
-            # Use precedence value - 1 to ensure subsequent assignments are nested correctly
-            # Convert back to Precedence enum (avoid passing raw int)
-            right_prec_value = Precedence.ASSIGNMENT.value - 1
-            right_prec = Precedence(right_prec_value)
-            right = self._parse_precedence(right_prec)
-            return Assignment(
-                target=left,
-                operator=token,
-                value=right,
-                line=token.line,
-                column=token.column
-            )
+                # The rejected target still takes any infix operators after it
+                while (_INFIX_MASK >> types[self.current]) & 1:
+                    right = self._parse_infix(right, self._advance())
+                break
+            chain.append((right, token))
         
-        # 2. Handle All Other Infix Operators
-        if can_be_binary_operator(token.type):
-            return self._parse_binary_operation(left, token)
-        elif token.type == TokenType.LPAREN:
-            return self._parse_call(left)
-        elif token.type in (TokenType.DOT, TokenType.QUESTION_DOT):
-            return self._parse_member_access(left, token)
-        elif token.type == TokenType.DOUBLE_COLON:
-            return self._parse_static_access(left, token)
-        elif token.type == TokenType.LBRACKET:
-            return self._parse_index_access(left, token)
-        elif token.type in (TokenType.PLUS_PLUS, TokenType.MINUS_MINUS):
-            return self._parse_postfix_operation(left, token)
-        elif token.type == TokenType.QUESTION:
-            return self._parse_ternary_expression(left, token)
-        else:
-            self._error(f"Unexpected infix token: {token.lexeme}")
-            return left
+        for target, token in reversed(chain):
+            right = Assignment(token.line, token.column, target, token, right)
+        return right
 
     def _parse_identifier(self, token: Token) -> Expression:
         """Parse an identifier expression"""
         # Check if it's actually a type in type context
         if self.in_type_context and token.type == TokenType.IDENTIFIER:
             # Might be a user-defined type
-            return TypeExpression(type_token=token, is_nullable=False, is_array=False, array_rank=1, line=token.line, column=token.column)
+            return TypeExpression(token.line, token.column, token, False, False, 1)
         
         # Regular identifier
-        return Variable(token, token.line, token.column)
+        return Variable(token.line, token.column, token)
     
     # def _parse_variable_expression(self, token: Token) -> Expression: # Not used
         """Parse a variable expression starting with $"""
         # The $ was already consumed, need the identifier
         if self._check(TokenType.IDENTIFIER):
             name_token = self._consume(TokenType.IDENTIFIER, "Expected variable name after '$'")
-            return Variable(name_token=name_token, line=token.line, column=token.column)
+            return Variable(token.line, token.column, name_token)
         elif self._check(TokenType.LBRACE):
             # ${expression} interpolation
             self._advance()  # Skip {
-            self.brace_depth += 1
+            self._depth += _BRACE_UNIT
             expr = self._parse_expression()
             self._consume(TokenType.RBRACE, "Expected '}' after interpolated expression")
-            self.brace_depth -= 1
+            self._depth -= _BRACE_UNIT
             return expr
         else:
             self._error("Expected variable name or '{' after '$'")
-            return Variable(name_token=token, line=token.line, column=token.column)
+            return Variable(token.line, token.column, token)
+    
+    def _parse_variable(self, token: Token) -> Variable:
+        """Parse a variable reference"""
+        return Variable(token.line, token.column, token)
     
     def _parse_literal(self, token: Token) -> Literal:
         """Parse a literal expression"""
-        return Literal(token=token, value=token.literal, line=token.line, column=token.column)
+        return Literal(token.line, token.column, token, token.literal)
     
-    def _parse_grouping(self) -> Expression:
+    def _parse_grouping(self, lparen_token: Token) -> Expression:
         """Parse a parenthesized expression"""
-        self.paren_depth += 1
+        self._depth += _PAREN_UNIT
         expr = self._parse_expression()
         self._consume(TokenType.RPAREN, "Expected ')' after expression")
-        self.paren_depth -= 1
+        self._depth -= _PAREN_UNIT
         return expr
     
-    def _parse_type_expression_or_cast(self) -> Expression:
+    def _parse_type_expression_or_cast(self, lbracket_token: Token) -> Expression:
         """Parse a type expression or cast expression"""
-        # Enter type context
-        was_in_type_context = self.in_type_context
-        self.in_type_context = True
-        self.bracket_depth += 1
-        
-        # Parse type expression
-        type_expr = self._parse_type_expression()
-        
-        self._consume(TokenType.RBRACKET, "Expected ']' after type expression")
-        self.bracket_depth -= 1
-        self.in_type_context = was_in_type_context
+        types = self.token_types
+        current = self.current
+        if (_TYPE_NAME_MASK >> types[current]) & 1 and types[current + 1] == _RBRACKET_CODE:
+            # Plain `[name]`: no nullable or array suffix to parse
+            type_token = self.tokens[current]
+            type_expr = TypeExpression(
+                type_token.line, type_token.column, type_token, False, False, 1
+            )
+            self.current = current + 2
+        else:
+            # Enter type context
+            was_in_type_context = self.in_type_context
+            self.in_type_context = True
+            self._depth += _BRACKET_UNIT
+            
+            # Parse type expression
+            type_expr = self._parse_type_expression()
+            
+            self._consume(TokenType.RBRACKET, "Expected ']' after type expression")
+            self._depth -= _BRACKET_UNIT
+            self.in_type_context = was_in_type_context
         
         # Check if this is a cast or just a type expression
-        if self._check_next_is_expression():
+        if (_EXPRESSION_START_MASK >> types[self.current]) & 1:
             # It's a cast: [type] expression
             expr = self._parse_expression()
-            return CastExpression(
-                type_expression=type_expr,
-                expression=expr,
-                is_safe_cast=False,
-                line=type_expr.line,
-                column=type_expr.column
-            )
+            return CastExpression(type_expr.line, type_expr.column, expr, type_expr, False)
         else:
             # Just a type expression
             return type_expr
@@ -953,144 +1099,144 @@ class Parser:
         start_token = self._peek()
         
         # Parse type name
-        if not self._check(
-            TokenType.IDENTIFIER,
-            TokenType.INT_TYPE,
-            TokenType.FLOAT_TYPE,
-            TokenType.STRING_TYPE,
-            TokenType.BOOL_TYPE
-        ):
+        if not (_TYPE_NAME_MASK >> self.token_types[self.current]) & 1:
             self._error("Expected type name in type expression")
         
         # Consume the type token
         type_token = self._advance()
         
-        # Check for nullable ?
-        is_nullable = self._match(TokenType.QUESTION)
-        
-        # Check for array brackets
-        is_array = False
+        types = self.token_types
+        current = self.current
         array_rank = 0
+        
+        # Check for nullable ?; `int?[]` lexes its '?[' as one token, which
+        # also opens the first array bracket
+        if types[current] == _QUESTION_LBRACKET_CODE:
+            is_nullable = True
+            self.current = current + 1
+            self._depth += _BRACKET_UNIT
+            self._consume(TokenType.RBRACKET, "Expected ']' after array bracket")
+            self._depth -= _BRACKET_UNIT
+            array_rank = 1
+        else:
+            is_nullable = self._match(TokenType.QUESTION)
+        
+        # Check for array brackets; well-formed '[]' pairs are stepped over
+        # on the type codes, a '[' without its ']' takes the reporting path
+        current = self.current
+        while types[current] == _LBRACKET_CODE and types[current + 1] == _RBRACKET_CODE:
+            current += 2
+            array_rank += 1
+        self.current = current
         while self._match(TokenType.LBRACKET):
-            self.bracket_depth += 1
+            self._depth += _BRACKET_UNIT
             self._consume(TokenType.RBRACKET, "Expected ']' after array bracket")
-            self.bracket_depth -= 1
-            is_array = True
+            self._depth -= _BRACKET_UNIT
             array_rank += 1
         
+        is_array = array_rank > 0
         if array_rank == 0:
             array_rank = 1
         
         return TypeExpression(
-            type_token=type_token,
-            is_nullable=is_nullable,
-            is_array=is_array,
-            array_rank=array_rank,
-            line=start_token.line,
-            column=start_token.column
+            start_token.line, start_token.column, type_token, is_nullable, is_array,
+            array_rank
         )
     
     def _parse_type_annotation(self) -> TypeAnnotation:
         """Parse a type annotation"""
         start_token = self._peek()
         self._consume(TokenType.LBRACKET, "Expected '[' for type annotation")
-        self.bracket_depth += 1
+        self._depth += _BRACKET_UNIT
         
         type_expr = self._parse_type_expression()
         
         self._consume(TokenType.RBRACKET, "Expected ']' after type expression")
-        self.bracket_depth -= 1
+        self._depth -= _BRACKET_UNIT
         
-        return TypeAnnotation(
-            type_expression=type_expr,
-            line=start_token.line,
-            column=start_token.column
-        )
+        return TypeAnnotation(start_token.line, start_token.column, type_expr)
     
-    def _parse_array_or_hash_literal(self) -> Expression:
+    def _parse_array_or_hash_literal(self, at_token: Token) -> Expression:
         """Parse an array or hash literal starting with @"""
-        at_token = self._previous()
         
         if self._match(TokenType.LPAREN):
             # Array literal: @(...)
-            self.paren_depth += 1
-            elements: List[Expression] = []
-            
-            if not self._check(TokenType.RPAREN):
-                elements = self._parse_expression_list()
-            
-            self._consume(TokenType.RPAREN, "Expected ')' after array literal")
-            self.paren_depth -= 1
-            
-            return ArrayLiteral(
-                elements=elements,
-                line=at_token.line,
-                column=at_token.column
-            )
+            elements = self._parse_parenthesized_list("Expected ')' after array literal")
+            return ArrayLiteral(at_token.line, at_token.column, elements)
         elif self._match(TokenType.LBRACE):
             # Hash literal: @{...}
-            self.brace_depth += 1
+            self._depth += _BRACE_UNIT
             pairs: List[HashPair] = []
             
             if not self._check(TokenType.RBRACE):
                 pairs = self._parse_hash_pair_list()
             
             self._consume(TokenType.RBRACE, "Expected '}' after hash literal")
-            self.brace_depth -= 1
+            self._depth -= _BRACE_UNIT
             
-            return HashLiteral(
-                pairs=pairs,
-                line=at_token.line,
-                column=at_token.column
-            )
+            return HashLiteral(at_token.line, at_token.column, pairs)
         else:
             self._error("Expected '(' or '{' after '@'")
             # Return empty array literal as fallback
-            return ArrayLiteral([], at_token.line, at_token.column)
+            return ArrayLiteral(at_token.line, at_token.column, [])
     
-    def _parse_hash_literal_brace(self) -> Expression:
+    def _parse_hash_literal_brace(self, lbrace_token: Token) -> Expression:
         """Parse a hash literal starting with { (without @)"""
-        lbrace_token = self._previous()
-        self.brace_depth += 1
+        self._depth += _BRACE_UNIT
         
         pairs: List[HashPair] = []
         if not self._check(TokenType.RBRACE):
             pairs = self._parse_hash_pair_list()
         
         self._consume(TokenType.RBRACE, "Expected '}' after hash literal")
-        self.brace_depth -= 1
+        self._depth -= _BRACE_UNIT
         
-        return HashLiteral(
-            pairs=pairs,
-            line=lbrace_token.line,
-            column=lbrace_token.column
-        )
+        return HashLiteral(lbrace_token.line, lbrace_token.column, pairs)
     
     def _parse_expression_list(self) -> List[Expression]:
         """Parse a list of expressions separated by commas"""
         expressions: List[Expression] = []
+        append = expressions.append
+        parse = self._parse_precedence
+        types = self.token_types
         
         while True:
-            expressions.append(self._parse_expression())
+            append(parse(_ASSIGNMENT_PRECEDENCE))
             
-            if not self._match(TokenType.COMMA):
+            if types[self.current] != _COMMA_CODE:
                 break
+            self.current += 1
         
         return expressions
     
+    def _parse_parenthesized_list(self, message: str) -> List[Expression]:
+        """Parse a possibly empty expression list after a consumed '(' and
+        the closing ')'"""
+        self._depth += _PAREN_UNIT
+        expressions: List[Expression] = []
+        if self.token_types[self.current] != _RPAREN_CODE:
+            expressions = self._parse_expression_list()
+        self._consume(TokenType.RPAREN, message)
+        self._depth -= _PAREN_UNIT
+        return expressions
+    
     def _parse_hash_pair_list(self) -> List[HashPair]:
         """Parse a list of hash pairs"""
         pairs: List[HashPair] = []
+        append = pairs.append
+        parse = self._parse_precedence
+        types = self.token_types
         
         while True:
-            key = self._parse_expression()
+            key = parse(_ASSIGNMENT_PRECEDENCE)
             self._consume(TokenType.EQUAL, "Expected '=' after hash key")
-            value = self._parse_expression()
+            value = parse(_ASSIGNMENT_PRECEDENCE)
             
-            pairs.append(HashPair(key, value, key.line, key.column))
+            append(HashPair(key, value, key.line, key.column))
             
-            if not self._match(TokenType.COMMA):
+            if types[self.current] != _COMMA_CODE:
                 break
+            self.current += 1
         
         return pairs
     
@@ -1098,44 +1244,20 @@ class Parser:
         """Parse a unary operation"""
         operand = self._parse_expression()
         
-        return UnaryOperation(
-            operator=operator,
-            operand=operand,
-            is_postfix=False,
-            line=operator.line,
-            column=operator.column
-        )
+        return UnaryOperation(operator.line, operator.column, operator, operand, False)
     
     def _parse_postfix_operation(self, left: Expression, operator: Token) -> UnaryOperation:
         """Parse a postfix operation (++ or --)"""
-        return UnaryOperation(
-            operator=operator,
-            operand=left,
-            is_postfix=True,
-            line=operator.line,
-            column=operator.column
-        )
+        return UnaryOperation(operator.line, operator.column, operator, left, True)
     
     def _parse_new_expression(self, new_token: Token) -> NewExpression:
         """Parse a new expression"""
         type_expr = self._parse_type_expression()
         
         self._consume(TokenType.LPAREN, "Expected '(' after type in new expression")
-        self.paren_depth += 1
+        arguments = self._parse_parenthesized_list("Expected ')' after new expression arguments")
         
-        arguments: List[Expression] = []
-        if not self._check(TokenType.RPAREN):
-            arguments = self._parse_expression_list()
-        
-        self._consume(TokenType.RPAREN, "Expected ')' after new expression arguments")
-        self.paren_depth -= 1
-        
-        return NewExpression(
-            type_expression=type_expr,
-            arguments=arguments,
-            line=new_token.line,
-            column=new_token.column
-        )
+        return NewExpression(new_token.line, new_token.column, type_expr, arguments)
     
     def _parse_async_expression(self, async_token: Token) -> Expression:
         """Parse an async expression"""
@@ -1144,14 +1266,14 @@ class Parser:
         if self._check(TokenType.LPAREN):
             # Async lambda
             self._advance()  # Skip (
-            self.paren_depth += 1
+            self._depth += _PAREN_UNIT
             
             parameters: List[Parameter] = []
             if not self._check(TokenType.RPAREN):
                 parameters = self._parse_parameter_list()
             
             self._consume(TokenType.RPAREN, "Expected ')' after async lambda parameters")
-            self.paren_depth -= 1
+            self._depth -= _PAREN_UNIT
             
             self._consume(TokenType.ARROW, "Expected '=>' after async lambda parameters")
             
@@ -1162,51 +1284,24 @@ class Parser:
                 body = self._parse_expression()
             
             return LambdaExpression(
-                parameters=parameters,
-                body=body,
-                is_async=True,
-                line=async_token.line,
-                column=async_token.column
+                async_token.line, async_token.column, body, parameters, True
             )
         else:
             self._error("Expected '(' after 'async'")
             # Return dummy expression
-            return Literal(async_token, None, async_token.line, async_token.column)
+            return Literal(async_token.line, async_token.column, async_token, None)
     
     def _parse_binary_operation(self, left: Expression, operator: Token) -> BinaryOperation:
         """Parse a binary operation"""
-        # Get precedence of current operator
-        current_precedence = get_precedence(operator.type)
-        
-        # Parse right operand with appropriate precedence
-        right = self._parse_precedence(current_precedence)
-        
-        return BinaryOperation(
-            left=left,
-            operator=operator,
-            right=right,
-            line=operator.line,
-            column=operator.column
-        )
+        # Parse right operand with the operator's own precedence
+        right = self._parse_precedence(PRECEDENCE_BY_CODE[operator.type_id])
+        
+        return BinaryOperation(operator.line, operator.column, left, operator, right)
     
-    def _parse_call(self, callee: Expression) -> CallExpression:
+    def _parse_call(self, callee: Expression, lparen_token: Token) -> CallExpression:
         """Parse a function call"""
-        lparen_token = self._previous()
-        self.paren_depth += 1
-        
-        arguments: List[Expression] = []
-        if not self._check(TokenType.RPAREN):
-            arguments = self._parse_expression_list()
-        
-        self._consume(TokenType.RPAREN, "Expected ')' after arguments")
-        self.paren_depth -= 1
-        
-        return CallExpression(
-            callee=callee,
-            arguments=arguments,
-            line=lparen_token.line,
-            column=lparen_token.column
-        )
+        arguments = self._parse_parenthesized_list("Expected ')' after arguments")
+        return CallExpression(lparen_token.line, lparen_token.column, callee, arguments)
     
     def _parse_member_access(self, obj: Expression, dot_token: Token) -> MemberAccess:
         """Parse a member access (object.member)"""
@@ -1215,11 +1310,7 @@ class Parser:
         member_token = self._consume(TokenType.IDENTIFIER, "Expected member name after '.'")
         
         return MemberAccess(
-            object=obj,
-            member_token=member_token,
-            is_null_conditional=is_null_conditional,
-            line=dot_token.line,
-            column=dot_token.column
+            dot_token.line, dot_token.column, obj, member_token, is_null_conditional
         )
     
     def _parse_static_access(self, obj: Expression, double_colon_token: Token) -> MemberAccess:
@@ -1227,30 +1318,20 @@ class Parser:
         member_token = self._consume(TokenType.IDENTIFIER, "Expected member name after '::'")
         
         return MemberAccess(
-            object=obj,
-            member_token=member_token,
-            is_null_conditional=False,
-            line=double_colon_token.line,
-            column=double_colon_token.column
+            double_colon_token.line, double_colon_token.column, obj, member_token, False
         )
     
     def _parse_index_access(self, obj: Expression, lbracket_token: Token) -> IndexAccess:
-        """Parse an index access (array[index])"""
-        is_null_conditional = False
-        if lbracket_token.lexeme == '?[':
-            is_null_conditional = True
+        """Parse an index access (array[index] or array?[index])"""
+        is_null_conditional = (lbracket_token.type == TokenType.QUESTION_LBRACKET)
         
-        self.bracket_depth += 1
+        self._depth += _BRACKET_UNIT
         index = self._parse_expression()
         self._consume(TokenType.RBRACKET, "Expected ']' after index")
-        self.bracket_depth -= 1
+        self._depth -= _BRACKET_UNIT
         
         return IndexAccess(
-            object=obj,
-            index=index,
-            is_null_conditional=is_null_conditional,
-            line=lbracket_token.line,
-            column=lbracket_token.column
+            lbracket_token.line, lbracket_token.column, obj, index, is_null_conditional
         )
     
     def _parse_ternary_expression(self, condition: Expression, question_token: Token) -> TernaryExpression:
@@ -1260,11 +1341,7 @@ class Parser:
         else_expr = self._parse_expression()
         
         return TernaryExpression(
-            condition=condition,
-            then_expr=then_expr,
-            else_expr=else_expr,
-            line=question_token.line,
-            column=question_token.column
+            question_token.line, question_token.column, condition, then_expr, else_expr
         )
     
     # ============================================================================
@@ -1287,96 +1364,68 @@ class Parser:
         if self._is_at_end():
             return False
         
-        token_type = self._peek().type
-        return (token_type in (TokenType.IDENTIFIER, TokenType.VARIABLE,
-                               TokenType.INTEGER, TokenType.FLOAT,
-                               TokenType.STRING, TokenType.BOOL, TokenType.NULL,
-                               TokenType.LPAREN, TokenType.LBRACKET,
-                               TokenType.AT, TokenType.LBRACE,
-                               TokenType.PLUS, TokenType.MINUS, TokenType.NOT,
-                               TokenType.NEW, TokenType.ASYNC))
-    
-    def _get_current_precedence(self) -> Precedence:
-        """Get precedence of current token if it's a binary operator"""
-        if self._is_at_end():
-            return Precedence.NONE
-        
-        token_type = self._peek().type
-        # Use the precedence table for any token that has a defined precedence
-        prec = get_precedence(token_type)
-        if prec != Precedence.NONE:
-            return prec
-
-        # Fallback: if it's a known binary operator, return its precedence
-        if can_be_binary_operator(token_type):
-            return get_precedence(token_type)
-
-        return Precedence.NONE
+        return (_EXPRESSION_START_MASK >> self.token_types[self.current]) & 1 == 1
+    
+    def _get_current_precedence(self) -> int:
+        """Get the precedence value of the current token (0 if it has none)"""
+        return PRECEDENCE_BY_CODE[self.token_types[self.current]]
 
     def _peek_next(self) -> Optional[Token]:
         """Get the next token (lookahead) without consuming it"""
         idx = self.current + 1
         if idx >= len(self.tokens):
-            last_token = self.tokens[-1] if self.tokens else None
-            return Token(
-                TokenType.EOF, "", None,
-                last_token.line if last_token else 1,
-                last_token.column if last_token else 1,
-                last_token.position if last_token else 0
-            )
+            return self._eof
         return self.tokens[idx]
     
+    # The token helpers below rely on the stream ending with an EOF token that
+    # is never consumed, so self.current always indexes a valid token.
+    
     def _match(self, *token_types: TokenType) -> bool:
         """Check if current token matches any given type, consume if true"""
-        if self._check(*token_types):
-            self._advance()
+        current = self.current
+        code = self.token_types[current]
+        if code != _EOF_CODE and TOKEN_TYPE_BY_CODE[code] in token_types:
+            self.current = current + 1
             return True
         return False
 
     
     def _check(self, *token_types: TokenType) -> bool:
         """Check if current token matches any of the given types"""
-        if self._is_at_end():
-            return False
-        return self._peek().type in token_types
+        code = self.token_types[self.current]
+        return code != _EOF_CODE and TOKEN_TYPE_BY_CODE[code] in token_types
 
     
     def _advance(self) -> Token:
         """Advance to next token and return the previous one"""
-        if not self._is_at_end():
-            self.current += 1
+        current = self.current
+        if self.token_types[current] != _EOF_CODE:
+            self.current = current + 1
+            return self.tokens[current]
         return self._previous()
     
     def _is_at_end(self) -> bool:
         """Check if at end of tokens"""
-        return self.current >= len(self.tokens) or self._peek().type == TokenType.EOF
+        return self.token_types[self.current] == _EOF_CODE
     
     def _peek(self) -> Token:
         """Get current token without consuming it"""
-        if self.current >= len(self.tokens):
-            # Return EOF token if out of bounds
-            last_token = self.tokens[-1] if self.tokens else None
-            return Token(
-                TokenType.EOF, "", None,
-                last_token.line if last_token else 1,
-                last_token.column if last_token else 1,
-                last_token.position if last_token else 0
-            )
         return self.tokens[self.current]
     
     def _previous(self) -> Token:
         """Get previous token"""
-        if self.current == 0:
-            # Return first token if at beginning
-            return self.tokens[0] if self.tokens else Token(
-                TokenType.EOF, "", None, 1, 1, 0
-            )
-        return self.tokens[self.current - 1]
+        current = self.current
+        # Return first token if at beginning
+        return self.tokens[current - 1 if current else 0]
     
     def _consume(self, token_type: TokenType, message: str) -> Token:
         """Consume token of expected type, or raise error"""
-        if self._check(token_type):
-            return self._advance()
+        # Fast path: compare the expected type's code with the current one
+        current = self.current
+        code = self.token_types[current]
+        if code == token_type._value_ and code != _EOF_CODE:
+            self.current = current + 1
+            return self.tokens[current]
         
         token = self._peek()
         self._error(f"{message}, found '{token.lexeme}'")
@@ -1398,19 +1447,9 @@ class Parser:
     
     def _synchronize(self) -> None:
         """Synchronize parser after error by skipping to next statement"""
-        self._advance()
-        
-        while not self._is_at_end():
-            if self._previous().type == TokenType.SEMICOLON:
-                return
-            
-            # Check for statement-starting tokens
-            token_type = self._peek().type
-            if token_type in (TokenType.IF, TokenType.FOR, TokenType.WHILE,
-                             TokenType.DO, TokenType.FOREACH, TokenType.SWITCH,
-                             TokenType.RETURN, TokenType.BREAK, TokenType.CONTINUE,
-                             TokenType.TRY, TokenType.THROW, TokenType.LBRACE,
-                             TokenType.FUNCTION, TokenType.CLASS, TokenType.NAMESPACE):
-                return
-            
-            self._advance()
+        types = self.token_types
+        current = self.current
+        # Always step past the offending token, unless it is EOF
+        if types[current] != _EOF_CODE:
+            current += 1
+        self.current = _find_sync(types, current)
@@ -2,31 +2,53 @@
 Operator precedence and associativity handling for PowerLang parser
 """
 
-from enum import Enum, auto
-from typing import Dict, Optional, List
-from ..lexer.tokens import TokenType
+from array import array
+from enum import Enum, IntEnum, auto
+from typing import Dict, Optional
+from ..lexer.tokens import TokenType, TOKEN_TYPE_BY_CODE
 
-class Precedence(Enum):
+# Precedence levels as plain ints, for hot paths that only compare levels
+PREC_NONE = 0
+PREC_ASSIGNMENT = 1         # = += -= etc.
+PREC_TERNARY = 2            # ? :
+PREC_NULL_COALESCE = 3      # ??
+PREC_LOGICAL_OR = 4         # -or
+PREC_LOGICAL_AND = 5        # -and
+PREC_BITWISE_OR = 6         # |
+PREC_BITWISE_XOR = 7        # ^
+PREC_BITWISE_AND = 8        # &
+PREC_EQUALITY = 9           # -eq -ne -like -match etc.
+PREC_RELATIONAL = 10        # -gt -lt -ge -le
+PREC_SHIFT = 11             # << >>
+PREC_ADDITIVE = 12          # + -
+PREC_MULTIPLICATIVE = 13    # * / %
+PREC_POWER = 14             # **
+PREC_UNARY = 15             # - + -not !
+PREC_POSTFIX = 16           # ++ -- after operand
+PREC_CALL = 17              # () [] . :: ?.
+PREC_PRIMARY = 18           # literals, variables, groups
+
+class Precedence(IntEnum):
     """Precedence levels for operators"""
-    NONE = 0
-    ASSIGNMENT = 1          # = += -= etc.
-    TERNARY = 2             # ? :
-    NULL_COALESCE = 3       # ??
-    LOGICAL_OR = 4          # -or
-    LOGICAL_AND = 5         # -and
-    BITWISE_OR = 6          # |
-    BITWISE_XOR = 7         # ^
-    BITWISE_AND = 8         # &
-    EQUALITY = 9            # -eq -ne -like -match etc.
-    RELATIONAL = 10         # -gt -lt -ge -le
-    SHIFT = 11              # << >>
-    ADDITIVE = 12           # + -
-    MULTIPLICATIVE = 13     # * / %
-    POWER = 14              # **
-    UNARY = 15              # - + -not !
-    POSTFIX = 16            # ++ -- after operand
-    CALL = 17               # () [] . :: ?.
-    PRIMARY = 18            # literals, variables, groups
+    NONE = PREC_NONE
+    ASSIGNMENT = PREC_ASSIGNMENT
+    TERNARY = PREC_TERNARY
+    NULL_COALESCE = PREC_NULL_COALESCE
+    LOGICAL_OR = PREC_LOGICAL_OR
+    LOGICAL_AND = PREC_LOGICAL_AND
+    BITWISE_OR = PREC_BITWISE_OR
+    BITWISE_XOR = PREC_BITWISE_XOR
+    BITWISE_AND = PREC_BITWISE_AND
+    EQUALITY = PREC_EQUALITY
+    RELATIONAL = PREC_RELATIONAL
+    SHIFT = PREC_SHIFT
+    ADDITIVE = PREC_ADDITIVE
+    MULTIPLICATIVE = PREC_MULTIPLICATIVE
+    POWER = PREC_POWER
+    UNARY = PREC_UNARY
+    POSTFIX = PREC_POSTFIX
+    CALL = PREC_CALL
+    PRIMARY = PREC_PRIMARY
 
 class Associativity(Enum):
     """Associativity of operators"""
@@ -112,10 +134,17 @@ OPERATOR_PRECEDENCE: Dict[TokenType, Precedence] = {
     TokenType.LBRACKET: Precedence.CALL,
     TokenType.DOT: Precedence.CALL,
     TokenType.QUESTION_DOT: Precedence.CALL,
+    TokenType.QUESTION_LBRACKET: Precedence.CALL,
     TokenType.DOUBLE_COLON: Precedence.CALL,
 }
 
-# Operator associativity mapping
+# Precedence values indexed by token type code (0, i.e. NONE, for non-operators)
+PRECEDENCE_BY_CODE = bytes(
+    OPERATOR_PRECEDENCE[token_type].value if token_type in OPERATOR_PRECEDENCE else 0
+    for token_type in TOKEN_TYPE_BY_CODE
+)
+
+# Binary and postfix operator associativity mapping
 OPERATOR_ASSOCIATIVITY: Dict[TokenType, Associativity] = {
     # Right-associative
     TokenType.EQUAL: Associativity.RIGHT,
@@ -158,12 +187,6 @@ OPERATOR_ASSOCIATIVITY: Dict[TokenType, Associativity] = {
     TokenType.STAR: Associativity.LEFT,
     TokenType.SLASH: Associativity.LEFT,
     TokenType.PERCENT: Associativity.LEFT,
-    TokenType.CARET: Associativity.LEFT,  # Power is left-associative in PowerLang
-    
-    # Non-associative (unary operators)
-    TokenType.PLUS: Associativity.NONE,
-    TokenType.MINUS: Associativity.NONE,
-    TokenType.NOT: Associativity.NONE,
     
     # Postfix operators are non-associative
     TokenType.PLUS_PLUS: Associativity.NONE,
@@ -174,146 +197,236 @@ OPERATOR_ASSOCIATIVITY: Dict[TokenType, Associativity] = {
     TokenType.LBRACKET: Associativity.LEFT,
     TokenType.DOT: Associativity.LEFT,
     TokenType.QUESTION_DOT: Associativity.LEFT,
+    TokenType.QUESTION_LBRACKET: Associativity.LEFT,
     TokenType.DOUBLE_COLON: Associativity.LEFT,
 }
 
+# Unary operators are non-associative; kept apart so that binary + and -
+# keep their left associativity
+UNARY_OPERATOR_ASSOCIATIVITY: Dict[TokenType, Associativity] = {
+    TokenType.PLUS: Associativity.NONE,
+    TokenType.MINUS: Associativity.NONE,
+    TokenType.NOT: Associativity.NONE,
+}
+
+# Enum members indexed by token type code, so lookups are a plain tuple index
+_PRECEDENCE_MEMBERS = tuple(Precedence(value) for value in PRECEDENCE_BY_CODE)
+# Precedence members indexed by level, for decoding raw ints
+_PRECEDENCE_LEVELS = tuple(Precedence(level) for level in range(PREC_PRIMARY + 1))
+_ASSOCIATIVITY_BY_CODE = tuple(
+    OPERATOR_ASSOCIATIVITY.get(token_type, Associativity.LEFT)
+    for token_type in TOKEN_TYPE_BY_CODE
+)
+_UNARY_ASSOCIATIVITY_BY_CODE = tuple(
+    UNARY_OPERATOR_ASSOCIATIVITY.get(token_type, Associativity.LEFT)
+    for token_type in TOKEN_TYPE_BY_CODE
+)
+
+# Associativity as small ints indexed by token type code
+_ASSOC_NONE, _ASSOC_LEFT, _ASSOC_RIGHT = 0, 1, 2
+_ASSOC_CODES = {
+    Associativity.NONE: _ASSOC_NONE,
+    Associativity.LEFT: _ASSOC_LEFT,
+    Associativity.RIGHT: _ASSOC_RIGHT,
+}
+_ASSOCIATIVITY_CODE_BY_CODE = bytes(
+    _ASSOC_CODES[associativity] for associativity in _ASSOCIATIVITY_BY_CODE
+)
+
+# Outcome of should_apply_operator for every (current, next) code pair,
+# stored row-major with _CODE_COUNT entries per row
+_APPLY_NO, _APPLY_YES, _APPLY_CHAIN_ERROR = 0, 1, 2
+_CODE_COUNT = len(TOKEN_TYPE_BY_CODE)
+
+def _apply_decision(current_code: int, next_code: int) -> int:
+    """Decide whether the current operator binds before the next one"""
+    current_prec = PRECEDENCE_BY_CODE[current_code]
+    next_prec = PRECEDENCE_BY_CODE[next_code]
+    if current_prec != next_prec:
+        return _APPLY_YES if current_prec > next_prec else _APPLY_NO
+    associativity = _ASSOCIATIVITY_CODE_BY_CODE[current_code]
+    if associativity == _ASSOC_LEFT:
+        return _APPLY_YES
+    if associativity == _ASSOC_RIGHT:
+        return _APPLY_NO
+    return _APPLY_CHAIN_ERROR
+
+_APPLY_DECISION = bytes(
+    _apply_decision(current_code, next_code)
+    for current_code in range(_CODE_COUNT)
+    for next_code in range(_CODE_COUNT)
+)
+
+def _role_mask(*token_types: TokenType) -> int:
+    """Build a bitmask with one bit set per token type code"""
+    mask = 0
+    for token_type in token_types:
+        mask |= 1 << token_type.value
+    return mask
+
+# Operator roles as bitmasks over token type codes
+_BINARY_MASK = _role_mask(
+    TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH,
+    TokenType.PERCENT, TokenType.CARET, TokenType.EQ, TokenType.NE,
+    TokenType.GT, TokenType.LT, TokenType.GE, TokenType.LE,
+    TokenType.LIKE, TokenType.MATCH, TokenType.CONTAINS, TokenType.NOTCONTAINS,
+    TokenType.IN_OP, TokenType.NOTIN, TokenType.IS_OP, TokenType.ISNOT,
+    TokenType.REPLACE, TokenType.AND, TokenType.OR,
+    TokenType.AMPERSAND, TokenType.PIPE,
+    TokenType.LESS_LESS, TokenType.GREATER_GREATER,
+    TokenType.QUESTION_QUESTION
+)
+_UNARY_MASK = _role_mask(
+    TokenType.PLUS, TokenType.MINUS, TokenType.NOT,
+    TokenType.PLUS_PLUS, TokenType.MINUS_MINUS
+)
+_ASSIGNMENT_MASK = _role_mask(
+    TokenType.EQUAL, TokenType.PLUS_EQUAL, TokenType.MINUS_EQUAL,
+    TokenType.STAR_EQUAL, TokenType.SLASH_EQUAL, TokenType.PERCENT_EQUAL,
+    TokenType.CARET_EQUAL, TokenType.AMPERSAND_EQUAL, TokenType.PIPE_EQUAL
+)
+_POSTFIX_MASK = _role_mask(TokenType.PLUS_PLUS, TokenType.MINUS_MINUS)
+
+# Per-code record packing the fields read together into one 16-bit entry:
+# precedence << 10 | associativity << 8 | role flags
+_ROLE_BINARY, _ROLE_UNARY, _ROLE_POSTFIX, _ROLE_ASSIGNMENT = 1, 2, 4, 8
+_ASSOC_SHIFT, _PREC_SHIFT = 8, 10
+
+def _token_info(code: int) -> int:
+    """Pack precedence, associativity and role flags for a token type code"""
+    roles = 0
+    for role, mask in ((_ROLE_BINARY, _BINARY_MASK), (_ROLE_UNARY, _UNARY_MASK),
+                       (_ROLE_POSTFIX, _POSTFIX_MASK), (_ROLE_ASSIGNMENT, _ASSIGNMENT_MASK)):
+        if (mask >> code) & 1:
+            roles |= role
+    return (PRECEDENCE_BY_CODE[code] << _PREC_SHIFT
+            | _ASSOCIATIVITY_CODE_BY_CODE[code] << _ASSOC_SHIFT
+            | roles)
+
+_TOKEN_INFO = array('H', [_token_info(code) for code in range(_CODE_COUNT)])
+
+def _role_precedences(role: int, precedence: Optional[Precedence] = None) -> tuple:
+    """Precedence members by code for one role, NONE where the role does not apply"""
+    return tuple(
+        (precedence or _PRECEDENCE_LEVELS[info >> _PREC_SHIFT]) if info & role
+        else Precedence.NONE
+        for info in _TOKEN_INFO
+    )
+
+_BINARY_PRECEDENCE = _role_precedences(_ROLE_BINARY)
+_UNARY_PRECEDENCE = _role_precedences(_ROLE_UNARY, Precedence.UNARY)
+_POSTFIX_PRECEDENCE = _role_precedences(_ROLE_POSTFIX, Precedence.POSTFIX)
+
 def get_precedence(token_type: TokenType) -> Precedence:
     """Get precedence level for a token type"""
-    return OPERATOR_PRECEDENCE.get(token_type, Precedence.NONE)
+    return _PRECEDENCE_MEMBERS[token_type.value]
 
 def get_associativity(token_type: TokenType) -> Associativity:
     """Get associativity for a token type"""
-    return OPERATOR_ASSOCIATIVITY.get(token_type, Associativity.LEFT)
+    return _ASSOCIATIVITY_BY_CODE[token_type.value]
+
+def get_unary_associativity(token_type: TokenType) -> Associativity:
+    """Get associativity for the unary operator usage of a token type"""
+    return _UNARY_ASSOCIATIVITY_BY_CODE[token_type.value]
 
 def compare_precedence(left: TokenType, right: TokenType) -> int:
     """
     Compare precedence of two operators.
     Returns: -1 if left < right, 0 if equal, 1 if left > right
     """
-    left_prec = get_precedence(left)
-    right_prec = get_precedence(right)
-    
-    if left_prec.value < right_prec.value:
-        return -1
-    elif left_prec.value > right_prec.value:
-        return 1
-    else:
-        return 0
+    left_prec = PRECEDENCE_BY_CODE[left.value]
+    right_prec = PRECEDENCE_BY_CODE[right.value]
+    return (left_prec > right_prec) - (left_prec < right_prec)
 
 def can_be_binary_operator(token_type: TokenType) -> bool:
     """Check if token type can be a binary operator"""
-    binary_operators = {
-        TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH,
-        TokenType.PERCENT, TokenType.CARET, TokenType.EQ, TokenType.NE,
-        TokenType.GT, TokenType.LT, TokenType.GE, TokenType.LE,
-        TokenType.LIKE, TokenType.MATCH, TokenType.CONTAINS, TokenType.NOTCONTAINS,
-        TokenType.IN_OP, TokenType.NOTIN, TokenType.IS_OP, TokenType.ISNOT,
-        TokenType.REPLACE, TokenType.AND, TokenType.OR,
-        TokenType.AMPERSAND, TokenType.PIPE, TokenType.CARET,
-        TokenType.LESS_LESS, TokenType.GREATER_GREATER,
-        TokenType.QUESTION_QUESTION
-    }
-    return token_type in binary_operators
+    return bool((_BINARY_MASK >> token_type.value) & 1)
 
 def can_be_unary_operator(token_type: TokenType) -> bool:
     """Check if token type can be a unary operator"""
-    unary_operators = {
-        TokenType.PLUS, TokenType.MINUS, TokenType.NOT,
-        TokenType.PLUS_PLUS, TokenType.MINUS_MINUS
-    }
-    return token_type in unary_operators
+    return bool((_UNARY_MASK >> token_type.value) & 1)
 
 def can_be_assignment_operator(token_type: TokenType) -> bool:
     """Check if token type can be an assignment operator"""
-    assignment_operators = {
-        TokenType.EQUAL, TokenType.PLUS_EQUAL, TokenType.MINUS_EQUAL,
-        TokenType.STAR_EQUAL, TokenType.SLASH_EQUAL, TokenType.PERCENT_EQUAL,
-        TokenType.CARET_EQUAL, TokenType.AMPERSAND_EQUAL, TokenType.PIPE_EQUAL
-    }
-    return token_type in assignment_operators
+    return bool((_ASSIGNMENT_MASK >> token_type.value) & 1)
 
 def is_right_associative(token_type: TokenType) -> bool:
     """Check if operator is right-associative"""
-    return get_associativity(token_type) == Associativity.RIGHT
+    return (_TOKEN_INFO[token_type.value] >> _ASSOC_SHIFT) & 3 == _ASSOC_RIGHT
 
 def is_left_associative(token_type: TokenType) -> bool:
     """Check if operator is left-associative"""
-    return get_associativity(token_type) == Associativity.LEFT
-
-def get_binary_operator_precedence(token_type: TokenType) -> Optional[Precedence]:
-    """Get precedence for binary operator usage of a token"""
-    if can_be_binary_operator(token_type):
-        return get_precedence(token_type)
-    return None
-
-def get_unary_operator_precedence(token_type: TokenType) -> Optional[Precedence]:
-    """Get precedence for unary operator usage of a token"""
-    if can_be_unary_operator(token_type):
-        return Precedence.UNARY
-    return None
-
-def get_postfix_operator_precedence(token_type: TokenType) -> Optional[Precedence]:
-    """Get precedence for postfix operator usage of a token"""
-    if token_type in (TokenType.PLUS_PLUS, TokenType.MINUS_MINUS):
-        return Precedence.POSTFIX
-    return None
+    return (_TOKEN_INFO[token_type.value] >> _ASSOC_SHIFT) & 3 == _ASSOC_LEFT
+
+def get_binary_operator_precedence(token_type: TokenType) -> Precedence:
+    """Get precedence for binary operator usage of a token (NONE if not binary)"""
+    return _BINARY_PRECEDENCE[token_type.value]
+
+def get_unary_operator_precedence(token_type: TokenType) -> Precedence:
+    """Get precedence for unary operator usage of a token (NONE if not unary)"""
+    return _UNARY_PRECEDENCE[token_type.value]
+
+def get_postfix_operator_precedence(token_type: TokenType) -> Precedence:
+    """Get precedence for postfix operator usage of a token (NONE if not postfix)"""
+    return _POSTFIX_PRECEDENCE[token_type.value]
 
 class PrecedenceHandler:
     """Handles operator precedence for Pratt parser"""
     
+    INITIAL_CAPACITY = 256
+    
     def __init__(self):
-        self.precedence_stack: List[Precedence] = []
+        # Levels live in a fixed byte buffer; _sp is the number pushed
+        self._stack = array('b', bytes(self.INITIAL_CAPACITY))
+        self._sp = 0
+        # Top of the stack, kept as a member so peeking needs no indexing
+        self._top = Precedence.NONE
     
     def push_precedence(self, precedence: Precedence) -> None:
         """Push precedence level onto stack"""
-        self.precedence_stack.append(precedence)
+        stack = self._stack
+        sp = self._sp
+        if sp == len(stack):
+            stack.extend(bytes(sp))
+        stack[sp] = precedence
+        self._sp = sp + 1
+        self._top = _PRECEDENCE_LEVELS[precedence]
     
     def pop_precedence(self) -> Optional[Precedence]:
         """Pop precedence level from stack"""
-        if self.precedence_stack:
-            return self.precedence_stack.pop()
+        sp = self._sp
+        if sp:
+            self._sp = sp = sp - 1
+            top = self._top
+            self._top = _PRECEDENCE_LEVELS[self._stack[sp - 1]] if sp else Precedence.NONE
+            return top
         return None
     
     def current_precedence(self) -> Precedence:
         """Get current precedence level"""
-        if self.precedence_stack:
-            return self.precedence_stack[-1]
-        return Precedence.NONE
+        return self._top
     
     def should_apply_operator(self, current: TokenType, next_op: TokenType) -> bool:
         """
         Determine if current operator should be applied before next operator.
         Based on precedence and associativity rules.
         """
-        current_prec = get_precedence(current)
-        next_prec = get_precedence(next_op)
-        
-        if current_prec.value > next_prec.value:
-            return True
-        elif current_prec.value < next_prec.value:
-            return False
-        else:
-            # Same precedence - check associativity
-            if is_left_associative(current):
-                return True
-            elif is_right_associative(current):
-                return False
-            else:
-                # Non-associative operators cannot be chained
-                raise ValueError(
-                    f"Non-associative operator {current} cannot be chained "
-                    f"with {next_op} at same precedence level"
-                )
+        decision = _APPLY_DECISION[current.value * _CODE_COUNT + next_op.value]
+        if decision == _APPLY_CHAIN_ERROR:
+            # Non-associative operators cannot be chained
+            raise ValueError(
+                f"Non-associative operator {current} cannot be chained "
+                f"with {next_op} at same precedence level"
+            )
+        return decision == _APPLY_YES
     
     def get_expression_precedence(self, token_type: TokenType, 
                                   is_unary: bool = False,
                                   is_postfix: bool = False) -> Precedence:
         """Get appropriate precedence for expression parsing"""
         if is_unary:
-            prec = get_unary_operator_precedence(token_type)
-            return prec or Precedence.NONE
+            return _UNARY_PRECEDENCE[token_type.value]
         elif is_postfix:
-            prec = get_postfix_operator_precedence(token_type)
-            return prec or Precedence.NONE
+            return _POSTFIX_PRECEDENCE[token_type.value]
         else:
             return get_precedence(token_type)
@@ -2,222 +2,373 @@
 Syntax validation for PowerLang AST
 """
 
-from typing import List, Dict, Set, Optional
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Callable, List, Dict, Sequence, Optional, Tuple
 from ..lexer.tokens import TokenType
 from .ast import *
 from ..errors import SemanticError, ErrorHandler
 
+# Validation method for each node class; other values are skipped
+_VALIDATOR_NAMES: Dict[type, str] = {
+    Program: '_validate_program',
+    Block: '_validate_block',
+    ExpressionStatement: '_validate_expression_statement',
+    VariableDeclaration: '_validate_variable_declaration',
+    FunctionDeclaration: '_validate_function_declaration',
+    ClassDeclaration: '_validate_class_declaration',
+    NamespaceDeclaration: '_validate_namespace_declaration',
+    IfStatement: '_validate_if_statement',
+    ForStatement: '_validate_for_statement',
+    WhileStatement: '_validate_while_statement',
+    DoWhileStatement: '_validate_do_while_statement',
+    ForeachStatement: '_validate_foreach_statement',
+    SwitchStatement: '_validate_switch_statement',
+    CaseClause: '_validate_case_clause',
+    DefaultClause: '_validate_default_clause',
+    ReturnStatement: '_validate_return_statement',
+    BreakStatement: '_validate_break_statement',
+    ContinueStatement: '_validate_continue_statement',
+    TryCatchStatement: '_validate_try_catch_statement',
+    CatchClause: '_validate_catch_clause',
+    FinallyClause: '_validate_finally_clause',
+    ThrowStatement: '_validate_throw_statement',
+    ImportStatement: '_validate_import_statement',
+    ExportStatement: '_validate_export_statement',
+    UsingStatement: '_validate_using_statement',
+    
+    # Expressions
+    BinaryOperation: '_validate_binary_operation',
+    UnaryOperation: '_validate_unary_operation',
+    Assignment: '_validate_assignment',
+    CallExpression: '_validate_call_expression',
+    MemberAccess: '_validate_member_access',
+    IndexAccess: '_validate_index_access',
+    NewExpression: '_validate_new_expression',
+    CastExpression: '_validate_cast_expression',
+    TypeExpression: '_validate_type_expression',
+    TypeAnnotation: '_validate_type_annotation',
+    ArrayLiteral: '_validate_array_literal',
+    HashLiteral: '_validate_hash_literal',
+    LambdaExpression: '_validate_lambda_expression',
+    TernaryExpression: '_validate_ternary_expression',
+    RangeExpression: '_validate_range_expression',
+    Literal: '_validate_literal',
+    Variable: '_validate_variable',
+    
+    # Parameters
+    Parameter: '_validate_parameter',
+}
+
+# Operators accepted in binary, unary and assignment expressions
+_BINARY_OPERATORS = frozenset({
+    TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH,
+    TokenType.PERCENT, TokenType.EQ, TokenType.NE, TokenType.GT,
+    TokenType.LT, TokenType.GE, TokenType.LE, TokenType.AND,
+    TokenType.OR, TokenType.LIKE, TokenType.MATCH, TokenType.CONTAINS,
+    TokenType.IN_OP, TokenType.IS_OP, TokenType.REPLACE
+})
+_UNARY_OPERATORS = frozenset({
+    TokenType.PLUS, TokenType.MINUS, TokenType.NOT,
+    TokenType.PLUS_PLUS, TokenType.MINUS_MINUS
+})
+_ASSIGNMENT_OPERATORS = frozenset({
+    TokenType.EQUAL,            # =
+    TokenType.PLUS_EQUAL,       # +=
+    TokenType.MINUS_EQUAL,      # -=
+    TokenType.STAR_EQUAL,       # *=
+    TokenType.SLASH_EQUAL,      # /=
+    TokenType.PERCENT_EQUAL,    # %=
+})
+
+# Built-in type names
+_VALID_TYPE_NAMES = frozenset({
+    'int', 'double', 'string', 'bool', 'array', 'void',
+    'object', 'datetime', 'hashtable', 'list', 'dictionary'
+})
+
+class DiagnosticCode(IntEnum):
+    """Kinds of diagnostics reported by SyntaxValidator"""
+    EMPTY_VARIABLE_NAME = 0
+    EMPTY_FUNCTION_NAME = 1
+    EMPTY_CLASS_NAME = 2
+    DUPLICATE_VARIABLE = 3
+    DUPLICATE_FUNCTION = 4
+    DUPLICATE_CLASS = 5
+    DUPLICATE_PARAMETER = 6
+    DUPLICATE_LAMBDA_PARAMETER = 7
+    DUPLICATE_MEMBER = 8
+    RETURN_OUTSIDE_FUNCTION = 9
+    BREAK_OUTSIDE_LOOP = 10
+    CONTINUE_OUTSIDE_LOOP = 11
+    INVALID_BINARY_OPERATOR = 12
+    INVALID_UNARY_OPERATOR = 13
+    INVALID_ASSIGNMENT_OPERATOR = 14
+    UNDECLARED_VARIABLE = 15
+    UNKNOWN_TYPE = 16
+
+
+# Message template for each diagnostic code. Diagnostics are stored as
+# (code, arguments) and only formatted when they are read or reported
+_DIAGNOSTIC_TEMPLATES: Dict[DiagnosticCode, str] = {
+    DiagnosticCode.EMPTY_VARIABLE_NAME: "Variable name cannot be empty at line {0}",
+    DiagnosticCode.EMPTY_FUNCTION_NAME: "Function name cannot be empty at line {0}",
+    DiagnosticCode.EMPTY_CLASS_NAME: "Class name cannot be empty at line {0}",
+    DiagnosticCode.DUPLICATE_VARIABLE: "Duplicate variable declaration: '{0}' previously declared at line {1}",
+    DiagnosticCode.DUPLICATE_FUNCTION: "Duplicate function declaration: '{0}' previously declared at line {1}",
+    DiagnosticCode.DUPLICATE_CLASS: "Duplicate class declaration: '{0}' previously declared at line {1}",
+    DiagnosticCode.DUPLICATE_PARAMETER: "Duplicate parameter name: '{0}' in function '{1}' at line {2}",
+    DiagnosticCode.DUPLICATE_LAMBDA_PARAMETER: "Duplicate parameter name: '{0}' in lambda at line {1}",
+    DiagnosticCode.DUPLICATE_MEMBER: "Duplicate member '{0}' in class '{1}' at line {2}",
+    DiagnosticCode.RETURN_OUTSIDE_FUNCTION: "Return statement outside function at line {0}",
+    DiagnosticCode.BREAK_OUTSIDE_LOOP: "Break statement outside loop or switch at line {0}",
+    DiagnosticCode.CONTINUE_OUTSIDE_LOOP: "Continue statement outside loop at line {0}",
+    DiagnosticCode.INVALID_BINARY_OPERATOR: "Invalid binary operator: {0} at line {1}",
+    DiagnosticCode.INVALID_UNARY_OPERATOR: "Invalid unary operator: {0} at line {1}",
+    DiagnosticCode.INVALID_ASSIGNMENT_OPERATOR: "Invalid assignment operator: {0} at line {1}",
+    DiagnosticCode.UNDECLARED_VARIABLE: "Undeclared variable: '{0}' at line {1}",
+    DiagnosticCode.UNKNOWN_TYPE: "Unknown type name: '{0}' at line {1}",
+}
+
+# Same templates as a tuple indexed by code
+_TEMPLATES: Tuple[str, ...] = tuple(_DIAGNOSTIC_TEMPLATES[code] for code in DiagnosticCode)
+
+# Validation methods that do nothing unless a subclass overrides them
+_NO_OP_VALIDATORS = frozenset({
+    '_validate_literal', '_validate_import_statement', '_validate_using_statement'
+})
+
+# Marks a class whose handler has not been looked up yet (None means no handler)
+_UNRESOLVED = object()
+
+
+@lru_cache(maxsize=None)
+def _validator_table(cls: type) -> Dict[type, Optional[Callable[..., Any]]]:
+    """Validation methods of cls keyed by node class, built once per validator
+    class. Handlers are plain functions, called with the validator first;
+    inherited no-op handlers are stored as None so their nodes are skipped"""
+    table: Dict[type, Optional[Callable[..., Any]]] = {}
+    for node_class, method_name in _VALIDATOR_NAMES.items():
+        handler = getattr(cls, method_name)
+        if method_name in _NO_OP_VALIDATORS and handler is getattr(SyntaxValidator, method_name):
+            handler = None
+        table[node_class] = handler
+    return table
+
+
+def _resolve_validator(table: Dict[type, Optional[Callable[..., Any]]],
+                       node_class: type) -> Optional[Callable[..., Any]]:
+    """Find the handler for a subclass (or non-node value) through its MRO and
+    remember it in the table"""
+    handler = None
+    for base in node_class.__mro__[1:]:
+        handler = table.get(base)
+        if handler is not None:
+            break
+    table[node_class] = handler
+    return handler
+
+
 class SyntaxValidator:
     """Validates syntax and semantic rules for PowerLang AST"""
     
+    __slots__ = (
+        'error_handler', '_errors', '_warnings', '_emit_error', '_emit_warning',
+        '_scopes',
+        'loop_depth', 'switch_depth',
+        'in_function', 'current_function', '_dispatch',
+    )
+    
     def __init__(self, error_handler: Optional[ErrorHandler] = None):
         self.error_handler = error_handler or ErrorHandler()
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
+        self._errors: List[Tuple[DiagnosticCode, Tuple[Any, ...]]] = []
+        self._warnings: List[Tuple[DiagnosticCode, Tuple[Any, ...]]] = []
         
-        # Track declared names for duplicate checking
-        self.declared_names: Dict[str, List[ASTNode]] = {}
+        # Bound appends for the report sites; validate() clears the lists in place
+        self._emit_error = self._errors.append
+        self._emit_warning = self._warnings.append
+        
+        # Declared names per lexical scope, innermost last
+        self._scopes: List[Dict[str, ASTNode]] = [{}]
         
         # Track control flow for break/continue validation
-        self.in_loop: bool = False
-        self.in_switch: bool = False
         self.loop_depth: int = 0
         self.switch_depth: int = 0
         
         # Track function context for return validation
         self.in_function: bool = False
         self.current_function: Optional[FunctionDeclaration] = None
+        
+        # Validation handlers keyed by node class
+        self._dispatch = _validator_table(type(self))
     
     def validate(self, ast: ASTNode) -> bool:
         """Validate an AST node and all its children"""
-        self.errors.clear()
-        self.warnings.clear()
-        self.declared_names.clear()
-        self._reset_context()
-        
+        self._start()
         self._validate_node(ast)
+        return self._report()
+    
+    def validate_function(self, program: Program, name: str) -> bool:
+        """Validate only the top-level functions called name in a program.
         
-        # Report errors and warnings
-        for error in self.errors:
-            self.error_handler.error(SemanticError(error))
-        for warning in self.warnings:
-            self.error_handler.warning(warning)
-        
-        return len(self.errors) == 0
+        The program's top-level declarations are recorded first without
+        walking any bodies, so other functions (and their lazily parsed
+        bodies) are left alone. Returns True if no function of that name
+        has errors.
+        """
+        self._start()
+        for func in self._collect_declarations(program, name):
+            # Checked in a scope of its own, so the function isn't reported
+            # as a duplicate of its collected declaration
+            depth = self._push_scope()
+            self._validate_node(func)
+            self._leave_scope(depth)
+        return self._report()
+    
+    @property
+    def errors(self) -> List[str]:
+        """Error messages from the last validation"""
+        return [_TEMPLATES[code].format(*args) for code, args in self._errors]
+    
+    @property
+    def warnings(self) -> List[str]:
+        """Warning messages from the last validation"""
+        return [_TEMPLATES[code].format(*args) for code, args in self._warnings]
+    
+    @property
+    def error_codes(self) -> List[DiagnosticCode]:
+        """Codes of the errors from the last validation, in report order"""
+        return [code for code, _ in self._errors]
+    
+    @property
+    def in_loop(self) -> bool:
+        """Whether validation is inside a loop"""
+        return self.loop_depth > 0
+    
+    @property
+    def in_switch(self) -> bool:
+        """Whether validation is inside a switch"""
+        return self.switch_depth > 0
+    
+    def _start(self) -> None:
+        """Clear diagnostics, scopes and context before a validation run"""
+        self._errors.clear()
+        self._warnings.clear()
+        self._scopes = [{}]
+        self._reset_context()
+    
+    def _report(self) -> bool:
+        """Report errors and warnings; returns True if there were no errors"""
+        for code, args in self._errors:
+            self.error_handler.error(SemanticError(_TEMPLATES[code].format(*args)))
+        for code, args in self._warnings:
+            self.error_handler.warning(_TEMPLATES[code].format(*args))
+        
+        return not self._errors
+    
+    def _collect_declarations(self, program: Program, name: str) -> List[FunctionDeclaration]:
+        """Record the top-level declarations of a program, including those in
+        namespaces and exports, without walking any bodies. Returns the
+        functions called name, in source order"""
+        functions: List[FunctionDeclaration] = []
+        pending: List[ASTNode] = [program]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, Program):
+                pending.extend(reversed(node.statements))
+            elif isinstance(node, NamespaceDeclaration):
+                pending.append(node.body)
+            elif isinstance(node, ExportStatement):
+                pending.append(node.declaration)
+            elif isinstance(node, (VariableDeclaration, FunctionDeclaration, ClassDeclaration)):
+                if node.name:
+                    self._record_declaration(node.name, node)
+                    if node.name == name and isinstance(node, FunctionDeclaration):
+                        functions.append(node)
+        return functions
     
     def _reset_context(self) -> None:
         """Reset validation context"""
-        self.in_loop = False
-        self.in_switch = False
         self.loop_depth = 0
         self.switch_depth = 0
         self.in_function = False
         self.current_function = None
     
     def _validate_node(self, node: ASTNode) -> None:
-        """Dispatch to appropriate validation method based on node type"""
-        if isinstance(node, Program):
-            self._validate_program(node)
-        elif isinstance(node, Block):
-            self._validate_block(node)
-        elif isinstance(node, ExpressionStatement):
-            self._validate_expression_statement(node)
-        elif isinstance(node, VariableDeclaration):
-            self._validate_variable_declaration(node)
-        elif isinstance(node, FunctionDeclaration):
-            self._validate_function_declaration(node)
-        elif isinstance(node, ClassDeclaration):
-            self._validate_class_declaration(node)
-        elif isinstance(node, NamespaceDeclaration):
-            self._validate_namespace_declaration(node)
-        elif isinstance(node, IfStatement):
-            self._validate_if_statement(node)
-        elif isinstance(node, ForStatement):
-            self._validate_for_statement(node)
-        elif isinstance(node, WhileStatement):
-            self._validate_while_statement(node)
-        elif isinstance(node, DoWhileStatement):
-            self._validate_do_while_statement(node)
-        elif isinstance(node, ForeachStatement):
-            self._validate_foreach_statement(node)
-        elif isinstance(node, SwitchStatement):
-            self._validate_switch_statement(node)
-        elif isinstance(node, CaseClause):
-            self._validate_case_clause(node)
-        elif isinstance(node, DefaultClause):
-            self._validate_default_clause(node)
-        elif isinstance(node, ReturnStatement):
-            self._validate_return_statement(node)
-        elif isinstance(node, BreakStatement):
-            self._validate_break_statement(node)
-        elif isinstance(node, ContinueStatement):
-            self._validate_continue_statement(node)
-        elif isinstance(node, TryCatchStatement):
-            self._validate_try_catch_statement(node)
-        elif isinstance(node, CatchClause):
-            self._validate_catch_clause(node)
-        elif isinstance(node, FinallyClause):
-            self._validate_finally_clause(node)
-        elif isinstance(node, ThrowStatement):
-            self._validate_throw_statement(node)
-        elif isinstance(node, ImportStatement):
-            self._validate_import_statement(node)
-        elif isinstance(node, ExportStatement):
-            self._validate_export_statement(node)
-        elif isinstance(node, UsingStatement):
-            self._validate_using_statement(node)
-        
-        # Expressions
-        elif isinstance(node, BinaryOperation):
-            self._validate_binary_operation(node)
-        elif isinstance(node, UnaryOperation):
-            self._validate_unary_operation(node)
-        elif isinstance(node, Assignment):
-            self._validate_assignment(node)
-        elif isinstance(node, CallExpression):
-            self._validate_call_expression(node)
-        elif isinstance(node, MemberAccess):
-            self._validate_member_access(node)
-        elif isinstance(node, IndexAccess):
-            self._validate_index_access(node)
-        elif isinstance(node, NewExpression):
-            self._validate_new_expression(node)
-        elif isinstance(node, CastExpression):
-            self._validate_cast_expression(node)
-        elif isinstance(node, TypeExpression):
-            self._validate_type_expression(node)
-        elif isinstance(node, TypeAnnotation):
-            self._validate_type_annotation(node)
-        elif isinstance(node, ArrayLiteral):
-            self._validate_array_literal(node)
-        elif isinstance(node, HashLiteral):
-            self._validate_hash_literal(node)
-        elif isinstance(node, LambdaExpression):
-            self._validate_lambda_expression(node)
-        elif isinstance(node, TernaryExpression):
-            self._validate_ternary_expression(node)
-        elif isinstance(node, RangeExpression):
-            self._validate_range_expression(node)
-        elif isinstance(node, Literal):
-            self._validate_literal(node)
-        elif isinstance(node, Variable):
-            self._validate_variable(node)
-        
-        # Parameters
-        elif isinstance(node, Parameter):
-            self._validate_parameter(node)
+        """Validate a subtree with an explicit work stack instead of recursion.
+        
+        Each handler checks its node and returns the work that follows, in
+        order: child nodes, and (method, argument) steps to run once the
+        children before them are done (checks that follow the children,
+        scope exits and context restores).
+        """
+        dispatch = self._dispatch
+        stack: List[Any] = [node]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            item = pop()
+            item_class = item.__class__
+            if item_class is tuple:
+                item[0](item[1])
+                continue
+            handler = dispatch.get(item_class, _UNRESOLVED)
+            if handler is _UNRESOLVED:
+                handler = _resolve_validator(dispatch, item_class)
+            if handler is not None:
+                work = handler(self, item)
+                if work:
+                    extend(reversed(work))
     
     # ============================================================================
     # Program and declaration validation
     # ============================================================================
     
-    def _validate_program(self, program: Program) -> None:
+    def _validate_program(self, program: Program) -> Sequence[ASTNode]:
         """Validate a program"""
-        # Validate all statements
-        for stmt in program.statements:
-            self._validate_node(stmt)
-        
-        # Validate namespaces
-        for ns in program.namespaces:
-            self._validate_node(ns)
-        
-        # Validate classes
-        for cls in program.classes:
-            self._validate_node(cls)
-        
-        # Validate functions
-        for func in program.functions:
-            self._validate_node(func)
+        # Validate all statements, including top-level declarations
+        return program.children()
     
-    def _validate_block(self, block: Block) -> None:
+    def _validate_block(self, block: Block) -> List[Any]:
         """Validate a block"""
-        for stmt in block.statements:
-            self._validate_node(stmt)
+        depth = self._push_scope()
+        work: List[Any] = list(block.children())
+        work.append((self._leave_scope, depth))
+        return work
     
-    def _validate_expression_statement(self, stmt: ExpressionStatement) -> None:
+    def _validate_expression_statement(self, stmt: ExpressionStatement) -> Sequence[ASTNode]:
         """Validate an expression statement"""
-        self._validate_node(stmt.expression)
+        return stmt.children()
     
-    def _validate_variable_declaration(self, decl: VariableDeclaration) -> None:
+    def _validate_variable_declaration(self, decl: VariableDeclaration) -> Optional[Sequence[ASTNode]]:
         """Validate a variable declaration"""
         # Check variable name
         name = decl.name
         if not name:
-            self.errors.append(f"Variable name cannot be empty at line {decl.line}")
-            return
+            self._emit_error((DiagnosticCode.EMPTY_VARIABLE_NAME, (decl.line,)))
+            return None
         
         # Check for duplicate declaration in same scope
-        if name in self.declared_names:
-            # Check if any previous declaration is in the same scope level
-            previous = self.declared_names[name][-1]
+        previous = self._scopes[-1].get(name)
+        if previous is not None:
             if isinstance(previous, VariableDeclaration):
-                self.errors.append(
-                    f"Duplicate variable declaration: '{name}' "
-                    f"previously declared at line {previous.line}"
-                )
+                self._emit_error((DiagnosticCode.DUPLICATE_VARIABLE, (name, previous.line)))
         
         # Record declaration
         self._record_declaration(name, decl)
         
-        # Validate type annotation
-        if decl.type_annotation:
-            self._validate_node(decl.type_annotation)
+        # Check constant initialization
+        if decl.initializer and decl.is_constant:
+            # Constants must have compile-time constant initializers
+            # For now, just check it exists
+            pass
         
-        # Validate initializer
-        if decl.initializer:
-            self._validate_node(decl.initializer)
-            
-            # Check constant initialization
-            if decl.is_constant:
-                # Constants must have compile-time constant initializers
-                # For now, just check it exists
-                pass
+        # Validate type annotation and initializer
+        return decl.children()
     
-    def _validate_function_declaration(self, func: FunctionDeclaration) -> None:
+    def _validate_function_declaration(self, func: FunctionDeclaration) -> Optional[List[Any]]:
         """Validate a function declaration"""
         # Save previous context
-        previous_in_function = self.in_function
-        previous_function = self.current_function
+        previous_context = (self.in_function, self.current_function)
         
         # Set new context
         self.in_function = True
@@ -226,43 +377,36 @@ class SyntaxValidator:
         # Check function name
         name = func.name
         if not name:
-            self.errors.append(f"Function name cannot be empty at line {func.line}")
-            return
+            self._emit_error((DiagnosticCode.EMPTY_FUNCTION_NAME, (func.line,)))
+            return None
         
         # Check for duplicate declaration
-        if name in self.declared_names:
-            previous = self.declared_names[name][-1]
+        previous = self._scopes[-1].get(name)
+        if previous is not None:
             if isinstance(previous, FunctionDeclaration):
-                self.errors.append(
-                    f"Duplicate function declaration: '{name}' "
-                    f"previously declared at line {previous.line}"
-                )
+                self._emit_error((DiagnosticCode.DUPLICATE_FUNCTION, (name, previous.line)))
         
         # Record declaration
         self._record_declaration(name, func)
         
-        # Validate parameters
-        param_names: Set[str] = set()
+        # Parameters and body get their own scope
+        depth = self._push_scope()
+        
+        # Validate parameters, then check and record each one
+        work: List[Any] = []
+        param_names: Dict[str, Parameter] = {}
+        owner = (DiagnosticCode.DUPLICATE_PARAMETER, (name, func.line))
         for param in func.parameters:
-            self._validate_node(param)
-            
-            # Check for duplicate parameter names
-            if param.name in param_names:
-                self.errors.append(
-                    f"Duplicate parameter name: '{param.name}' "
-                    f"in function '{name}' at line {func.line}"
-                )
-            param_names.add(param.name)
-            
-            # Record parameter as local declaration
-            self._record_declaration(param.name, param)
+            work.append(param)
+            work.append((self._declare_parameter, (param, param_names, owner)))
         
         # Validate return type
         if func.return_type:
-            self._validate_node(func.return_type)
+            work.append(func.return_type)
         
         # Validate function body
-        self._validate_node(func.body)
+        work.append(func.body)
+        work.append((self._leave_scope, depth))
         
         # Check for return statement if function has non-void return type
         if func.return_type and func.return_type.type_expression.type_name != "void":
@@ -270,458 +414,359 @@ class SyntaxValidator:
             pass
         
         # Restore previous context
-        self.in_function = previous_in_function
-        self.current_function = previous_function
+        work.append((self._restore_function_context, previous_context))
+        return work
     
-    def _validate_class_declaration(self, cls: ClassDeclaration) -> None:
+    def _validate_class_declaration(self, cls: ClassDeclaration) -> Optional[List[Any]]:
         """Validate a class declaration"""
         # Check class name
         name = cls.name
         if not name:
-            self.errors.append(f"Class name cannot be empty at line {cls.line}")
-            return
+            self._emit_error((DiagnosticCode.EMPTY_CLASS_NAME, (cls.line,)))
+            return None
         
         # Check for duplicate declaration
-        if name in self.declared_names:
-            previous = self.declared_names[name][-1]
+        previous = self._scopes[-1].get(name)
+        if previous is not None:
             if isinstance(previous, ClassDeclaration):
-                self.errors.append(
-                    f"Duplicate class declaration: '{name}' "
-                    f"previously declared at line {previous.line}"
-                )
+                self._emit_error((DiagnosticCode.DUPLICATE_CLASS, (name, previous.line)))
         
         # Record declaration
         self._record_declaration(name, cls)
         
+        work: List[Any] = []
+        
         # Validate base class
         if cls.base_class:
-            self._validate_node(cls.base_class)
+            work.append(cls.base_class)
         
         # Validate interfaces
-        for iface in cls.interfaces:
-            self._validate_node(iface)
+        work.extend(cls.interfaces or EMPTY)
         
-        # Validate members
-        member_names: Set[str] = set()
+        # Validate members in the class scope; base types declare nothing,
+        # so the scope can be entered before they are checked
+        depth = self._push_scope()
+        member_names: Dict[str, FunctionDeclaration] = {}
         for member in cls.members:
-            self._validate_node(member)
+            work.append(member)
             
             # Check for duplicate member names
             if isinstance(member, FunctionDeclaration):
-                member_name = member.name
-                if member_name in member_names:
-                    self.errors.append(
-                        f"Duplicate member '{member_name}' in class '{name}' "
-                        f"at line {member.line}"
-                    )
-                member_names.add(member_name)
+                work.append((self._check_member, (member, member_names, name)))
+        work.append((self._leave_scope, depth))
+        return work
     
     # ============================================================================
     # Control flow validation
     # ============================================================================
     
-    def _validate_if_statement(self, stmt: IfStatement) -> None:
+    def _validate_if_statement(self, stmt: IfStatement) -> Sequence[ASTNode]:
         """Validate an if statement"""
-        self._validate_node(stmt.condition)
-        self._validate_node(stmt.then_branch)
-        
-        for elseif in stmt.elseif_branches:
-            self._validate_node(elseif.condition)
-            self._validate_node(elseif.branch)
-        
-        if stmt.else_branch:
-            self._validate_node(stmt.else_branch)
+        # Condition and branch of the if, each elseif, then the else branch
+        return stmt.children()
     
-    def _validate_for_statement(self, stmt: ForStatement) -> None:
+    def _validate_for_statement(self, stmt: ForStatement) -> List[Any]:
         """Validate a for statement"""
-        # Save previous loop context
-        previous_in_loop = self.in_loop
-        previous_loop_depth = self.loop_depth
-        
-        # Set new context
-        self.in_loop = True
-        self.loop_depth += 1
-        
-        # Validate initializer
-        if stmt.initializer:
-            self._validate_node(stmt.initializer)
-        
-        # Validate condition
-        if stmt.condition:
-            self._validate_node(stmt.condition)
+        # Enter the loop; the initializer is scoped to the loop
+        loop_depth = self._enter_loop()
+        depth = self._push_scope()
         
-        # Validate increment
-        if stmt.increment:
-            self._validate_node(stmt.increment)
+        # Validate initializer, condition, increment and body
+        work: List[Any] = list(stmt.children())
+        work.append((self._leave_scope, depth))
         
-        # Validate body
-        self._validate_node(stmt.body)
-        
-        # Restore context
-        self.in_loop = previous_in_loop
-        self.loop_depth = previous_loop_depth
+        # Leave the loop
+        work.append((self._exit_loop, loop_depth))
+        return work
     
-    def _validate_while_statement(self, stmt: WhileStatement) -> None:
+    def _validate_while_statement(self, stmt: WhileStatement) -> Tuple[Any, ...]:
         """Validate a while statement"""
-        # Save previous loop context
-        previous_in_loop = self.in_loop
-        previous_loop_depth = self.loop_depth
-        
-        # Set new context
-        self.in_loop = True
-        self.loop_depth += 1
-        
-        self._validate_node(stmt.condition)
-        self._validate_node(stmt.body)
-        
-        # Restore context
-        self.in_loop = previous_in_loop
-        self.loop_depth = previous_loop_depth
+        loop_depth = self._enter_loop()
+        return (*stmt.children(), (self._exit_loop, loop_depth))
     
-    def _validate_do_while_statement(self, stmt: DoWhileStatement) -> None:
+    def _validate_do_while_statement(self, stmt: DoWhileStatement) -> Tuple[Any, ...]:
         """Validate a do-while statement"""
-        # Save previous loop context
-        previous_in_loop = self.in_loop
-        previous_loop_depth = self.loop_depth
-        
-        # Set new context
-        self.in_loop = True
-        self.loop_depth += 1
-        
-        self._validate_node(stmt.body)
-        self._validate_node(stmt.condition)
-        
-        # Restore context
-        self.in_loop = previous_in_loop
-        self.loop_depth = previous_loop_depth
+        loop_depth = self._enter_loop()
+        return (*stmt.children(), (self._exit_loop, loop_depth))
     
-    def _validate_foreach_statement(self, stmt: ForeachStatement) -> None:
+    def _validate_foreach_statement(self, stmt: ForeachStatement) -> List[Any]:
         """Validate a foreach statement"""
-        # Save previous loop context
-        previous_in_loop = self.in_loop
-        previous_loop_depth = self.loop_depth
-        
-        # Set new context
-        self.in_loop = True
-        self.loop_depth += 1
-        
-        # Validate variable type
-        if stmt.variable_type:
-            self._validate_node(stmt.variable_type)
-        
-        # Validate collection
-        self._validate_node(stmt.collection)
+        loop_depth = self._enter_loop()
         
-        # Validate body
-        self._validate_node(stmt.body)
+        # Validate variable type, collection and body
+        work: List[Any] = list(stmt.children())
         
-        # Restore context
-        self.in_loop = previous_in_loop
-        self.loop_depth = previous_loop_depth
+        # Leave the loop
+        work.append((self._exit_loop, loop_depth))
+        return work
     
-    def _validate_switch_statement(self, stmt: SwitchStatement) -> None:
+    def _validate_switch_statement(self, stmt: SwitchStatement) -> List[Any]:
         """Validate a switch statement"""
-        # Save previous switch context
-        previous_in_switch = self.in_switch
-        previous_switch_depth = self.switch_depth
-        
-        # Set new context
-        self.in_switch = True
-        self.switch_depth += 1
+        switch_depth = self._enter_switch()
         
-        self._validate_node(stmt.expression)
+        # Validate expression, cases and default case
+        # TODO: Evaluate constant case values for duplicate checking
+        work: List[Any] = list(stmt.children())
         
-        # Validate cases
-        case_values = set()
-        for case in stmt.cases:
-            self._validate_node(case)
-            
-            # Check for duplicate case values
-            for value_expr in case.values:
-                # TODO: Evaluate constant expressions for duplicate checking
-                pass
-        
-        # Validate default case
-        if stmt.default_case:
-            self._validate_node(stmt.default_case)
-        
-        # Restore context
-        self.in_switch = previous_in_switch
-        self.switch_depth = previous_switch_depth
+        # Leave the switch
+        work.append((self._exit_switch, switch_depth))
+        return work
     
-    def _validate_return_statement(self, stmt: ReturnStatement) -> None:
+    def _validate_return_statement(self, stmt: ReturnStatement) -> Sequence[ASTNode]:
         """Validate a return statement"""
         # Check if we're in a function
         if not self.in_function:
-            self.errors.append(
-                f"Return statement outside function at line {stmt.line}"
-            )
+            self._emit_error((DiagnosticCode.RETURN_OUTSIDE_FUNCTION, (stmt.line,)))
         
         # Validate return value
         if stmt.value:
-            self._validate_node(stmt.value)
-            
             # Check if return type matches function return type
             if self.current_function and self.current_function.return_type:
                 # TODO: Type checking
                 pass
+        return stmt.children()
     
     def _validate_break_statement(self, stmt: BreakStatement) -> None:
         """Validate a break statement"""
         # Check if we're in a loop or switch
-        if not (self.in_loop or self.in_switch):
-            self.errors.append(
-                f"Break statement outside loop or switch at line {stmt.line}"
-            )
+        if not (self.loop_depth or self.switch_depth):
+            self._emit_error((DiagnosticCode.BREAK_OUTSIDE_LOOP, (stmt.line,)))
     
     def _validate_continue_statement(self, stmt: ContinueStatement) -> None:
         """Validate a continue statement"""
         # Check if we're in a loop
-        if not self.in_loop:
-            self.errors.append(
-                f"Continue statement outside loop at line {stmt.line}"
-            )
+        if not self.loop_depth:
+            self._emit_error((DiagnosticCode.CONTINUE_OUTSIDE_LOOP, (stmt.line,)))
     
     # ============================================================================
     # Expression validation
     # ============================================================================
     
-    def _validate_binary_operation(self, op: BinaryOperation) -> None:
+    def _validate_binary_operation(self, op: BinaryOperation) -> Tuple[Any, ...]:
         """Validate a binary operation"""
-        self._validate_node(op.left)
-        self._validate_node(op.right)
-        
-        # Check for valid operator
-        valid_operators = {
-            TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH,
-            TokenType.PERCENT, TokenType.EQ, TokenType.NE, TokenType.GT,
-            TokenType.LT, TokenType.GE, TokenType.LE, TokenType.AND,
-            TokenType.OR, TokenType.LIKE, TokenType.MATCH, TokenType.CONTAINS,
-            TokenType.IN_OP, TokenType.IS_OP, TokenType.REPLACE
-        }
-        
-        if op.operator.type not in valid_operators:
-            self.errors.append(
-                f"Invalid binary operator: {op.operator.lexeme} "
-                f"at line {op.line}"
-            )
+        return (*op.children(), (self._check_binary_operator, op))
+    
+    def _check_binary_operator(self, op: BinaryOperation) -> None:
+        """Check for valid binary operator"""
+        if op.operator.type not in _BINARY_OPERATORS:
+            self._emit_error((DiagnosticCode.INVALID_BINARY_OPERATOR, (op.operator.lexeme, op.line)))
     
-    def _validate_unary_operation(self, op: UnaryOperation) -> None:
+    def _validate_unary_operation(self, op: UnaryOperation) -> Tuple[Any, ...]:
         """Validate a unary operation"""
-        self._validate_node(op.operand)
-        
-        # Check for valid operator
-        valid_operators = {
-            TokenType.PLUS, TokenType.MINUS, TokenType.NOT,
-            TokenType.PLUS_PLUS, TokenType.MINUS_MINUS
-        }
-        
-        if op.operator.type not in valid_operators:
-            self.errors.append(
-                f"Invalid unary operator: {op.operator.lexeme} "
-                f"at line {op.line}"
-            )
+        return (op.operand, (self._check_unary_operator, op))
     
-    def _validate_assignment(self, assign: Assignment) -> None:
+    def _check_unary_operator(self, op: UnaryOperation) -> None:
+        """Check for valid unary operator"""
+        if op.operator.type not in _UNARY_OPERATORS:
+            self._emit_error((DiagnosticCode.INVALID_UNARY_OPERATOR, (op.operator.lexeme, op.line)))
+    
+    def _validate_assignment(self, assign: Assignment) -> Tuple[Any, ...]:
         """Validate an assignment"""
-        # Validate target (must be assignable)
-        self._validate_node(assign.target)
-
-    def can_be_assignment_operator(token_type: TokenType) -> bool:
-        """
-        Returns True if the token type is a valid assignment operator.
-        """
-        return token_type in {
-            TokenType.ASSIGN,          # =
-            TokenType.PLUS_ASSIGN,     # +=
-            TokenType.MINUS_ASSIGN,    # -=
-            TokenType.STAR_ASSIGN,     # *=
-            TokenType.SLASH_ASSIGN,    # /=
-            TokenType.PERCENT_ASSIGN,  # %=
-        }
-
-        # Check for valid assignment operator
-        if not can_be_assignment_operator(assign.operator.type):
-            self.errors.append(
-                f"Invalid assignment operator: {assign.operator.lexeme} "
-                f"at line {assign.line}"
+        # Validate target (must be assignable), the operator, then the value
+        return (assign.target, (self._check_assignment_operator, assign), assign.value)
+    
+    def _check_assignment_operator(self, assign: Assignment) -> None:
+        """Check for valid assignment operator"""
+        if assign.operator.type not in _ASSIGNMENT_OPERATORS:
+            self._emit_error(
+                (DiagnosticCode.INVALID_ASSIGNMENT_OPERATOR, (assign.operator.lexeme, assign.line))
             )
-        
-        # Validate value
-        self._validate_node(assign.value)
     
     def _validate_variable(self, var: Variable) -> None:
         """Validate a variable reference"""
         name = var.name
         
         # Check if variable is declared
-        if name not in self.declared_names:
-            self.errors.append(
-                f"Undeclared variable: '{name}' at line {var.line}"
-            )
+        if not self._is_declared(name):
+            self._emit_error((DiagnosticCode.UNDECLARED_VARIABLE, (name, var.line)))
     
-    def _validate_call_expression(self, call: CallExpression) -> None:
+    def _validate_call_expression(self, call: CallExpression) -> List[Any]:
         """Validate a function call"""
-        self._validate_node(call.callee)
-        
-        for arg in call.arguments:
-            self._validate_node(arg)
+        return call.children()
     
     # ============================================================================
     # Helper methods
     # ============================================================================
     
     def _record_declaration(self, name: str, node: ASTNode) -> None:
-        """Record a name declaration"""
-        if name not in self.declared_names:
-            self.declared_names[name] = []
-        self.declared_names[name].append(node)
-    
-    def _validate_namespace_declaration(self, ns: NamespaceDeclaration) -> None:
+        """Record a name declaration in the innermost scope"""
+        self._scopes[-1][name] = node
+    
+    def _is_declared(self, name: str) -> bool:
+        """Check whether a name is declared in any enclosing scope"""
+        for scope in reversed(self._scopes):
+            if name in scope:
+                return True
+        return False
+    
+    def _push_scope(self) -> int:
+        """Enter a new lexical scope; returns the depth to restore on exit"""
+        scopes = self._scopes
+        depth = len(scopes)
+        scopes.append({})
+        return depth
+    
+    def _leave_scope(self, depth: int) -> None:
+        """Drop the scopes entered since the given depth"""
+        del self._scopes[depth:]
+    
+    def _restore_function_context(self, context: Tuple[bool, Optional[FunctionDeclaration]]) -> None:
+        """Restore the enclosing function context"""
+        self.in_function, self.current_function = context
+    
+    def _enter_loop(self) -> int:
+        """Enter a loop; returns the depth to restore on exit"""
+        depth = self.loop_depth
+        self.loop_depth = depth + 1
+        return depth
+    
+    def _exit_loop(self, depth: int) -> None:
+        """Return to the enclosing loop depth"""
+        self.loop_depth = depth
+    
+    def _enter_switch(self) -> int:
+        """Enter a switch; returns the depth to restore on exit"""
+        depth = self.switch_depth
+        self.switch_depth = depth + 1
+        return depth
+    
+    def _exit_switch(self, depth: int) -> None:
+        """Return to the enclosing switch depth"""
+        self.switch_depth = depth
+    
+    def _declare_parameter(self, entry: Tuple[Parameter, Dict[str, Parameter],
+                                              Tuple[DiagnosticCode, Tuple[Any, ...]]]) -> None:
+        """Check a validated parameter for a duplicate name and record it"""
+        param, param_names, (code, owner_args) = entry
+        if param_names.setdefault(param.name, param) is not param:
+            self._emit_error((code, (param.name, *owner_args)))
+        
+        # Record parameter as local declaration
+        self._record_declaration(param.name, param)
+    
+    def _check_member(self, entry: Tuple[FunctionDeclaration, Dict[str, FunctionDeclaration], str]) -> None:
+        """Check a validated class method for a duplicate member name"""
+        member, member_names, class_name = entry
+        member_name = member.name
+        if member_names.setdefault(member_name, member) is not member:
+            self._emit_error((DiagnosticCode.DUPLICATE_MEMBER, (member_name, class_name, member.line)))
+    
+    def _validate_namespace_declaration(self, ns: NamespaceDeclaration) -> Sequence[ASTNode]:
         """Validate a namespace declaration"""
-        self._validate_node(ns.body)
+        return ns.children()
     
-    def _validate_case_clause(self, case: CaseClause) -> None:
+    def _validate_case_clause(self, case: CaseClause) -> Sequence[ASTNode]:
         """Validate a case clause"""
-        for value in case.values:
-            self._validate_node(value)
-        self._validate_node(case.body)
+        return case.children()
     
-    def _validate_default_clause(self, default: DefaultClause) -> None:
+    def _validate_default_clause(self, default: DefaultClause) -> Sequence[ASTNode]:
         """Validate a default clause"""
-        self._validate_node(default.body)
+        return default.children()
     
-    def _validate_try_catch_statement(self, stmt: TryCatchStatement) -> None:
+    def _validate_try_catch_statement(self, stmt: TryCatchStatement) -> Sequence[ASTNode]:
         """Validate a try-catch statement"""
-        self._validate_node(stmt.try_block)
-        
-        for catch in stmt.catch_clauses:
-            self._validate_node(catch)
-        
-        if stmt.finally_block:
-            self._validate_node(stmt.finally_block)
+        return stmt.children()
     
-    def _validate_catch_clause(self, catch: CatchClause) -> None:
+    def _validate_catch_clause(self, catch: CatchClause) -> Sequence[ASTNode]:
         """Validate a catch clause"""
-        if catch.exception_type:
-            self._validate_node(catch.exception_type)
-        self._validate_node(catch.block)
+        return catch.children()
     
-    def _validate_finally_clause(self, finally_clause: FinallyClause) -> None:
+    def _validate_finally_clause(self, finally_clause: FinallyClause) -> Sequence[ASTNode]:
         """Validate a finally clause"""
-        self._validate_node(finally_clause.block)
+        return finally_clause.children()
     
-    def _validate_throw_statement(self, stmt: ThrowStatement) -> None:
+    def _validate_throw_statement(self, stmt: ThrowStatement) -> Sequence[ASTNode]:
         """Validate a throw statement"""
-        self._validate_node(stmt.expression)
+        return stmt.children()
     
     def _validate_import_statement(self, stmt: ImportStatement) -> None:
         """Validate an import statement"""
         # Nothing to validate for now
         pass
     
-    def _validate_export_statement(self, stmt: ExportStatement) -> None:
+    def _validate_export_statement(self, stmt: ExportStatement) -> Tuple[Any, ...]:
         """Validate an export statement"""
-        self._validate_node(stmt.declaration)
+        return (stmt.declaration,)
     
     def _validate_using_statement(self, stmt: UsingStatement) -> None:
         """Validate a using statement"""
         # Nothing to validate for now
         pass
     
-    def _validate_member_access(self, access: MemberAccess) -> None:
+    def _validate_member_access(self, access: MemberAccess) -> Sequence[ASTNode]:
         """Validate a member access"""
-        self._validate_node(access.object)
+        return access.children()
     
-    def _validate_index_access(self, access: IndexAccess) -> None:
+    def _validate_index_access(self, access: IndexAccess) -> Sequence[ASTNode]:
         """Validate an index access"""
-        self._validate_node(access.object)
-        self._validate_node(access.index)
+        return access.children()
     
-    def _validate_new_expression(self, expr: NewExpression) -> None:
+    def _validate_new_expression(self, expr: NewExpression) -> Sequence[ASTNode]:
         """Validate a new expression"""
-        self._validate_node(expr.type_expression)
-        for arg in expr.arguments:
-            self._validate_node(arg)
+        return expr.children()
     
-    def _validate_cast_expression(self, expr: CastExpression) -> None:
+    def _validate_cast_expression(self, expr: CastExpression) -> Tuple[Any, ...]:
         """Validate a cast expression"""
-        self._validate_node(expr.type_expression)
-        self._validate_node(expr.expression)
+        return (expr.type_expression, expr.expression)
     
     def _validate_type_expression(self, expr: TypeExpression) -> None:
         """Validate a type expression"""
         # Check if type name is valid
         type_name = expr.type_name
-        valid_type_names = {
-            'int', 'double', 'string', 'bool', 'array', 'void',
-            'object', 'datetime', 'hashtable', 'list', 'dictionary'
-        }
-        
-        if type_name not in valid_type_names and type_name not in self.declared_names:
-            self.warnings.append(
-                f"Unknown type name: '{type_name}' at line {expr.line}"
-            )
+        if type_name not in _VALID_TYPE_NAMES and not self._is_declared(type_name):
+            self._emit_warning((DiagnosticCode.UNKNOWN_TYPE, (type_name, expr.line)))
     
-    def _validate_type_annotation(self, annot: TypeAnnotation) -> None:
+    def _validate_type_annotation(self, annot: TypeAnnotation) -> Sequence[ASTNode]:
         """Validate a type annotation"""
-        self._validate_node(annot.type_expression)
+        return annot.children()
     
-    def _validate_array_literal(self, array: ArrayLiteral) -> None:
+    def _validate_array_literal(self, array: ArrayLiteral) -> Sequence[ASTNode]:
         """Validate an array literal"""
-        for elem in array.elements:
-            self._validate_node(elem)
+        return array.children()
     
-    def _validate_hash_literal(self, hash_lit: HashLiteral) -> None:
+    def _validate_hash_literal(self, hash_lit: HashLiteral) -> Sequence[ASTNode]:
         """Validate a hash literal"""
-        for pair in hash_lit.pairs:
-            self._validate_node(pair.key)
-            self._validate_node(pair.value)
+        return hash_lit.children()
     
-    def _validate_lambda_expression(self, lambda_expr: LambdaExpression) -> None:
+    def _validate_lambda_expression(self, lambda_expr: LambdaExpression) -> List[Any]:
         """Validate a lambda expression"""
-        # Validate parameters
-        param_names: Set[str] = set()
-        for param in lambda_expr.parameters:
-            self._validate_node(param)
-            
-            if param.name in param_names:
-                self.errors.append(
-                    f"Duplicate parameter name: '{param.name}' "
-                    f"in lambda at line {lambda_expr.line}"
-                )
-            param_names.add(param.name)
-            
-            self._record_declaration(param.name, param)
+        depth = self._push_scope()
+        
+        # Validate parameters, then check and record each one
+        work: List[Any] = []
+        param_names: Dict[str, Parameter] = {}
+        owner = (DiagnosticCode.DUPLICATE_LAMBDA_PARAMETER, (lambda_expr.line,))
+        for param in lambda_expr.parameters or EMPTY:
+            work.append(param)
+            work.append((self._declare_parameter, (param, param_names, owner)))
         
         # Validate body
-        if isinstance(lambda_expr.body, Block):
-            self._validate_node(lambda_expr.body)
-        else:
-            self._validate_node(lambda_expr.body)
+        work.append(lambda_expr.body)
+        work.append((self._leave_scope, depth))
+        return work
     
-    def _validate_ternary_expression(self, expr: TernaryExpression) -> None:
+    def _validate_ternary_expression(self, expr: TernaryExpression) -> Sequence[ASTNode]:
         """Validate a ternary expression"""
-        self._validate_node(expr.condition)
-        self._validate_node(expr.then_expr)
-        self._validate_node(expr.else_expr)
+        return expr.children()
     
-    def _validate_range_expression(self, expr: RangeExpression) -> None:
+    def _validate_range_expression(self, expr: RangeExpression) -> Sequence[ASTNode]:
         """Validate a range expression"""
-        self._validate_node(expr.start)
-        self._validate_node(expr.end)
+        return expr.children()
     
     def _validate_literal(self, lit: Literal) -> None:
         """Validate a literal expression"""
         # Literals are always valid
         pass
     
-    def _validate_parameter(self, param: Parameter) -> None:
+    def _validate_parameter(self, param: Parameter) -> List[Any]:
         """Validate a parameter"""
+        work: List[Any] = []
+        
         # Validate type annotation
         if param.type_annotation:
-            self._validate_node(param.type_annotation)
+            work.append(param.type_annotation)
         
         # Validate default value
         if param.default_value:
-            self._validate_node(param.default_value)
+            work.append(param.default_value)
+        return work
@@ -32,7 +32,8 @@ from powerlang.parser.ast import (
     Variable,
 )
 from powerlang.lexer.tokens import Token, TokenType
-from powerlang.interpreter import Runtime, value_to_python
+from powerlang.errors import RuntimeError as PplRuntimeError
+from powerlang.interpreter import Interpreter, Runtime, value_to_python
 from powerlang.interpreter.values import NULL
 
 
@@ -189,7 +190,7 @@ def test_function_call():
     t_f = tok(TokenType.IDENTIFIER, "f")
     body = Block(statements=[ReturnStatement(value=lit(42), line=L, column=C)], line=L, column=C)
     decl = FunctionDeclaration(name_token=t_f, parameters=[], body=body, line=L, column=C)
-    call = CallExpression(callee=Variable(t_f, L, C), arguments=[], line=L, column=C)
+    call = CallExpression(callee=Variable(name_token=t_f, line=L, column=C), arguments=[], line=L, column=C)
     prog = Program(statements=[_stmt(call)], functions=[decl], line=L, column=C)
     assert value_to_python(run_ast(prog)) == 42
 
@@ -203,11 +204,34 @@ def test_function_with_params():
     body = Block(statements=[ReturnStatement(value=add_expr, line=L, column=C)], line=L, column=C)
     params = [Parameter(name_token=t_a, line=L, column=C), Parameter(name_token=t_b, line=L, column=C)]
     decl = FunctionDeclaration(name_token=t_add, parameters=params, body=body, line=L, column=C)
-    call = CallExpression(callee=Variable(t_add, L, C), arguments=[lit(1), lit(2)], line=L, column=C)
+    call = CallExpression(callee=Variable(name_token=t_add, line=L, column=C), arguments=[lit(1), lit(2)], line=L, column=C)
     prog = Program(statements=[_stmt(call)], functions=[decl], line=L, column=C)
     assert value_to_python(run_ast(prog)) == 3
 
 
+def test_nested_function_declaration():
+    """A function declared in a body is redeclared, with a shared body, on each call."""
+    t_outer, t_inner = tok(TokenType.IDENTIFIER, "outer"), tok(TokenType.IDENTIFIER, "inner")
+    t_n, t_m = tok(TokenType.VARIABLE, "$n", "n"), tok(TokenType.VARIABLE, "$m", "m")
+    var_m = Variable(name_token=t_m, line=L, column=C)
+    double = BinaryOperation(left=var_m, operator=tok(TokenType.STAR, "*"), right=lit(2), line=L, column=C)
+    inner = FunctionDeclaration(
+        name_token=t_inner, parameters=[Parameter(name_token=t_m, line=L, column=C)],
+        body=Block(statements=[ReturnStatement(value=double, line=L, column=C)], line=L, column=C), line=L, column=C,
+    )
+    var_inner, var_n = Variable(name_token=t_inner, line=L, column=C), Variable(name_token=t_n, line=L, column=C)
+    call_inner = CallExpression(callee=var_inner, arguments=[var_n], line=L, column=C)
+    outer = FunctionDeclaration(
+        name_token=t_outer, parameters=[Parameter(name_token=t_n, line=L, column=C)],
+        body=Block(statements=[inner, ReturnStatement(value=call_inner, line=L, column=C)], line=L, column=C),
+        line=L, column=C,
+    )
+    calls = [CallExpression(callee=Variable(name_token=t_outer, line=L, column=C), arguments=[lit(n)], line=L, column=C) for n in (3, 4)]
+    total = BinaryOperation(left=calls[0], operator=tok(TokenType.PLUS, "+"), right=calls[1], line=L, column=C)
+    prog = Program(statements=[_stmt(total)], functions=[outer], line=L, column=C)
+    assert value_to_python(run_ast(prog)) == 14
+
+
 def test_array_literal_and_index():
     arr = ArrayLiteral(elements=[lit(10), lit(20), lit(30)], line=L, column=C)
     idx = IndexAccess(object=arr, index=lit(1), line=L, column=C)
@@ -232,6 +256,94 @@ def test_unary():
     assert value_to_python(run_source("-5;")) == -5
 
 
+# ---------------------------------------------------------------------------
+# Constant folding
+# ---------------------------------------------------------------------------
+
+
+def _expression(source: str):
+    """The expression of a single parsed expression statement."""
+    return Parser(Lexer(source)).parse().statements[0].expression
+
+
+def test_folding_matches_runtime():
+    """Folded operations give the same values as the same operations on variables."""
+    ops = ["+", "-", "*", "/", "%", "-eq", "-ne", "-gt", "-lt", "-and", "-or"]
+    for op in ops:
+        for a, b in ((7, 2), (2, 7), (0, 3)):
+            interp = Interpreter(Runtime())
+            expr = _expression(f"{a} {op} {b};")
+            code = interp.compile_expression(expr)
+            assert interp._constant(expr) is not None, f"{a} {op} {b} not folded"
+            folded = value_to_python(code(interp.env))
+            unfolded = value_to_python(run_source(f"$l = {a}; $r = {b}; ($l) {op} $r;"))
+            assert folded == unfolded, (op, a, b, folded, unfolded)
+    assert value_to_python(run_source("1 + 2 * 3 - 4;")) == 3
+
+
+def test_folding_drops_dead_branches():
+    interp = Interpreter(Runtime())
+    compiled = []
+    compile_statement = interp.compile_statement
+
+    def record(stmt):
+        compiled.append(stmt)
+        return compile_statement(stmt)
+
+    interp.compile_statement = record
+    stmt = Parser(Lexer("if (1 -gt 2) { 1; } else { 2; }")).parse().statements[0]
+    assert value_to_python(record(stmt)(interp.env)) == 2
+    assert stmt.then_branch not in compiled and stmt.else_branch in compiled
+
+    compiled.clear()
+    stmt = Parser(Lexer("while (0 -eq 1) { 1 / 0; }")).parse().statements[0]
+    assert record(stmt)(interp.env) is NULL
+    assert stmt.body not in compiled
+
+
+def test_folding_keeps_division_by_zero_at_run_time():
+    for source in ("1 / 0;", "1 % 0;"):
+        interp = Interpreter(Runtime())
+        expr = _expression(source)
+        code = interp.compile_expression(expr)  # must not raise
+        assert interp._constant(expr) is None
+        try:
+            code(interp.env)
+        except PplRuntimeError:
+            pass
+        else:
+            raise AssertionError(f"{source} did not raise")
+
+
+def test_compiler_errors_propagate():
+    """Only expected evaluation errors are deferred to run time."""
+    interp = Interpreter(Runtime())
+
+    def broken(node):
+        raise AttributeError("compiler bug")
+
+    interp._compile_literal = broken
+    try:
+        interp.compile_expression(lit(1))
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("compiler error was swallowed")
+
+
+def test_folding_skips_strings_and_powers():
+    interp = Interpreter(Runtime())
+    concat = _expression('"a" + "b";')
+    code = interp.compile_expression(concat)
+    assert interp._constant(concat) is None
+    assert value_to_python(code(interp.env)) == "ab"
+
+    power = BinaryOperation(left=lit(2), operator=tok(TokenType.STAR_STAR, "**"), right=lit(10), line=L, column=C)
+    code = interp.compile_expression(power)
+    assert interp._constant(power) is None
+    assert value_to_python(code(interp.env)) == 1024
+
+
 # ---------------------------------------------------------------------------
 # Runner
 # ---------------------------------------------------------------------------
@@ -252,8 +364,14 @@ def _run_all():
         test_builtin_len,
         test_function_call,
         test_function_with_params,
+        test_nested_function_declaration,
         test_array_literal_and_index,
         test_hash_literal_and_index,
+        test_folding_matches_runtime,
+        test_folding_drops_dead_branches,
+        test_folding_keeps_division_by_zero_at_run_time,
+        test_folding_skips_strings_and_powers,
+        test_compiler_errors_propagate,
     ]
     failed = []
     for t in tests:
@@ -1,6 +1,27 @@
-from powerlang.lexer.lexer import Lexer
+"""
+Tests for the PowerLang lexer.
+
+Run with: python -m pytest powerlang/test_lexer.py -v
+Or:       python powerlang/test_lexer.py
+"""
+
+import sys
+
+# Ensure powerlang is on path when run as script
+if __name__ == "__main__":
+    sys.path.insert(0, ".")
 
-source = """
+from powerlang.lexer import Lexer
+from powerlang.lexer.tokens import TokenType
+
+
+def kinds(source: str):
+    """(type, lexeme, line) of each token in source, EOF excluded."""
+    return [(t.type, t.lexeme, t.line) for t in Lexer(source).tokenize() if t.type != TokenType.EOF]
+
+
+def test_class_sample():
+    tokens = Lexer("""
 class Test {
     function Method() {
         [int]$x = 42; # This is a comment
@@ -9,10 +30,69 @@ class Test {
         }
     }
 }
-"""
+""").tokenize()
+    assert tokens[0].type == TokenType.CLASS and tokens[-1].type == TokenType.EOF
+    assert [t.literal for t in tokens if t.type == TokenType.INTEGER] == [42, 10, 1]
+    assert TokenType.COMMENT not in {t.type for t in tokens}
+
+
+def test_float_literals():
+    tokens = Lexer("3.14 1.5e3 2.0E-2 7").tokenize()
+    assert [(t.type, t.literal) for t in tokens[:-1]] == [
+        (TokenType.FLOAT, 3.14),
+        (TokenType.FLOAT, 1500.0),
+        (TokenType.FLOAT, 0.02),
+        (TokenType.INTEGER, 7),
+    ]
+    # A '.' not followed by a digit is not part of the number
+    assert kinds("1.x") == [(TokenType.INTEGER, "1", 1), (TokenType.DOT, ".", 1), (TokenType.IDENTIFIER, "x", 1)]
+
+
+def test_block_comment_between_tokens():
+    assert kinds("1 <# note #> + 2") == [
+        (TokenType.INTEGER, "1", 1),
+        (TokenType.PLUS, "+", 1),
+        (TokenType.INTEGER, "2", 1),
+    ]
+
+
+def test_multiline_block_comment_keeps_line_numbers():
+    tokens = Lexer("$a\n<# one\ntwo\nthree #> $b\n$c").tokenize()
+    assert [(t.lexeme, t.line) for t in tokens[:3]] == [("$a", 1), ("$b", 4), ("$c", 5)]
+    assert tokens[1].column == 10
+
+
+def test_unterminated_block_comment():
+    lexer = Lexer("1 <# never closed\n\n")
+    tokens = lexer.tokenize()
+    assert [t.type for t in tokens] == [TokenType.INTEGER, TokenType.EOF]
+    assert tokens[-1].line == 3
+    assert lexer.had_error
+    assert lexer.errors[-1]["message"] == "Unterminated block comment"
+
+
+def _run_all():
+    tests = [
+        test_class_sample,
+        test_float_literals,
+        test_block_comment_between_tokens,
+        test_multiline_block_comment_keeps_line_numbers,
+        test_unterminated_block_comment,
+    ]
+    failed = []
+    for t in tests:
+        try:
+            t()
+            print(f"  OK  {t.__name__}")
+        except Exception as e:
+            print(f"  FAIL {t.__name__}: {e}")
+            failed.append((t.__name__, e))
+    if failed:
+        print(f"\n{len(failed)} failed")
+        sys.exit(1)
+    print(f"\n{len(tests)} passed")
+    return 0
 
-lexer = Lexer(source)
-tokens = lexer.tokenize()
 
-for t in tokens:
-    print(f"Type: {t.type.name}, Lexeme: '{t.lexeme}', Literal: {t.literal}")
+if __name__ == "__main__":
+    sys.exit(_run_all() or 0)
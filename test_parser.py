@@ -1,14 +1,342 @@
-from powerlang.lexer.lexer import Lexer
-from powerlang.parser.parser import Parser
+"""
+Tests for the PowerLang parser.
+
+Run with: python -m pytest powerlang/test_parser.py -v
+Or:       python powerlang/test_parser.py
+"""
+
+import sys
+
+# Ensure powerlang is on path when run as script
+if __name__ == "__main__":
+    sys.path.insert(0, ".")
+
+from powerlang.errors import ErrorHandler
+from powerlang.lexer import Lexer
+from powerlang.lexer.tokens import Token, TokenType
+from powerlang.parser import DiagnosticCode, Parser, SyntaxValidator, recycle
+from powerlang.parser import ast
+from powerlang.parser.grammar import GRAMMAR_INSTANCE, Grammar, GrammarRule, GrammarRuleType
+from powerlang.parser.ast import (
+    BinaryOperation,
+    Block,
+    CastExpression,
+    ClassDeclaration,
+    ExpressionStatement,
+    FunctionDeclaration,
+    IndexAccess,
+    LazyBlock,
+    Literal,
+    NamespaceDeclaration,
+    Program,
+    TernaryExpression,
+    Variable,
+)
+
+
+def parse(source: str, **options):
+    """Parse source; returns (program, error_count)."""
+    handler = ErrorHandler()
+    program = Parser(Lexer(source), handler, **options).parse()
+    return program, handler.error_count
 
 
-source = """
+def parse_ok(source: str, **options):
+    """Parse source that must not report any error."""
+    program, errors = parse(source, **options)
+    assert errors == 0, f"{errors} parse error(s) in {source!r}"
+    return program
+
+
+def _initializer(source: str):
+    """Initializer of the single `$v = ...;` declaration in source."""
+    program = parse_ok(source)
+    assert len(program.statements) == 1
+    return program.statements[0].initializer
+
+
+def test_function_declaration():
+    program = parse_ok("""
 function AddNumbers([int]$a, [int]$b) {
     return $a + $b;
 }
+""")
+    assert len(program.statements) == 1
+    fn = program.statements[0]
+    assert isinstance(fn, FunctionDeclaration)
+    assert [p.name for p in fn.parameters] == ["$a", "$b"]
+
+
+def test_identifier_call():
+    program = parse_ok("f();")
+    call = program.statements[0].expression
+    assert isinstance(call.callee, Variable)
+    assert call.callee.name == "f" and call.callee.line == 1
+    assert _validate(program) == [DiagnosticCode.UNDECLARED_VARIABLE]
+    assert "'f'" in program.pretty()
+    assert _validate(parse_ok("function f() { return 1; } f();")) == []
+
+
+def test_null_conditional_index():
+    expr = _initializer("$v = $a?[0];")
+    assert isinstance(expr, IndexAccess)
+    assert expr.is_null_conditional
+    assert isinstance(expr.object, Variable)
+
+
+def test_ternary_with_cast_operand():
+    for source in ("$v = $c ? [int]$x : 0;", "$v = $c ?[int]$x : 0;"):
+        expr = _initializer(source)
+        assert isinstance(expr, TernaryExpression), source
+        assert isinstance(expr.then_expr, CastExpression), source
+        assert expr.else_expr.value == 0, source
+
+
+def test_program_folds_declarations():
+    parsed = parse_ok("""
+namespace N { 1; }
+class K { }
+function F() { return 1; }
+2;
+""").statements
+    namespace, cls, fn, stmt = parsed
+    assert isinstance(namespace, NamespaceDeclaration) and isinstance(cls, ClassDeclaration)
+    statements = [stmt]
+    program = Program(1, 1, statements=statements, functions=[fn], classes=[cls], namespaces=[namespace])
+    # Folded in namespace, class, function order after the given statements
+    assert program.statements == [stmt, namespace, cls, fn]
+    assert statements == [stmt]
+    assert program.namespaces == [namespace]
+    assert program.classes == [cls]
+    assert program.functions == [fn]
+    assert Program(1, 1, [stmt]).functions == []
+
+
+def _outline(statements):
+    """Nested (kind, name or value) outline of namespaces and statements."""
+    outline = []
+    for stmt in statements:
+        if isinstance(stmt, NamespaceDeclaration):
+            outline.append((stmt.full_name, _outline(stmt.body.statements)))
+        elif isinstance(stmt, FunctionDeclaration):
+            outline.append(("function", stmt.name))
+        else:
+            outline.append(("value", stmt.expression.value))
+    return outline
+
+
+def test_nested_namespaces():
+    program = parse_ok("""
+namespace A {
+    namespace B {
+        function F() { return 1; }
+        1;
+    }
+    2;
+}
+namespace C { 3; }
+function G() { return 4; }
+5;
+""")
+    assert _outline(program.statements) == [
+        ("A", [("B", [("function", "F"), ("value", 1)]), ("value", 2)]),
+        ("C", [("value", 3)]),
+        ("function", "G"),
+        ("value", 5),
+    ]
+
+
+def test_unterminated_namespace():
+    program, errors = parse("namespace A { namespace B { 1; } 2;")
+    assert errors == 1
+    assert _outline(program.statements) == [("A", [("B", [("value", 1)]), ("value", 2)])]
+
+
+LAZY_SOURCE = """
+function F($a) {
+    $s = "{ not a block";
+    if ($a -gt 1) { return "}}"; }
+    while (0) { { $a; } }
+    return $s;
+}
+function G() { return 1 + 2; }
+$x = F(2);
 """
 
-lexer = Lexer(source)
-ast = Parser(lexer).parse()
 
-print(ast.pretty())
+def _force_bodies(program):
+    """Replace deferred function bodies by plain blocks of their parsed statements."""
+    for stmt in program.statements:
+        if isinstance(stmt, FunctionDeclaration) and isinstance(stmt.body, LazyBlock):
+            body = stmt.body
+            stmt.body = Block(body.line, body.column, body.statements)
+    return program
+
+
+def test_lazy_bodies_match_eager():
+    eager = parse_ok(LAZY_SOURCE)
+    lazy = parse_ok(LAZY_SOURCE, lazy=True)
+    assert isinstance(lazy.statements[0].body, LazyBlock)
+    assert _force_bodies(lazy) == eager
+
+
+def test_lazy_unbalanced_body_reports_error():
+    source = "function F() { if (1) { 1; }"
+    _, eager_errors = parse(source)
+    _, lazy_errors = parse(source, lazy=True)
+    assert eager_errors > 0
+    assert lazy_errors == eager_errors
+
+
+def _validate(program, name=None):
+    """Error codes of validate(), or of validate_function() when name is given."""
+    validator = SyntaxValidator(ErrorHandler())
+    if name is None:
+        validator.validate(program)
+    else:
+        validator.validate_function(program, name)
+    return validator.error_codes
+
+
+def test_validate_function_matches_validate():
+    program = parse_ok("""
+function F($a, $a) {
+    $b = 1;
+    $b = 2;
+    break;
+}
+function G() { continue; }
+""")
+    assert _validate(program) == [
+        DiagnosticCode.DUPLICATE_PARAMETER,
+        DiagnosticCode.DUPLICATE_VARIABLE,
+        DiagnosticCode.BREAK_OUTSIDE_LOOP,
+        DiagnosticCode.CONTINUE_OUTSIDE_LOOP,
+    ]
+    assert _validate(program, "F") == _validate(program)[:3]
+    assert _validate(program, "G") == [DiagnosticCode.CONTINUE_OUTSIDE_LOOP]
+
+
+def test_validate_function_scopes():
+    # A parameter may shadow a global, and only the top-level return is misplaced
+    program = parse_ok("""
+$x = 1;
+function F($x) {
+    $x = 2;
+    return $x;
+}
+return 1;
+""")
+    assert _validate(program) == [DiagnosticCode.RETURN_OUTSIDE_FUNCTION]
+    assert _validate(program, "F") == []
+
+
+def _token_types(source: str):
+    return [t.type for t in Lexer(source).tokenize()]
+
+
+def test_grammar_recognize():
+    for source in ("$x = 1 + 2;", "if ($x) { $y = 1; }", "[int]$x = 3;", "class A { function m() { } }", ""):
+        assert GRAMMAR_INSTANCE.recognize(_token_types(source)), source
+    for source in ("$x = ;", "$x = 1", "function { }", "if $x { }"):
+        assert not GRAMMAR_INSTANCE.recognize(_token_types(source)), source
+    assert GRAMMAR_INSTANCE.recognize(_token_types("1 + 2")[:-1], "expression")
+
+
+def test_grammar_first_sets():
+    first = GRAMMAR_INSTANCE.first
+    assert first["return_statement"] == {TokenType.RETURN}
+    assert first["block"] == {TokenType.LBRACE}
+    assert first["variable_declaration"] == {TokenType.LBRACKET, TokenType.VARIABLE}
+    assert first["statement"] >= {TokenType.IF, TokenType.RETURN, TokenType.LBRACE, TokenType.INTEGER}
+    assert TokenType.CLASS not in first["statement"]
+
+
+def test_grammar_nullable():
+    grammar = Grammar([
+        GrammarRule("pair", GrammarRuleType.STATEMENT, ["maybe", TokenType.COMMA]),
+        GrammarRule("maybe", GrammarRuleType.STATEMENT, [["optional", TokenType.SEMICOLON]]),
+        GrammarRule("many", GrammarRuleType.STATEMENT, [["zero_or_more", "pair"]]),
+    ])
+    nullable = {rule.name: grammar._nullable[i] for i, rule in enumerate(grammar.rules)}
+    assert nullable == {"pair": False, "maybe": True, "many": True}
+    # FIRST of "pair" looks through the nullable rule declared after it
+    assert grammar.first["pair"] == {TokenType.SEMICOLON, TokenType.COMMA}
+    assert grammar.first["many"] == grammar.first["pair"]
+    assert grammar.recognize([TokenType.COMMA, TokenType.SEMICOLON, TokenType.COMMA], "many")
+    assert not grammar.recognize([TokenType.SEMICOLON], "many")
+
+
+def test_grammar_predict():
+    statement = GRAMMAR_INSTANCE.predict["statement"]
+    assert statement[TokenType.IF] == 0
+    assert statement[TokenType.RETURN] == 1
+    assert statement[TokenType.VARIABLE] == 2
+    assert statement[TokenType.LBRACE] == 3
+    assert TokenType.CLASS not in statement
+    assert GRAMMAR_INSTANCE.predict["declaration"][TokenType.CLASS] == 0
+    assert "block" not in GRAMMAR_INSTANCE.predict
+
+
+def _assert_pools_distinct():
+    for pool in (ast._literal_pool, ast._variable_pool):
+        assert len({id(node) for node in pool}) == len(pool), "leaf pooled twice"
+
+
+def test_recycle_twice():
+    program = parse_ok("$v = 1 + $a;")
+    recycle(program)
+    recycle(program)
+    _assert_pools_distinct()
+    one = Literal(1, 1, Token(TokenType.INTEGER, "1", 1, 1, 1, 0), 1)
+    two = Literal(1, 1, Token(TokenType.INTEGER, "2", 2, 1, 1, 0), 2)
+    assert one is not two and one.value == 1
+
+
+def test_recycle_shared_leaf():
+    leaf = Variable(1, 1, Token(TokenType.VARIABLE, "$a", "a", 1, 1, 0))
+    plus = Token(TokenType.PLUS, "+", None, 1, 4, 3)
+    recycle(ExpressionStatement(1, 1, BinaryOperation(1, 4, leaf, plus, leaf)))
+    _assert_pools_distinct()
+    first = Variable(1, 1, Token(TokenType.VARIABLE, "$b", "b", 1, 1, 0))
+    second = Variable(1, 1, Token(TokenType.VARIABLE, "$c", "c", 1, 1, 0))
+    assert first is not second and first.name == "$b"
+
+
+def _run_all():
+    tests = [
+        test_function_declaration,
+        test_identifier_call,
+        test_null_conditional_index,
+        test_ternary_with_cast_operand,
+        test_program_folds_declarations,
+        test_nested_namespaces,
+        test_unterminated_namespace,
+        test_lazy_bodies_match_eager,
+        test_lazy_unbalanced_body_reports_error,
+        test_validate_function_matches_validate,
+        test_validate_function_scopes,
+        test_grammar_recognize,
+        test_grammar_first_sets,
+        test_grammar_nullable,
+        test_grammar_predict,
+        test_recycle_twice,
+        test_recycle_shared_leaf,
+    ]
+    failed = []
+    for t in tests:
+        try:
+            t()
+            print(f"  OK  {t.__name__}")
+        except Exception as e:
+            print(f"  FAIL {t.__name__}: {e}")
+            failed.append((t.__name__, e))
+    if failed:
+        print(f"\n{len(failed)} failed")
+        sys.exit(1)
+    print(f"\n{len(tests)} passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_run_all() or 0)